@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Check matches in database."""
 
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+
 from models.base import get_session_maker
 from models import Match, Keyword, Forum
 
@@ -12,17 +15,17 @@ print(f'Total matches found: {total}\n')
 
 # By keyword
 print('Matches by keyword:')
+counts = dict(session.query(Match.keyword_id, func.count(Match.id)).group_by(Match.keyword_id).all())
 keywords = session.query(Keyword).all()
 for kw in keywords:
-    count = session.query(Match).filter_by(keyword_id=kw.id).count()
-    print(f'  {kw.keyword}: {count}')
+    print(f'  {kw.keyword}: {counts.get(kw.id, 0)}')
 
 print()
 
 # Sample matches
 if total > 0:
     print('Sample matches:')
-    matches = session.query(Match).limit(5).all()
+    matches = session.query(Match).options(selectinload(Match.keyword)).limit(5).all()
     for m in matches:
         print(f'\nKeyword: {m.keyword.keyword}')
         print(f'URL: {m.page_url}')
@@ -2,6 +2,8 @@
 """Check specific matches by ID."""
 
 import sys
+from sqlalchemy.orm import selectinload
+
 from models.base import get_session_maker
 from models import Match
 
@@ -16,8 +18,15 @@ ids = [int(id_str) for id_str in sys.argv[1:]]
 print(f"Checking matches with IDs: {ids}\n")
 print("=" * 80)
 
+# Load all requested matches with their forum and keyword in three queries
+found = {
+    m.id: m for m in session.query(Match)
+    .options(selectinload(Match.forum), selectinload(Match.keyword))
+    .filter(Match.id.in_(ids))
+}
+
 for match_id in ids:
-    match = session.query(Match).filter_by(id=match_id).first()
+    match = found.get(match_id)
     
     if not match:
         print(f"\n✗ Match ID {match_id} not found")
@@ -39,7 +48,7 @@ print("DUPLICATE CHECK:")
 print("=" * 80)
 
 session = get_session_maker()()
-matches = session.query(Match).filter(Match.id.in_(ids)).all()
+matches = session.query(Match).options(selectinload(Match.forum), selectinload(Match.keyword)).filter(Match.id.in_(ids)).all()
 
 if len(matches) >= 2:
     # Check if they have same forum_id, keyword_id, page_url
@@ -2,5 +2,9 @@ from .base_crawler import BaseCrawler
 from .forum_crawler import ForumCrawler
 from .playwright_crawler import PlaywrightCrawler
 from .flaresolverr_crawler import FlareSolverrCrawler
+from .rate_limiter import TokenBucket, HostRateLimiter
+from .keyword_matcher import KeywordMatcher
+from .http_cache import HttpCache
+from .playwright_pool import PlaywrightPool
 
-__all__ = ['BaseCrawler', 'ForumCrawler', 'PlaywrightCrawler', 'FlareSolverrCrawler']
+__all__ = ['BaseCrawler', 'ForumCrawler', 'PlaywrightCrawler', 'FlareSolverrCrawler', 'TokenBucket', 'HostRateLimiter', 'KeywordMatcher', 'HttpCache', 'PlaywrightPool']
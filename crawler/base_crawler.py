@@ -1,16 +1,84 @@
+import hashlib
 import httpx
+import threading
 import time
 import logging
-from typing import Optional, Union, Dict, Any
-from bs4 import BeautifulSoup
+from collections import OrderedDict
+from typing import Optional, Union, Dict, Any, Mapping, Callable, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
+
+from parsers.base_parser import BaseParser
+from .http_cache import HttpCache
+from .rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Returned by fetch_page(conditional=True) when the server answers 304 Not Modified
+NOT_MODIFIED = object()
+
+# Recently parsed pages kept per crawler (soups are large, so only a few)
+SOUP_CACHE_SIZE = 16
+
+
+def html_digest(html: str) -> bytes:
+    """Digest identifying a page's HTML (see SoupCache)."""
+    return hashlib.blake2b(html.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class SoupCache:
+    """
+    Recently parsed pages of one crawler, keyed on a digest of the HTML.
+    
+    Retries and pagination past the last page (many forums serve the last page
+    again) return byte-identical HTML, which is then parsed once. Each crawler owns
+    its cache, so a soup is never handed to another forum's worker thread.
+    """
+    
+    def __init__(self, size: int = SOUP_CACHE_SIZE):
+        """
+        Args:
+            size: Number of soups kept
+        """
+        self.size = size
+        self._soups: 'OrderedDict[tuple, BeautifulSoup]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Digest of the page parsed last, so callers can spot a repeated page without
+        # relying on getting the same soup object back (see ForumCrawler._crawl_category_pages)
+        self.last_digest: Optional[bytes] = None
+    
+    def parse(self, html: str, html_parser: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        """
+        Parse a page, reusing the soup of an identical page parsed recently.
+        
+        Args:
+            html: Page HTML
+            html_parser: BeautifulSoup tree builder (e.g., parser.PREFERRED_BS_PARSER)
+            parse_only: Optional SoupStrainer limiting which tags are parsed
+            
+        Returns:
+            BeautifulSoup object
+        """
+        digest = html_digest(html)
+        self.last_digest = digest
+        key = (digest, html_parser, parse_only)
+        with self._lock:
+            soup = self._soups.get(key)
+            if soup is not None:
+                self._soups.move_to_end(key)
+                return soup
+        
+        soup = BeautifulSoup(html, html_parser, parse_only=parse_only)
+        with self._lock:
+            self._soups[key] = soup
+            if len(self._soups) > self.size:
+                self._soups.popitem(last=False)
+        return soup
+
 
 class BaseCrawler:
     """Base crawler with rate limiting and error handling."""
     
-    def __init__(self, rate_limit: float = 2.0, timeout: int = 30, cookies: Optional[Dict[str, str]] = None):
+    def __init__(self, rate_limit: float = 2.0, timeout: int = 30, cookies: Optional[Mapping[str, str]] = None, limiter: Optional[TokenBucket] = None, http_cache: Optional[HttpCache] = None, html_parser: str = BaseParser.PREFERRED_BS_PARSER):
         """
         Initialize crawler.
         
@@ -18,14 +86,27 @@ class BaseCrawler:
             rate_limit: Minimum seconds between requests (default: 2.0)
             timeout: Request timeout in seconds (default: 30)
             cookies: Optional dict of cookies to send with requests
+            limiter: Optional shared per-host token bucket (replaces per-instance rate limiting)
+            http_cache: Optional ETag/Last-Modified store for conditional GETs of index pages
+            html_parser: BeautifulSoup tree builder (default: lxml if installed, else html.parser)
         """
         self.rate_limit = rate_limit
         self.timeout = timeout
+        self.limiter = limiter
+        self.http_cache = http_cache
+        # Validators of conditional fetches, stored by save_validators() once the caller is done with the pages
+        self.pending_validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self.html_parser = html_parser
+        self.soup_cache = SoupCache()
         self.last_request_time = 0
+        # One pooled keep-alive client per crawler: TCP/TLS connections are reused across
+        # all pages of a forum, and failed connection attempts are retried by the transport
         self.client = httpx.Client(
             timeout=timeout,
             follow_redirects=True,
-            cookies=cookies or {},
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            transport=httpx.HTTPTransport(retries=2),
+            cookies=dict(cookies) if cookies else {},
             headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
@@ -44,6 +125,11 @@ class BaseCrawler:
     
     def _wait_for_rate_limit(self):
         """Enforce rate limiting between requests."""
+        if self.limiter:
+            self.limiter.acquire()
+            self.last_request_time = time.time()
+            return
+        
         elapsed = time.time() - self.last_request_time
         if elapsed < self.rate_limit:
             time.sleep(self.rate_limit - elapsed)
@@ -72,16 +158,22 @@ class BaseCrawler:
             logger.warning(f"Session warm-up failed: {str(e)}")
             return False
     
-    def fetch_page(self, url: str, referer: Optional[str] = None) -> Optional[BeautifulSoup]:
+    def fetch_page(self, url: str, referer: Optional[str] = None, conditional: bool = False, parse_only: Optional[SoupStrainer] = None, revalidate: bool = False) -> Optional[BeautifulSoup]:
         """
         Fetch a page and return BeautifulSoup object.
         
         Args:
             url: URL to fetch
             referer: Optional Referer header to make request look like internal navigation
+            conditional: Send cached ETag/Last-Modified validators (requires http_cache); the
+                new validators are kept pending until save_validators() is called
+            parse_only: Optional SoupStrainer limiting which tags are parsed (e.g., parser.THREAD_URL_STRAINER)
+            revalidate: Keep a copy of the page in http_cache and parse that copy when the
+                server answers 304 (for scripts re-fetching the same pages, not crawls)
             
         Returns:
-            BeautifulSoup object or None if request fails
+            BeautifulSoup object, NOT_MODIFIED if the page is unchanged since it was
+            last fetched (conditional only), or None if request fails
         """
         self._wait_for_rate_limit()
         
@@ -93,9 +185,32 @@ class BaseCrawler:
             if referer:
                 headers['Referer'] = referer
             
+            revalidate = revalidate and self.http_cache is not None
+            conditional = conditional and self.http_cache is not None
+            cached_body = self.http_cache.get_body(url) if revalidate else None
+            # Validators are only useful for revalidation if the body they describe is kept
+            if conditional or cached_body is not None:
+                headers.update(self.http_cache.conditional_headers(url))
+            
             response = self.client.get(url, headers=headers)
+            if response.status_code == 304:
+                if cached_body is not None:
+                    logger.info(f"Not modified, using cached copy: {url}")
+                    return self.soup_cache.parse(cached_body, self.html_parser, parse_only)
+                if conditional:
+                    logger.info(f"Not modified since last crawl: {url}")
+                    return NOT_MODIFIED
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            
+            if revalidate:
+                self.http_cache.store(
+                    url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                    body=response.text
+                )
+            elif conditional:
+                # A 304 will mean "already checked", which is only true once the page's threads are
+                self.pending_validators[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return self.soup_cache.parse(response.text, self.html_parser, parse_only)
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error fetching {url}: {e.response.status_code}")
         except httpx.RequestError as e:
@@ -105,7 +220,8 @@ class BaseCrawler:
         
         return None
     
-    def fetch_json(self, url: str, max_retries: int = 3, custom_headers: Optional[Dict[str, str]] = None) -> Optional[Dict[Any, Any]]:
+    def fetch_json(self, url: str, max_retries: int = 3, custom_headers: Optional[Dict[str, str]] = None,
+                   loads: Optional[Callable[[bytes], Any]] = None) -> Optional[Dict[Any, Any]]:
         """
         Fetch a JSON API response (e.g., Reddit) with retry logic.
         
@@ -113,6 +229,8 @@ class BaseCrawler:
             url: URL to fetch
             max_retries: Maximum number of retries for rate limit errors
             custom_headers: Optional custom headers to override defaults (e.g., for Reddit API)
+            loads: Optional decoder applied to the raw response bytes (e.g., RedditParser.loads);
+                defaults to httpx's stdlib json decoding
             
         Returns:
             Dict (parsed JSON) or None if request fails
@@ -131,6 +249,8 @@ class BaseCrawler:
                 
                 response = self.client.get(url, headers=headers)
                 response.raise_for_status()
+                if loads is not None:
+                    return loads(response.content)
                 return response.json()
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429:  # Rate limit
@@ -156,7 +276,8 @@ class BaseCrawler:
         
         return None
     
-    def fetch(self, url: str, json_mode: bool = False, custom_headers: Optional[Dict[str, str]] = None) -> Optional[Union[BeautifulSoup, Dict[Any, Any]]]:
+    def fetch(self, url: str, json_mode: bool = False, custom_headers: Optional[Dict[str, str]] = None,
+              loads: Optional[Callable[[bytes], Any]] = None) -> Optional[Union[BeautifulSoup, Dict[Any, Any]]]:
         """
         Fetch a page - returns either BeautifulSoup (HTML) or Dict (JSON).
         
@@ -164,14 +285,21 @@ class BaseCrawler:
             url: URL to fetch
             json_mode: If True, parse as JSON instead of HTML
             custom_headers: Optional custom headers (for Reddit API, etc.)
+            loads: Optional JSON decoder for json_mode (see fetch_json)
             
         Returns:
             BeautifulSoup object, Dict, or None if request fails
         """
         if json_mode:
-            return self.fetch_json(url, custom_headers=custom_headers)
+            return self.fetch_json(url, custom_headers=custom_headers, loads=loads)
         return self.fetch_page(url)
     
+    def save_validators(self):
+        """Store the validators of pages fetched with conditional=True (after their threads were processed)."""
+        for url, (etag, last_modified) in self.pending_validators.items():
+            self.http_cache.store(url, etag, last_modified)
+        self.pending_validators.clear()
+    
     def close(self):
         """Close the HTTP client."""
         self.client.close()
@@ -3,7 +3,11 @@ import random
 import logging
 import httpx
 from typing import Optional, Dict
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from parsers.base_parser import BaseParser
+from .base_crawler import SoupCache
+from .rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
@@ -11,16 +15,21 @@ logger = logging.getLogger(__name__)
 class FlareSolverrCrawler:
     """Crawler using FlareSolverr service for Cloudflare bypass."""
     
-    def __init__(self, rate_limit: float = 2.0, flaresolverr_url: str = "http://localhost:8191/v1"):
+    def __init__(self, rate_limit: float = 2.0, flaresolverr_url: str = "http://localhost:8191/v1", limiter: Optional[TokenBucket] = None, html_parser: str = BaseParser.PREFERRED_BS_PARSER):
         """
         Initialize FlareSolverr crawler.
         
         Args:
             rate_limit: Minimum seconds between requests
             flaresolverr_url: FlareSolverr API endpoint
+            limiter: Optional shared per-host token bucket (replaces per-instance rate limiting)
+            html_parser: BeautifulSoup tree builder (default: lxml if installed, else html.parser)
         """
         self.rate_limit = rate_limit
         self.flaresolverr_url = flaresolverr_url
+        self.limiter = limiter
+        self.html_parser = html_parser
+        self.soup_cache = SoupCache()
         self.last_request_time = 0
         self.session_id = None
         
@@ -28,6 +37,12 @@ class FlareSolverrCrawler:
     
     def _wait_for_rate_limit(self):
         """Wait to respect rate limiting with random jitter."""
+        if self.limiter:
+            self.limiter.acquire()
+            time.sleep(random.uniform(0, 0.5))
+            self.last_request_time = time.time()
+            return
+        
         if self.last_request_time > 0:
             elapsed = time.time() - self.last_request_time
             wait_time = self.rate_limit - elapsed
@@ -63,13 +78,14 @@ class FlareSolverrCrawler:
             logger.error(f"Error creating FlareSolverr session: {str(e)}")
             return None
     
-    def fetch_page(self, url: str, referer: Optional[str] = None) -> Optional[BeautifulSoup]:
+    def fetch_page(self, url: str, referer: Optional[str] = None, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
         """
         Fetch a page using FlareSolverr and return BeautifulSoup object.
         
         Args:
             url: URL to fetch
             referer: Optional Referer header
+            parse_only: Optional SoupStrainer limiting which tags are parsed (e.g., parser.THREAD_URL_STRAINER)
             
         Returns:
             BeautifulSoup object or None if request fails
@@ -120,7 +136,7 @@ class FlareSolverrCrawler:
                 return None
             
             logger.info(f"✓ Successfully fetched via FlareSolverr: {url}")
-            return BeautifulSoup(html, 'html.parser')
+            return self.soup_cache.parse(html, self.html_parser, parse_only)
             
         except httpx.TimeoutException:
             logger.error(f"Timeout fetching {url} with FlareSolverr")
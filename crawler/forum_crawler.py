@@ -1,19 +1,25 @@
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Mapping, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
 
-from models import Forum, Keyword, Match
-from .base_crawler import BaseCrawler
+from models import Forum, KeywordRow, Match
+from .base_crawler import BaseCrawler, NOT_MODIFIED
+from .http_cache import HttpCache
+from .playwright_pool import PlaywrightPool
+from .keyword_matcher import KeywordMatcher
+from .rate_limiter import TokenBucket
 from parsers.base_parser import BaseParser
 
 logger = logging.getLogger(__name__)
 
+# Matches buffered in memory before being written with one INSERT
+MATCH_BATCH_SIZE = 500
+
 
 class ForumCrawler:
     """Main crawler for monitoring forums for keyword mentions."""
     
-    def __init__(self, db_session: Session, parser: BaseParser, rate_limit: float = 2.0, cookies: Optional[Dict[str, str]] = None, use_playwright: bool = False, use_flaresolverr: bool = False, headless: bool = True):
+    def __init__(self, db_session: Session, parser: BaseParser, rate_limit: float = 2.0, cookies: Optional[Mapping[str, str]] = None, use_playwright: bool = False, use_flaresolverr: bool = False, headless: bool = True, limiter: Optional[TokenBucket] = None, http_cache: Optional[HttpCache] = None, pw_pool: Optional[PlaywrightPool] = None):
         """
         Initialize forum crawler.
         
@@ -25,33 +31,45 @@ class ForumCrawler:
             use_playwright: Use Playwright browser instead of httpx (for Cloudflare bypass)
             use_flaresolverr: Use FlareSolverr service for Cloudflare bypass (priority over Playwright)
             headless: Run Playwright in headless mode (default: True)
+            limiter: Optional per-host token bucket shared with other crawlers of the same host
+            http_cache: Optional validator store for conditional GETs of category pages (httpx only)
+            pw_pool: Optional shared Playwright pool (reuses browsers/contexts across forums)
         """
         self.db_session = db_session
         self.parser = parser
         
+        html_parser = parser.PREFERRED_BS_PARSER
+        
         # Choose crawler based on flags (FlareSolverr > Playwright > BaseCrawler)
         if use_flaresolverr:
             from .flaresolverr_crawler import FlareSolverrCrawler
-            self.crawler = FlareSolverrCrawler(rate_limit=rate_limit)
+            self.crawler = FlareSolverrCrawler(rate_limit=rate_limit, limiter=limiter, html_parser=html_parser)
             logger.info(f"Using FlareSolverr for Cloudflare bypass")
         elif use_playwright:
             from .playwright_crawler import PlaywrightCrawler
-            self.crawler = PlaywrightCrawler(rate_limit=rate_limit, headless=headless)
+            self.crawler = PlaywrightCrawler(rate_limit=rate_limit, headless=headless, limiter=limiter, pool=pw_pool, html_parser=html_parser)
             mode = "headless" if headless else "visible"
             logger.info(f"Using Playwright browser ({mode}) for Cloudflare bypass")
         else:
-            self.crawler = BaseCrawler(rate_limit=rate_limit, cookies=cookies)
+            self.crawler = BaseCrawler(rate_limit=rate_limit, cookies=cookies, limiter=limiter, http_cache=http_cache, html_parser=html_parser)
         
         self.use_playwright = use_playwright
         self.use_flaresolverr = use_flaresolverr
+        # Browser backends cannot see response status codes, so only httpx fetches are conditional
+        self.conditional_index = http_cache is not None and not (use_flaresolverr or use_playwright)
+        # Set when a batch of matches could not be written (see _flush_matches)
+        self.save_failed = False
+        # Set when a category or thread page could not be fetched or processed
+        self.fetch_failed = False
     
-    def crawl_forum(self, forum: Forum, keywords: List[Keyword]) -> Dict[str, int]:
+    def crawl_forum(self, forum: Forum, keywords: List[KeywordRow], matcher: Optional[KeywordMatcher] = None) -> Dict[str, int]:
         """
         Crawl a forum for all keywords.
         
         Args:
             forum: Forum object to crawl
-            keywords: List of Keyword objects to search for
+            keywords: List of KeywordRow objects to search for
+            matcher: Optional prebuilt matcher over keywords (built here if omitted)
             
         Returns:
             Dict with statistics (matches_found, pages_crawled, errors)
@@ -76,6 +94,11 @@ class ForumCrawler:
             if forum.base_url and not forum.base_url.endswith('reddit.com'):
                 self.crawler.warm_up_session(forum.base_url)
         
+        if matcher is None:
+            matcher = KeywordMatcher(keywords)
+        
+        pending_matches = []
+        
         try:
             # Get thread URLs from start_urls
             thread_urls = []
@@ -86,22 +109,33 @@ class ForumCrawler:
                 stats['pages_crawled'] += pages
                 stats['threads_found'] += len(urls)
             
+            # Start URLs and listing pages overlap (sticky threads, pages shifting
+            # between fetches), so fetch and parse each thread only once
+            thread_urls = list(dict.fromkeys(thread_urls))
             logger.info(f"Found {len(thread_urls)} thread URLs")
             
-            # Process each thread
+            # Process each thread, buffering matches for batched inserts
             for thread_url in thread_urls:
-                matches = self._process_thread(forum, thread_url, keywords)
-                stats['matches_found'] += len(matches)
+                pending_matches.extend(self._process_thread(forum, thread_url, matcher))
+                if len(pending_matches) >= MATCH_BATCH_SIZE:
+                    stats['matches_found'] += self._flush_matches(pending_matches)
                 
         except Exception as e:
             logger.error(f"Error crawling forum {forum.name}: {str(e)}")
             stats['errors'] += 1
         
+        # Write remaining matches (usually the only batch for a forum)
+        stats['matches_found'] += self._flush_matches(pending_matches)
+        
+        # Listings count as checked only once all their pages and threads were fetched and
+        # the matches saved, so a failed or interrupted crawl fetches them in full next time
+        if self.conditional_index and not (stats['errors'] or self.save_failed or self.fetch_failed):
+            self.crawler.save_validators()
+        
         logger.info(f"Finished crawling {forum.name}: {stats}")
         
-        # Cleanup browser/session resources if used
-        if self.use_playwright or self.use_flaresolverr:
-            self.crawler.close()
+        # Cleanup browser/session resources (HTTP connection pool, browser, FlareSolverr session)
+        self.crawler.close()
         
         return stats
     
@@ -124,6 +158,10 @@ class ForumCrawler:
         # Detect if this is Reddit (JSON API)
         is_reddit = 'reddit.com' in start_url
         
+        # Parsers that only read links from listing pages let us skip building the rest of the tree
+        strainer = getattr(self.parser, 'THREAD_URL_STRAINER', None)
+        
+        previous_digest = None
         for page_num in range(1, max_pages + 1):
             try:
                 # Get paginated URL
@@ -134,13 +172,23 @@ class ForumCrawler:
                 if is_reddit:
                     # Reddit requires custom User-Agent - get from parser
                     reddit_headers = self.parser.get_reddit_headers() if hasattr(self.parser, 'get_reddit_headers') else None
-                    soup = self.crawler.fetch(page_url, json_mode=True, custom_headers=reddit_headers)
+                    soup = self.crawler.fetch(page_url, json_mode=True, custom_headers=reddit_headers,
+                                              loads=getattr(self.parser, 'loads', None))
                 else:
                     referer = self.parser.get_paginated_url(start_url, page_num - 1) if page_num > 1 else None
-                    soup = self.crawler.fetch_page(page_url, referer=referer)
+                    if self.conditional_index:
+                        soup = self.crawler.fetch_page(page_url, referer=referer, conditional=True, parse_only=strainer)
+                    else:
+                        soup = self.crawler.fetch_page(page_url, referer=referer, parse_only=strainer)
+                
+                # Unchanged listing: its threads were already checked on a previous run
+                if soup is NOT_MODIFIED:
+                    logger.info(f"Page {page_num} unchanged since last crawl, skipping remaining pages")
+                    break
                 
                 if not soup:
                     logger.warning(f"Failed to fetch category page: {page_url}")
+                    self.fetch_failed = True
                     consecutive_failures += 1
                     if consecutive_failures >= max_consecutive_failures:
                         logger.warning(f"Stopping early - {consecutive_failures} consecutive failures (likely rate-limited)")
@@ -150,6 +198,15 @@ class ForumCrawler:
                 # Reset failure counter on success
                 consecutive_failures = 0
                 
+                # Past the last page many forums serve the last page again, whose threads
+                # are already listed (compared on the HTML, JSON pages have no digest)
+                if not is_reddit:
+                    digest = self.crawler.soup_cache.last_digest
+                    if digest == previous_digest:
+                        logger.info(f"Page {page_num} is identical to page {page_num - 1}, stopping")
+                        break
+                    previous_digest = digest
+                
                 # Extract thread URLs
                 urls = self.parser.extract_thread_urls(soup, start_url)
                 if not urls:
@@ -169,6 +226,7 @@ class ForumCrawler:
                 
             except Exception as e:
                 logger.error(f"Error crawling category page {page_num}: {str(e)}")
+                self.fetch_failed = True
                 consecutive_failures += 1
                 if consecutive_failures >= max_consecutive_failures:
                     logger.warning(f"Stopping early - {consecutive_failures} consecutive failures (likely rate-limited)")
@@ -176,17 +234,17 @@ class ForumCrawler:
         
         return thread_urls, pages_crawled
     
-    def _process_thread(self, forum: Forum, thread_url: str, keywords: List[Keyword]) -> List[Match]:
+    def _process_thread(self, forum: Forum, thread_url: str, matcher: KeywordMatcher) -> List[Dict]:
         """
         Process a thread and check for keyword matches in all posts.
         
         Args:
             forum: Forum object
             thread_url: Thread URL to process
-            keywords: Keywords to search for
+            matcher: Keyword matcher to search posts with
             
         Returns:
-            List of Match objects created
+            List of match rows to insert (see _flush_matches)
         """
         matches = []
         
@@ -198,51 +256,69 @@ class ForumCrawler:
             if is_reddit:
                 # Reddit requires custom User-Agent
                 reddit_headers = self.parser.get_reddit_headers() if hasattr(self.parser, 'get_reddit_headers') else None
-                soup = self.crawler.fetch(thread_url + '.json', json_mode=True, custom_headers=reddit_headers)
+                json_url = self.parser.get_post_json_url(thread_url) if hasattr(self.parser, 'get_post_json_url') else thread_url + '.json'
+                soup = self.crawler.fetch(json_url, json_mode=True, custom_headers=reddit_headers,
+                                          loads=getattr(self.parser, 'loads', None))
             else:
-                soup = self.crawler.fetch(thread_url, json_mode=False)
+                # Parsers that only read part of a thread page let us skip building the rest of the tree
+                soup = self.crawler.fetch_page(thread_url, parse_only=getattr(self.parser, 'THREAD_PAGE_STRAINER', None))
             if not soup:
+                self.fetch_failed = True
                 return matches
             
-            # Extract all posts from thread
-            posts = self.parser.extract_all_posts(soup)
-            if not posts:
-                logger.warning(f"No posts extracted from {thread_url}")
-                return matches
-            
-            logger.debug(f"Processing {len(posts)} posts from thread")
-            
             # Track which keywords have been matched in this thread (deduplicate)
             matched_keywords = set()
+            keyword_count = len(matcher.keywords)
+            post_count = 0
+            
+            # Texts already scanned in this thread (signatures, repeated quotes, mirrored
+            # first posts): an identical text cannot contain a keyword not found before
+            scanned_contents = set()
             
-            # Check each post for keywords
-            for post in posts:
+            # Check each post for keywords (posts are extracted lazily, one at a time)
+            for post in self.parser.iter_posts(soup):
+                post_count += 1
                 post_content = post['content'].lower()
+                if post_content in scanned_contents:
+                    continue
+                scanned_contents.add(post_content)
                 post_number = post.get('post_number', 0)
                 author = post.get('author', 'Unknown')
                 
-                # Check each keyword
-                for keyword in keywords:
+                # Find all keywords in the post with one scan
+                for keyword, needle in matcher.find(post_content):
                     # Skip if this keyword already matched in this thread
                     if keyword.id in matched_keywords:
                         continue
                     
-                    if keyword.keyword.lower() in post_content:
-                        # Create snippet (extract context around keyword)
-                        snippet = self._create_snippet(post_content, keyword.keyword.lower())
-                        
-                        # Add context: post number and author
-                        snippet_with_context = f"[Post #{post_number} by {author}] {snippet}"
-                        
-                        # Save match to database (only first occurrence per thread)
-                        match = self._save_match(forum, keyword, thread_url, snippet_with_context)
-                        if match:
-                            matches.append(match)
-                            matched_keywords.add(keyword.id)  # Mark as matched
-                            logger.info(f"Match found: '{keyword.keyword}' in {thread_url} (post #{post_number})")
+                    # Create snippet (extract context around keyword)
+                    snippet = self._create_snippet(post_content, needle)
+                    
+                    # Add context: post number and author
+                    snippet_with_context = f"[Post #{post_number} by {author}] {snippet}"
+                    
+                    # Queue match for insert (only first occurrence per thread)
+                    matches.append({
+                        'forum_id': forum.id,
+                        'keyword_id': keyword.id,
+                        'page_url': thread_url,
+                        'snippet': snippet_with_context,
+                    })
+                    matched_keywords.add(keyword.id)  # Mark as matched
+                    logger.info(f"Match found: '{keyword.keyword}' in {thread_url} (post #{post_number})")
+                
+                # Every keyword already matched: later posts cannot add anything
+                if len(matched_keywords) == keyword_count:
+                    break
+            
+            if not post_count:
+                logger.warning(f"No posts extracted from {thread_url}")
+            else:
+                logger.debug(f"Processed {post_count} posts from thread")
         
         except Exception as e:
             logger.error(f"Error processing thread {thread_url}: {str(e)}")
+            self.fetch_failed = True
         
         return matches
     
@@ -273,37 +349,35 @@ class ForumCrawler:
         
         return snippet
     
-    def _save_match(self, forum: Forum, keyword: Keyword, url: str, snippet: str) -> Optional[Match]:
+    def _flush_matches(self, rows: List[Dict]) -> int:
         """
-        Save a match to the database.
+        Insert buffered match rows in one transaction and clear the buffer.
+        
+        Duplicates of already-saved matches are skipped by the database.
         
         Args:
-            forum: Forum object
-            keyword: Keyword object
-            url: Page URL
-            snippet: Text snippet
+            rows: Buffered match rows (emptied in place)
             
         Returns:
-            Match object if saved, None if duplicate
+            Number of new matches inserted
         """
+        if not rows:
+            return 0
+        
         try:
-            match = Match(
-                forum_id=forum.id,
-                keyword_id=keyword.id,
-                page_url=url,
-                snippet=snippet
-            )
-            self.db_session.add(match)
+            inserted = Match.bulk_upsert(self.db_session, rows, batch_size=MATCH_BATCH_SIZE)
             self.db_session.commit()
-            return match
-        except IntegrityError:
-            self.db_session.rollback()
-            logger.debug(f"Duplicate match skipped: {url}")
-            return None
+            skipped = len(rows) - inserted
+            if skipped:
+                logger.debug(f"Duplicate matches skipped: {skipped}")
+            return inserted
         except Exception as e:
             self.db_session.rollback()
-            logger.error(f"Error saving match: {str(e)}")
-            return None
+            self.save_failed = True
+            logger.error(f"Error saving matches: {str(e)}")
+            return 0
+        finally:
+            rows.clear()
     
     def close(self):
         """Close the crawler."""
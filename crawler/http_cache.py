@@ -0,0 +1,149 @@
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    """
+    Persistent store of HTTP validators (ETag / Last-Modified) per URL.
+
+    Used for conditional GETs of forum index pages: the server answers 304 Not
+    Modified with an empty body when the listing has not changed since the
+    previous crawl. Page bodies can be stored too, so a 304 can be answered from
+    the local copy (see BaseCrawler.fetch_page(revalidate=True)). Thread-safe;
+    one instance is shared by all forum workers.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file path (default: HTTP_CACHE_PATH env var or http_cache.sqlite)
+        """
+        self.path = path or os.getenv('HTTP_CACHE_PATH', 'http_cache.sqlite')
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS validators ('
+            'url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, updated_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE TABLE IF NOT EXISTS bodies (url TEXT PRIMARY KEY, body TEXT NOT NULL)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        self._conn.commit()
+
+    def set_scope(self, scope: str):
+        """
+        Tie the stored validators to what the crawl searches for.
+
+        A 304 means "already checked", which only holds for the keywords the page
+        was checked against, so everything is forgotten when the scope changes.
+
+        Args:
+            scope: Fingerprint of the crawl's search (e.g., of the enabled keywords)
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'scope'").fetchone()
+            if row and row[0] == scope:
+                return
+            # Validators stored without a scope were checked against unknown keywords too
+            self._conn.execute('DELETE FROM validators')
+            self._conn.execute('DELETE FROM bodies')
+            logger.info(f"Search changed since last crawl, cleared HTTP cache: {self.path}")
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('scope', ?)", (scope,))
+            self._conn.commit()
+
+    def get(self, url: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """
+        Get stored validators for a URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Tuple of (etag, last_modified), or None if the URL is not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified FROM validators WHERE url = ?', (url,)
+            ).fetchone()
+        return row
+
+    def get_body(self, url: str) -> Optional[str]:
+        """
+        Get the stored body of a URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Page body from the last 200 response stored with a body, or None
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT body FROM bodies WHERE url = ?', (url,)).fetchone()
+        return row[0] if row else None
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], body: Optional[str] = None):
+        """
+        Store validators from a 200 response (ignored if the server sent none).
+
+        Args:
+            url: Page URL
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            body: Optional page body to answer later 304 responses with
+        """
+        if not etag and not last_modified:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO validators (url, etag, last_modified, updated_at) VALUES (?, ?, ?, ?)',
+                (url, etag, last_modified, time.time())
+            )
+            if body is not None:
+                self._conn.execute('INSERT OR REPLACE INTO bodies (url, body) VALUES (?, ?)', (url, body))
+            self._conn.commit()
+
+    def conditional_headers(self, url: str) -> dict:
+        """
+        Build If-None-Match / If-Modified-Since headers for a URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Dict of conditional request headers (empty if the URL is not cached)
+        """
+        cached = self.get(url)
+        if not cached:
+            return {}
+
+        etag, last_modified = cached
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def clear(self):
+        """Forget all stored validators and bodies so the next crawl re-downloads every page."""
+        with self._lock:
+            self._conn.execute('DELETE FROM validators')
+            self._conn.execute('DELETE FROM bodies')
+            self._conn.commit()
+        logger.info(f"Cleared HTTP cache: {self.path}")
+
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,62 @@
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+from models import KeywordRow
+
+# Aho-Corasick automaton is optional - fall back to per-keyword substring scans
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordMatcher:
+    """Finds every keyword contained in a text with a single pass over the text."""
+
+    def __init__(self, keywords: Sequence[KeywordRow]):
+        """
+        Build the matcher once per crawl; it is read-only afterwards and can be
+        shared by crawlers running in parallel threads.
+
+        Args:
+            keywords: Keywords to search for (matching is case-insensitive)
+        """
+        self.keywords = list(keywords)
+        self._needles = [k.keyword.lower() for k in self.keywords]
+        self._automaton = None
+
+        if AHOCORASICK_AVAILABLE and self._needles:
+            # Keywords that differ only by case share one needle
+            indexes: Dict[str, List[int]] = {}
+            for index, needle in enumerate(self._needles):
+                indexes.setdefault(needle, []).append(index)
+
+            automaton = ahocorasick.Automaton()
+            for needle, needle_indexes in indexes.items():
+                automaton.add_word(needle, tuple(needle_indexes))
+            automaton.make_automaton()
+            self._automaton = automaton
+        elif not AHOCORASICK_AVAILABLE:
+            logger.debug("pyahocorasick not installed, using per-keyword substring scans")
+
+    def find(self, text: str) -> List[Tuple[KeywordRow, str]]:
+        """
+        Find keywords occurring in a text.
+
+        Args:
+            text: Lowercased text to search
+
+        Returns:
+            (keyword, lowercased keyword) pairs in keyword list order
+        """
+        if self._automaton is None:
+            return [(k, needle) for k, needle in zip(self.keywords, self._needles) if needle in text]
+
+        hits = set()
+        for _, needle_indexes in self._automaton.iter(text):
+            hits.update(needle_indexes)
+        return [(self.keywords[i], self._needles[i]) for i in sorted(hits)]
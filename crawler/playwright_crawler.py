@@ -3,14 +3,19 @@ import random
 import logging
 import os
 from typing import Optional
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from parsers.base_parser import BaseParser
+from .base_crawler import SoupCache
+from .playwright_pool import PlaywrightPool
+from .rate_limiter import TokenBucket
 
 try:
-    from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
+    from playwright.sync_api import BrowserContext, Page
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
-    sync_playwright = None
+    BrowserContext = Page = None
 
 try:
     from playwright_stealth import stealth_sync
@@ -32,15 +37,18 @@ logger = logging.getLogger(__name__)
 class PlaywrightCrawler:
     """Crawler using Playwright for sites with Cloudflare/bot protection."""
     
-    def __init__(self, rate_limit: float = 2.0, timeout: int = 30, headless: bool = True, persistent_state: bool = True):
+    def __init__(self, rate_limit: float = 2.0, timeout: int = 30, headless: bool = True, persistent_state: bool = True, limiter: Optional[TokenBucket] = None, pool: Optional[PlaywrightPool] = None, html_parser: str = BaseParser.PREFERRED_BS_PARSER):
         """
         Initialize Playwright crawler.
         
         Args:
             rate_limit: Minimum seconds between requests
             timeout: Request timeout in seconds
-            headless: Run browser in headless mode (default: True)
+            headless: Run browser in headless mode (default: True, ignored when pool is given)
             persistent_state: Use persistent browser state for better Cloudflare bypass (default: True)
+            limiter: Optional shared per-host token bucket (replaces per-instance rate limiting)
+            pool: Optional shared browser pool (browser and per-host context are reused across forums)
+            html_parser: BeautifulSoup tree builder (default: lxml if installed, else html.parser)
         """
         if not PLAYWRIGHT_AVAILABLE:
             raise ImportError(
@@ -53,8 +61,18 @@ class PlaywrightCrawler:
         self.timeout = timeout * 1000  # Convert to milliseconds for Playwright
         self.headless = headless
         self.persistent_state = persistent_state
+        self.limiter = limiter
+        self.html_parser = html_parser
+        self.soup_cache = SoupCache()
         self.last_request_time = 0
-        self.state_file = 'playwright_state.json'
+        
+        # Without a shared pool this crawler owns a private one and closes it with itself
+        self.owns_pool = pool is None
+        self.pool = pool or PlaywrightPool(headless=headless)
+        
+        # Page is opened on first navigation, once the host (and so the context) is known
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
         
         # Initialize CapSolver if available and API key is set
         self.capsolver_enabled = False
@@ -69,60 +87,22 @@ class PlaywrightCrawler:
         else:
             logger.debug("CapSolver not available - install with: pip install capsolver")
         
-        # Initialize Playwright with stealth settings
-        self.playwright = sync_playwright().start()
-        
-        # Launch with args to avoid detection
-        launch_args = [
-            '--disable-blink-features=AutomationControlled',
-            '--no-sandbox',
-            '--disable-dev-shm-usage',
-        ]
-        
-        # If not headless, prevent focus stealing on macOS
-        if not headless:
-            launch_args.extend([
-                '--disable-popup-blocking',
-                '--disable-background-timer-throttling',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-renderer-backgrounding',
-            ])
-        
-        self.browser: Browser = self.playwright.chromium.launch(
-            headless=headless,
-            args=launch_args
-        )
-        
-        # Create context with realistic browser fingerprint
-        # Load persistent state if available (for better Cloudflare bypass)
-        context_options = {
-            'viewport': {'width': 1920, 'height': 1080},
-            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-            'locale': 'en-US',
-            'timezone_id': 'America/New_York',
-            'permissions': ['geolocation'],
-            'extra_http_headers': {
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-        }
+        logger.info("Playwright crawler initialized")
+    
+    def _ensure_page(self, url: str):
+        """
+        Open this crawler's page in the pooled context for the URL's host.
         
-        # Load persistent state if it exists
-        if self.persistent_state and os.path.exists(self.state_file):
-            try:
-                context_options['storage_state'] = self.state_file
-                logger.info(f"Loaded persistent browser state from {self.state_file}")
-            except Exception as e:
-                logger.warning(f"Failed to load persistent state: {e}")
+        Args:
+            url: First URL to be visited
+        """
+        if self.page is not None:
+            return
         
-        self.context: BrowserContext = self.browser.new_context(**context_options)
+        self.context = self.pool.get_context(url)
         
         # Create page and inject anti-detection scripts
-        self.page: Page = self.context.new_page()
+        self.page = self.context.new_page()
         
         # Apply playwright-stealth if available (better Cloudflare bypass)
         if STEALTH_AVAILABLE:
@@ -150,15 +130,19 @@ class PlaywrightCrawler:
                 get: () => ['en-US', 'en']
             });
         """)
-        
-        logger.info("Playwright browser initialized")
     
     def _wait_for_rate_limit(self):
         """Enforce rate limiting between requests with random jitter."""
-        elapsed = time.time() - self.last_request_time
-        
         # Add random jitter (0-0.5 seconds) to make timing more human-like
         jitter = random.uniform(0, 0.5)
+        
+        if self.limiter:
+            self.limiter.acquire()
+            time.sleep(jitter)
+            self.last_request_time = time.time()
+            return
+        
+        elapsed = time.time() - self.last_request_time
         wait_time = self.rate_limit + jitter
         
         if elapsed < wait_time:
@@ -166,13 +150,16 @@ class PlaywrightCrawler:
         
         self.last_request_time = time.time()
     
-    def fetch_page(self, url: str, referer: Optional[str] = None) -> Optional[BeautifulSoup]:
+    def fetch_page(self, url: str, referer: Optional[str] = None, parse_only: Optional[SoupStrainer] = None, wait_for: Optional[str] = None) -> Optional[BeautifulSoup]:
         """
         Fetch a page using Playwright and return BeautifulSoup object.
         
         Args:
             url: URL to fetch
             referer: Optional Referer header (not used in Playwright, kept for compatibility)
+            parse_only: Optional SoupStrainer limiting which tags are parsed (e.g., parser.THREAD_URL_STRAINER)
+            wait_for: CSS selector of the content the caller needs (default: discussion links);
+                a selector that never appears costs its full 5s timeout on every page
             
         Returns:
             BeautifulSoup object or None if request fails
@@ -181,6 +168,7 @@ class PlaywrightCrawler:
         
         try:
             logger.info(f"Fetching with Playwright: {url}")
+            self._ensure_page(url)
             
             # Navigate to the page
             response = self.page.goto(url, timeout=self.timeout, wait_until='domcontentloaded')
@@ -198,7 +186,7 @@ class PlaywrightCrawler:
             # Try to wait for common content indicators
             try:
                 # Wait for discussion items or main content area (with timeout)
-                self.page.wait_for_selector('a[href*="/discussion/"]', timeout=5000, state='visible')
+                self.page.wait_for_selector(wait_for or 'a[href*="/discussion/"]', timeout=5000, state='visible')
             except:
                 # If specific selector times out, just wait a bit
                 logger.debug("Specific selector not found, using general wait")
@@ -212,14 +200,11 @@ class PlaywrightCrawler:
             # Get page content
             html = self.page.content()
             
-            # Save persistent state for next run (better Cloudflare bypass)
+            # Save persistent state for later forums and runs (better Cloudflare bypass)
             if self.persistent_state:
-                try:
-                    self.context.storage_state(path=self.state_file)
-                except Exception as e:
-                    logger.debug(f"Could not save state: {e}")
+                self.pool.save_state(url)
             
-            return BeautifulSoup(html, 'html.parser')
+            return self.soup_cache.parse(html, self.html_parser, parse_only)
             
         except Exception as e:
             logger.error(f"Error fetching {url} with Playwright: {str(e)}")
@@ -349,6 +334,8 @@ class PlaywrightCrawler:
         logger.info(f"Advanced IP warm-up for aggressive Cloudflare: {base_url}")
         
         try:
+            self._ensure_page(base_url)
+            
             # Step 1: Visit homepage
             logger.info("  1/4 Visiting homepage...")
             self.page.goto(base_url, timeout=self.timeout, wait_until='domcontentloaded')
@@ -383,7 +370,7 @@ class PlaywrightCrawler:
             
             # Step 2: Click 2-3 internal links
             logger.info("  2/4 Browsing internal links...")
-            soup = BeautifulSoup(self.page.content(), 'html.parser')
+            soup = BeautifulSoup(self.page.content(), self.html_parser)
             internal_links = []
             
             for link in soup.find_all('a', href=True):
@@ -434,11 +421,8 @@ class PlaywrightCrawler:
             
             # Save state after successful warm-up
             if self.persistent_state:
-                try:
-                    self.context.storage_state(path=self.state_file)
-                    logger.info(f"  Saved session state to {self.state_file}")
-                except Exception as e:
-                    logger.debug(f"Could not save state: {e}")
+                self.pool.save_state(base_url)
+                logger.info("  Saved session state")
             
             return True
             
@@ -447,19 +431,16 @@ class PlaywrightCrawler:
             return False
     
     def close(self):
-        """Close browser and cleanup resources."""
+        """Close this crawler's page (and the browser, if the pool is private)."""
         try:
-            if hasattr(self, 'page'):
+            if self.page is not None:
                 self.page.close()
-            if hasattr(self, 'context'):
-                self.context.close()
-            if hasattr(self, 'browser'):
-                self.browser.close()
-            if hasattr(self, 'playwright'):
-                self.playwright.stop()
-            logger.info("Playwright browser closed")
+                self.page = None
         except Exception as e:
-            logger.warning(f"Error closing Playwright: {str(e)}")
+            logger.warning(f"Error closing Playwright page: {str(e)}")
+        
+        if self.owns_pool:
+            self.pool.close()
     
     def __enter__(self):
         """Context manager entry."""
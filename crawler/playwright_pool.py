@@ -0,0 +1,206 @@
+import os
+import threading
+import logging
+from concurrent.futures import Executor
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+try:
+    from playwright.sync_api import sync_playwright, Browser, BrowserContext
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+    sync_playwright = None
+
+logger = logging.getLogger(__name__)
+
+# Launch with args to avoid detection
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+]
+
+# Extra args for visible mode (prevent focus stealing on macOS)
+VISIBLE_LAUNCH_ARGS = [
+    '--disable-popup-blocking',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+]
+
+# Realistic browser fingerprint for every context
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'locale': 'en-US',
+    'timezone_id': 'America/New_York',
+    'permissions': ['geolocation'],
+    'extra_http_headers': {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+    }
+}
+
+
+class PlaywrightPool:
+    """
+    Reuses Chromium browsers and per-host contexts across forums.
+
+    The sync Playwright API may only be used from the thread that started it, so
+    each worker thread lazily launches one browser and keeps one context per host
+    for every forum it crawls. Context cookies (e.g., Cloudflare clearance) are
+    persisted per host in <state_dir>/<host>.json and loaded on the next launch;
+    main.py clears them at startup (clear_state), so they only live for one run.
+    """
+
+    def __init__(self, headless: bool = True, state_dir: Optional[str] = None):
+        """
+        Initialize pool (no browser is started until the first context is requested).
+
+        Args:
+            headless: Run browsers in headless mode (default: True)
+            state_dir: Directory for per-host storage state (default: PLAYWRIGHT_STATE_DIR or .cache/playwright)
+        """
+        self.headless = headless
+        self.state_dir = state_dir or self.default_state_dir()
+        self._local = threading.local()
+
+    @staticmethod
+    def default_state_dir() -> str:
+        """Storage state directory: PLAYWRIGHT_STATE_DIR or .cache/playwright."""
+        return os.getenv('PLAYWRIGHT_STATE_DIR', os.path.join('.cache', 'playwright'))
+
+    @classmethod
+    def clear_state(cls, state_dir: Optional[str] = None):
+        """
+        Delete the storage state saved by previous runs.
+
+        Args:
+            state_dir: Directory to clear (default: default_state_dir())
+        """
+        state_dir = state_dir or cls.default_state_dir()
+        if not os.path.isdir(state_dir):
+            return
+
+        # Only the <host>.json files written by save_state, in case the directory holds anything else
+        for name in os.listdir(state_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                os.remove(os.path.join(state_dir, name))
+                logger.info(f"Deleted old Playwright state file: {name}")
+            except Exception as e:
+                logger.warning(f"Failed to delete Playwright state file: {e}")
+
+    def _get_browser(self) -> 'Browser':
+        """Get this thread's browser, launching it on first use."""
+        browser = getattr(self._local, 'browser', None)
+        if browser is None:
+            if not PLAYWRIGHT_AVAILABLE:
+                raise ImportError(
+                    "Playwright is not installed. Install it with:\n"
+                    "  pip install playwright\n"
+                    "  playwright install chromium"
+                )
+
+            launch_args = LAUNCH_ARGS if self.headless else LAUNCH_ARGS + VISIBLE_LAUNCH_ARGS
+            self._local.playwright = sync_playwright().start()
+            browser = self._local.playwright.chromium.launch(headless=self.headless, args=launch_args)
+            self._local.browser = browser
+            self._local.contexts = {}
+            logger.info(f"Playwright browser launched ({threading.current_thread().name})")
+        return browser
+
+    def _state_path(self, host: str) -> str:
+        """Path of the storage state file for a host."""
+        return os.path.join(self.state_dir, f"{host.replace(':', '_')}.json")
+
+    def get_context(self, url: str) -> 'BrowserContext':
+        """
+        Get the browser context for the host of a URL, creating it if needed.
+
+        Args:
+            url: Any URL on the host (e.g., forum.base_url)
+
+        Returns:
+            BrowserContext owned by the calling thread
+        """
+        browser = self._get_browser()
+        host = urlparse(url).netloc
+        contexts: Dict[str, 'BrowserContext'] = self._local.contexts
+
+        context = contexts.get(host)
+        if context is None:
+            options = dict(CONTEXT_OPTIONS)
+            state_path = self._state_path(host)
+            if os.path.exists(state_path):
+                options['storage_state'] = state_path
+                logger.info(f"Loaded persistent browser state from {state_path}")
+            context = browser.new_context(**options)
+            contexts[host] = context
+        return context
+
+    def save_state(self, url: str):
+        """
+        Persist cookies/local storage of the host's context for later forums and runs.
+
+        Args:
+            url: Any URL on the host
+        """
+        host = urlparse(url).netloc
+        context = getattr(self._local, 'contexts', {}).get(host)
+        if context is None:
+            return
+
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            context.storage_state(path=self._state_path(host))
+        except Exception as e:
+            logger.debug(f"Could not save state: {e}")
+
+    def close(self):
+        """Close the calling thread's contexts and browser."""
+        browser = getattr(self._local, 'browser', None)
+        if browser is None:
+            return
+
+        try:
+            for context in self._local.contexts.values():
+                context.close()
+            browser.close()
+            self._local.playwright.stop()
+            logger.info("Playwright browser closed")
+        except Exception as e:
+            logger.warning(f"Error closing Playwright: {str(e)}")
+        finally:
+            self._local.browser = None
+            self._local.contexts = {}
+
+    def close_all(self, executor: Executor, workers: int, timeout: float = 30):
+        """
+        Close the browsers of every worker thread of an executor.
+
+        Submits one close task per worker; a barrier keeps each task busy until all
+        have started, which forces them onto distinct threads.
+
+        Args:
+            executor: Thread pool whose workers used this pool
+            workers: Number of worker threads of the executor
+            timeout: Seconds to wait for all workers to pick up a close task
+        """
+        barrier = threading.Barrier(workers)
+
+        def close_on_worker():
+            try:
+                barrier.wait(timeout)
+            except threading.BrokenBarrierError:
+                pass
+            self.close()
+
+        for future in [executor.submit(close_on_worker) for _ in range(workers)]:
+            future.result()
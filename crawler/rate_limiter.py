@@ -0,0 +1,79 @@
+import threading
+import time
+import logging
+from typing import Dict
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how often requests may be issued."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second (e.g., 0.2 = one request every 5 seconds)
+            capacity: Maximum number of tokens that can accumulate (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """
+        Block until the requested number of tokens is available, then consume them.
+
+        Waiters are served one at a time, so requests sharing a bucket are serialized.
+
+        Args:
+            tokens: Number of tokens to consume (default: 1.0)
+        """
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+
+                time.sleep((tokens - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """Registry of per-host token buckets shared by crawlers running in parallel."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str, rate_limit: float) -> TokenBucket:
+        """
+        Get the token bucket for the host of a URL, creating it if needed.
+
+        The first forum to register a host sets its rate; later forums on the
+        same host share that bucket so their requests never overlap.
+
+        Args:
+            url: Any URL on the host (e.g., forum.base_url)
+            rate_limit: Minimum seconds between requests to this host
+
+        Returns:
+            TokenBucket shared by all crawlers of this host
+        """
+        host = urlparse(url).hostname or url
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(rate=1.0 / max(rate_limit, 0.001))
+                self._buckets[host] = bucket
+                logger.debug(f"Created rate limiter for {host}: 1 request per {rate_limit}s")
+            return bucket
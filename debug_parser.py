@@ -4,7 +4,6 @@ Debug script to inspect casino.guru HTML structure and test parser.
 """
 
 import httpx
-from bs4 import BeautifulSoup
 from parsers import CasinoGuruParser
 
 def inspect_page(url):
@@ -20,7 +19,7 @@ def inspect_page(url):
     response = httpx.get(url, headers=headers, follow_redirects=True, timeout=30)
     print(f"Status: {response.status_code}\n")
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = CasinoGuruParser.make_soup(response.text)
     
     # Save HTML for inspection
     with open('debug_page.html', 'w', encoding='utf-8') as f:
@@ -14,21 +14,52 @@ import json
 import os
 from datetime import datetime
 from dotenv import load_dotenv
-from models.base import get_session_maker, init_db
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+from sqlalchemy import event, insert, text
+from models.base import create_db_engine, get_session_maker, init_db
 from models import Forum, Keyword, Match
 
 # Load environment variables
 load_dotenv()
 
-def parse_datetime(dt_str):
+def parse_datetime(dt_str, _fromisoformat=datetime.fromisoformat):
     """Parse ISO format datetime string to datetime object."""
-    if not dt_str:
+    # Cheap shape check (YYYY-MM-DD...) rejects empty/malformed values without raising
+    if not dt_str or len(dt_str) < 10 or dt_str[4] != '-':
         return None
     try:
-        return datetime.fromisoformat(dt_str)
-    except:
+        return _fromisoformat(dt_str)
+    except ValueError:
         return None
 
+def enable_sqlite_bulk_pragmas(engine):
+    """
+    Configure SQLite connections for bulk loading.
+    
+    WAL avoids the rollback-journal write + fsync on every commit, mmap lets
+    page reads skip read() syscalls, and automatic checkpoints are deferred
+    until the import finishes (see checkpoint_sqlite_wal).
+    """
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+        cursor.execute("PRAGMA wal_autocheckpoint=0")
+        cursor.close()
+
+def checkpoint_sqlite_wal(session):
+    """Fold the WAL back into the database file and restore automatic checkpoints."""
+    session.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    session.execute(text("PRAGMA wal_autocheckpoint=1000"))
+
 def import_data():
     """Import all data from JSON to SQLite database."""
     print("=" * 70)
@@ -61,8 +92,13 @@ def import_data():
     
     # Load export data
     print(f"\nLoading {export_file}...")
-    with open(export_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # orjson parses bytes directly and is noticeably faster on large exports
+    if ORJSON_AVAILABLE:
+        with open(export_file, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(export_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     
     print(f"   Export Date: {data['export_date']}")
     print(f"   Source: {data['database_type']}")
@@ -70,6 +106,12 @@ def import_data():
     print(f"   Keywords: {data['counts']['keywords']}")
     print(f"   Matches: {data['counts']['matches']}")
     
+    # The engine is shared process-wide: register the pragmas before
+    # init_db() opens (and pools) the first connection
+    is_sqlite = db_url.startswith('sqlite')
+    if is_sqlite:
+        enable_sqlite_bulk_pragmas(create_db_engine())
+    
     # Initialize SQLite database
     print(f"\nInitializing SQLite database...")
     init_db()
@@ -81,35 +123,31 @@ def import_data():
     
     try:
         # Import Forums
+        # bulk_insert_mappings skips ORM object construction and attribute events
         print("\n[1/3] Importing Forums...")
-        for forum_data in data['forums']:
-            forum = Forum(
-                id=forum_data['id'],
-                name=forum_data['name'],
-                base_url=forum_data['base_url'],
-                type=forum_data['type'],
-                start_urls=forum_data['start_urls'],
-                pagination_type=forum_data['pagination_type'],
-                max_pages=forum_data['max_pages'],
-                enabled=forum_data['enabled'],
-                created_at=parse_datetime(forum_data.get('created_at')),
-                updated_at=parse_datetime(forum_data.get('updated_at')),
-            )
-            session.add(forum)
-        session.commit()
+        session.bulk_insert_mappings(Forum, [{
+            'id': forum_data['id'],
+            'name': forum_data['name'],
+            'base_url': forum_data['base_url'],
+            'type': forum_data['type'],
+            'start_urls': forum_data['start_urls'],
+            'pagination_type': forum_data['pagination_type'],
+            'max_pages': forum_data['max_pages'],
+            'enabled': forum_data['enabled'],
+            'created_at': parse_datetime(forum_data.get('created_at')),
+            'updated_at': parse_datetime(forum_data.get('updated_at')),
+        } for forum_data in data['forums']])
         print(f"   ✓ Imported {len(data['forums'])} forums")
         
         # Import Keywords
         print("\n[2/3] Importing Keywords...")
-        for keyword_data in data['keywords']:
-            keyword = Keyword(
-                id=keyword_data['id'],
-                keyword=keyword_data['keyword'],
-                enabled=keyword_data['enabled'],
-                created_at=parse_datetime(keyword_data.get('created_at')),
-                updated_at=parse_datetime(keyword_data.get('updated_at')),
-            )
-            session.add(keyword)
+        session.bulk_insert_mappings(Keyword, [{
+            'id': keyword_data['id'],
+            'keyword': keyword_data['keyword'],
+            'enabled': keyword_data['enabled'],
+            'created_at': parse_datetime(keyword_data.get('created_at')),
+            'updated_at': parse_datetime(keyword_data.get('updated_at')),
+        } for keyword_data in data['keywords']])
         session.commit()
         print(f"   ✓ Imported {len(data['keywords'])} keywords")
         
@@ -121,26 +159,28 @@ def import_data():
         
         for i in range(0, total_matches, batch_size):
             batch = matches_data[i:i + batch_size]
-            for match_data in batch:
-                match = Match(
-                    id=match_data['id'],
-                    forum_id=match_data['forum_id'],
-                    keyword_id=match_data['keyword_id'],
-                    page_url=match_data['page_url'],
-                    snippet=match_data['snippet'],
-                    created_at=parse_datetime(match_data.get('created_at')),
-                )
-                session.add(match)
+            # Export keys already match the column names: insert the dicts
+            # directly (Core executemany), only converting created_at
+            session.execute(insert(Match), [
+                {**match_data, 'created_at': parse_datetime(match_data.get('created_at'))}
+                for match_data in batch
+            ])
             session.commit()
             print(f"   Progress: {min(i + batch_size, total_matches)}/{total_matches} matches")
         
         print(f"   ✓ Imported {total_matches} matches")
         
+        if is_sqlite:
+            checkpoint_sqlite_wal(session)
+        
         # Verify import
         print("\n[4/4] Verifying import...")
-        forum_count = session.query(Forum).count()
-        keyword_count = session.query(Keyword).count()
-        match_count = session.query(Match).count()
+        # Single round-trip instead of one COUNT(*) query per table
+        forum_count, keyword_count, match_count = session.execute(text(
+            "SELECT (SELECT COUNT(*) FROM forums), "
+            "(SELECT COUNT(*) FROM keywords), "
+            "(SELECT COUNT(*) FROM matches)"
+        )).one()
         
         print(f"   Forums in database: {forum_count}")
         print(f"   Keywords in database: {keyword_count}")
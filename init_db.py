@@ -7,6 +7,7 @@ Creates tables and optionally loads sample data.
 
 import sys
 import argparse
+from sqlalchemy import insert
 from models.base import init_db, get_session_maker
 from models import Forum, Keyword
 
@@ -14,33 +15,33 @@ def create_sample_data(session):
     """Create sample forum and keywords for testing."""
     
     # Create sample forum for casino.guru
-    forum = Forum(
-        name='casino.guru',
-        base_url='https://casino.guru',
-        type='category',
-        start_urls=[
+    forum = {
+        'name': 'casino.guru',
+        'base_url': 'https://casino.guru',
+        'type': 'category',
+        'start_urls': [
             'https://casino.guru/forum'
         ],
-        pagination_type='page_number',
-        max_pages=5,
-        enabled=True
-    )
-    session.add(forum)
+        'pagination_type': 'page_number',
+        'max_pages': 5,
+        'enabled': True,
+    }
     
     # Create sample keywords
     keywords = [
-        Keyword(keyword='bonus', enabled=True),
-        Keyword(keyword='scam', enabled=True),
-        Keyword(keyword='withdrawal', enabled=True),
+        {'keyword': 'bonus', 'enabled': True},
+        {'keyword': 'scam', 'enabled': True},
+        {'keyword': 'withdrawal', 'enabled': True},
     ]
     
-    for keyword in keywords:
-        session.add(keyword)
+    # Core inserts: no ORM instances needed for plain seed rows
+    session.execute(insert(Forum), [forum])
+    session.execute(insert(Keyword), keywords)
     
     session.commit()
     print("Sample data created successfully!")
-    print(f"- Forum: {forum.name}")
-    print(f"- Keywords: {', '.join(k.keyword for k in keywords)}")
+    print(f"- Forum: {forum['name']}")
+    print(f"- Keywords: {', '.join(k['keyword'] for k in keywords)}")
 
 
 def main():
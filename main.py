@@ -10,14 +10,24 @@ import sys
 import argparse
 import os
 import json
-from typing import Dict, List, Optional
+import hashlib
+import heapq
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import count
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, sessionmaker
 
-from models import Forum, Keyword
-from models.base import get_session_maker, init_db
-from crawler import ForumCrawler
-from parsers import CasinoGuruParser, BitcoinTalkParser, RedditParser, AskGamblersParser, BigWinBoardParser, XenForoParser, OwnedCoreParser, MoneySavingExpertParser, LCBParser
+from models import Forum, Keyword, KeywordRow, Match
+from models.base import create_db_engine, get_session_maker, json_loads
+from models.migrations import upgrade_schema
+from crawler import ForumCrawler, HostRateLimiter, HttpCache, KeywordMatcher, PlaywrightPool
+from parsers import BaseParser, get_parser
 from notifier import TelegramNotifier
 
 # Configure logging
@@ -41,76 +51,132 @@ matches_logger.addHandler(matches_handler)
 matches_logger.propagate = False  # Don't propagate to root logger (avoid duplicate in crawler.log)
 
 
-def get_cookies_for_forum(forum_name: str) -> Optional[Dict[str, str]]:
+@dataclass(frozen=True)
+class ForumProfile:
+    """Per-forum crawl settings: parser, request pacing and bot-protection bypass."""
+    parser: str  # Parser name for parsers.get_parser
+    rate_limit: float = 5.0  # Minimum seconds between requests
+    use_playwright: bool = False  # Cloudflare/bot protection or JS rendering
+    use_flaresolverr: bool = False  # FlareSolverr disabled - using Playwright with persistent state instead
+
+
+# Reddit: 100 requests per 10 minutes; slow down further to avoid 403s
+REDDIT_PROFILE = ForumProfile('reddit', rate_limit=12.0)
+DEFAULT_PROFILE = ForumProfile('casino_guru')
+
+_CASINO_GURU = ForumProfile('casino_guru')
+_BITCOINTALK = ForumProfile('bitcointalk')
+_ASKGAMBLERS = ForumProfile('askgamblers', use_playwright=True)
+_BIGWINBOARD = ForumProfile('bigwinboard', use_playwright=True)
+_CASINOMEISTER = ForumProfile('xenforo', use_playwright=True)
+_OWNEDCORE = ForumProfile('ownedcore', use_playwright=True)
+_MONEYSAVINGEXPERT = ForumProfile('moneysavingexpert', use_playwright=True)
+_LCB = ForumProfile('lcb', use_playwright=True)  # Aggressive anti-scraping (connection resets)
+
+# Forum name (lowercase) -> crawl profile
+FORUM_PROFILES = {
+    'casino.guru': _CASINO_GURU,
+    'casino_guru': _CASINO_GURU,
+    'bitcointalk': _BITCOINTALK,
+    'bitcointalk.org': _BITCOINTALK,
+    'askgamblers': _ASKGAMBLERS,
+    'askgamblers.com': _ASKGAMBLERS,
+    'bigwinboard': _BIGWINBOARD,
+    'bigwinboard.com': _BIGWINBOARD,
+    'casinomeister': _CASINOMEISTER,
+    'casinomeister.com': _CASINOMEISTER,
+    'ownedcore': _OWNEDCORE,
+    'ownedcore.com': _OWNEDCORE,
+    'moneysavingexpert': _MONEYSAVINGEXPERT,
+    'moneysavingexpert.com': _MONEYSAVINGEXPERT,
+    'lcb.org': _LCB,
+    'lcb': _LCB,
+}
+
+
+@lru_cache(maxsize=64)
+def _load_cookies(env_key: str) -> Optional[Mapping[str, str]]:
     """
-    Load cookies from environment for specific forums.
+    Parse a cookies JSON environment variable once per process.
     
     Args:
-        forum_name: Name of the forum
+        env_key: Environment variable name
         
     Returns:
-        Dict of cookies or None
+        Read-only mapping of cookies or None
     """
-    # Check for forum-specific cookies in environment
-    # Format: CASINOMEISTER_COOKIES='{"cookie_name": "cookie_value", ...}'
-    env_key = f"{forum_name.upper().replace('.', '_').replace('-', '_')}_COOKIES"
     cookies_json = os.getenv(env_key)
     
     if cookies_json:
         try:
-            cookies = json.loads(cookies_json)
-            logger.info(f"Loaded {len(cookies)} cookies for {forum_name}")
-            return cookies
+            return MappingProxyType(json_loads(cookies_json))
         except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse cookies for {forum_name}: {e}")
+            logger.warning(f"Failed to parse cookies from {env_key}: {e}")
     
     return None
 
 
-def get_parser_for_forum(forum_name: str):
+def get_cookies_for_forum(forum_name: str) -> Optional[Mapping[str, str]]:
     """
-    Get the appropriate parser for a forum.
+    Load cookies from environment for specific forums.
     
     Args:
         forum_name: Name of the forum
         
     Returns:
-        Parser instance
+        Read-only mapping of cookies or None
+    """
+    # Check for forum-specific cookies in environment
+    # Format: CASINOMEISTER_COOKIES='{"cookie_name": "cookie_value", ...}'
+    env_key = f"{forum_name.upper().replace('.', '_').replace('-', '_')}_COOKIES"
+    cookies = _load_cookies(env_key)
+    
+    if cookies:
+        logger.info(f"Loaded {len(cookies)} cookies for {forum_name}")
+    
+    return cookies
+
+
+def get_forum_profile(forum_name: str) -> ForumProfile:
+    """
+    Get the crawl profile for a forum.
+    
+    Args:
+        forum_name: Name of the forum
+        
+    Returns:
+        ForumProfile (DEFAULT_PROFILE for unknown forums)
     """
-    # Check if it's a Reddit forum
     # Supports both 'reddit' (single forum) and 'r/subreddit' (per-subreddit forums)
-    if forum_name.lower() == 'reddit' or forum_name.startswith('r/'):
-        return RedditParser()
-    
-    parsers = {
-        'casino.guru': CasinoGuruParser,
-        'casino_guru': CasinoGuruParser,
-        'bitcointalk': BitcoinTalkParser,
-        'bitcointalk.org': BitcoinTalkParser,
-        'askgamblers': AskGamblersParser,
-        'askgamblers.com': AskGamblersParser,
-        'bigwinboard': BigWinBoardParser,
-        'bigwinboard.com': BigWinBoardParser,
-        'casinomeister': XenForoParser,
-        'casinomeister.com': XenForoParser,
-        'ownedcore': OwnedCoreParser,
-        'ownedcore.com': OwnedCoreParser,
-        'moneysavingexpert': MoneySavingExpertParser,
-        'moneysavingexpert.com': MoneySavingExpertParser,
-        'lcb.org': LCBParser,
-        'lcb': LCBParser,
-    }
-    
-    parser_class = parsers.get(forum_name.lower())
-    if not parser_class:
+    if forum_name.startswith('r/'):
+        return REDDIT_PROFILE
+    
+    name = forum_name.lower()
+    if name == 'reddit':
+        return REDDIT_PROFILE
+    
+    profile = FORUM_PROFILES.get(name)
+    if not profile:
         # Default to CasinoGuruParser as fallback
         logger.warning(f"No specific parser for '{forum_name}', using CasinoGuruParser")
-        parser_class = CasinoGuruParser
+        profile = DEFAULT_PROFILE
+    return profile
+
+
+def get_parser_for_forum(forum_name: str) -> BaseParser:
+    """
+    Get the appropriate parser for a forum.
     
-    return parser_class()
+    Args:
+        forum_name: Name of the forum
+        
+    Returns:
+        Parser instance (shared unless the parser keeps per-crawl state, like RedditParser)
+    """
+    return get_parser(get_forum_profile(forum_name).parser)
 
 
-def crawl_forum(session: Session, forum: Forum, keywords: List[Keyword], notifier: TelegramNotifier = None) -> Dict[str, int]:
+def crawl_forum(session: Session, forum: Forum, keywords: List[KeywordRow], notifier: TelegramNotifier = None, limiters: Optional[HostRateLimiter] = None, matcher: Optional[KeywordMatcher] = None, http_cache: Optional[HttpCache] = None, pw_pool: Optional[PlaywrightPool] = None) -> Dict[str, int]:
     """
     Crawl a single forum for keywords.
     
@@ -119,46 +185,28 @@ def crawl_forum(session: Session, forum: Forum, keywords: List[Keyword], notifie
         forum: Forum to crawl
         keywords: Keywords to search for
         notifier: Optional Telegram notifier
+        limiters: Optional per-host rate limiters shared across concurrently crawled forums
+        matcher: Optional keyword matcher built once for all forums
+        http_cache: Optional ETag/Last-Modified store for conditional category page fetches
+        pw_pool: Optional Playwright pool reusing browsers and per-host contexts across forums
         
     Returns:
         Dict with crawl statistics
     """
     logger.info(f"Processing forum: {forum.name}")
     
-    # Get appropriate parser
-    parser = get_parser_for_forum(forum.name)
+    # Get parser, rate limit and bypass method for this forum
+    profile = get_forum_profile(forum.name)
+    parser = get_parser(profile.parser)  # Shared instance, except stateful RedditParser
+    rate_limit = profile.rate_limit
+    use_playwright = profile.use_playwright
+    use_flaresolverr = profile.use_flaresolverr
     
     # Get cookies if available
     cookies = get_cookies_for_forum(forum.name)
     
-    # Set rate limit based on forum type
-    # Reddit: 100 requests per 10 minutes = 1 request per 6 seconds minimum
-    # CasinoMeister/OwnedCore/MoneySavingExpert/AskGamblers/BigWinBoard: Has bot protection or JS rendering, use 3 seconds
-    # LCB.org: Aggressive anti-scraping, use 5 seconds to avoid connection resets
-    is_reddit = forum.name.lower() == 'reddit' or forum.name.startswith('r/')
-    is_casinomeister = 'casinomeister' in forum.name.lower()
-    is_ownedcore = 'ownedcore' in forum.name.lower()
-    is_moneysavingexpert = 'moneysavingexpert' in forum.name.lower()
-    is_askgamblers = 'askgamblers' in forum.name.lower()
-    is_bigwinboard = 'bigwinboard' in forum.name.lower()
-    is_lcb = 'lcb' in forum.name.lower()
-    
-    if is_reddit:
-        rate_limit = 12.0  # Reddit aggressive rate limiting - slow down to avoid 403s
-    elif is_lcb:
-        rate_limit = 5.0  # LCB.org has aggressive anti-scraping protection
-    elif is_casinomeister or is_ownedcore or is_moneysavingexpert or is_askgamblers or is_bigwinboard:
-        rate_limit = 5.0  # Playwright/bot protection bypass or JS rendering
-    else:
-        rate_limit = 5.0
-    
     logger.info(f"Using rate limit: {rate_limit}s per request")
     
-    # Choose Cloudflare/bot bypass method
-    # All forums with aggressive Cloudflare or JS rendering: Use Playwright with advanced bypass
-    use_flaresolverr = False  # FlareSolverr disabled - using Playwright with persistent state instead
-    use_playwright = is_casinomeister or is_moneysavingexpert or is_askgamblers or is_bigwinboard or is_ownedcore or is_lcb
-    
     if use_flaresolverr:
         logger.info("Enabling FlareSolverr for Cloudflare bypass")
     elif use_playwright:
@@ -168,27 +216,31 @@ def crawl_forum(session: Session, forum: Forum, keywords: List[Keyword], notifie
     # Set PLAYWRIGHT_HEADLESS=false to see browser window (useful on macOS for testing)
     headless = os.getenv('PLAYWRIGHT_HEADLESS', 'true').lower() != 'false'
     
+    # Forums on the same host share one token bucket so their requests never overlap
+    limiter = limiters.for_url(forum.base_url, rate_limit) if limiters else None
+    
     # Create crawler with appropriate rate limit and cookies
-    crawler = ForumCrawler(session, parser, rate_limit=rate_limit, cookies=cookies, use_playwright=use_playwright, use_flaresolverr=use_flaresolverr, headless=headless)
+    crawler = ForumCrawler(session, parser, rate_limit=rate_limit, cookies=cookies, use_playwright=use_playwright, use_flaresolverr=use_flaresolverr, headless=headless, limiter=limiter, http_cache=http_cache, pw_pool=pw_pool)
     
     # Crawl and get results
-    stats = crawler.crawl_forum(forum, keywords)
-    
-    # Get matches from database for this forum (for notifications)
-    from models import Match
-    matches = session.query(Match).filter(
-        Match.forum_id == forum.id,
-        Match.keyword_id.in_([k.id for k in keywords])
-    ).all()
+    stats = crawler.crawl_forum(forum, keywords, matcher)
     
     # Log match results to separate matches.log file
     matches_count = stats['matches_found']
     pages = stats.get('pages_crawled', 0)
     
+    # Get only the matches saved by this crawl (newest N rows) for logging/notifications
+    matches = []
+    if matches_count > 0:
+        matches = session.query(Match).options(selectinload(Match.keyword)).filter(
+            Match.forum_id == forum.id,
+            Match.keyword_id.in_([k.id for k in keywords])
+        ).order_by(Match.id.desc()).limit(matches_count).all()[::-1]
+    
     if matches_count > 0:
         matches_logger.info(f"⚠️⚠️⚠️⚠️ MATCHES FOUND - Forum: {forum.name}, Pages: {pages}, Matches: {matches_count}")
         # Log each match detail
-        for m in matches[-matches_count:]:
+        for m in matches:
             matches_logger.info(f"  → Keyword: '{m.keyword.keyword}' | URL: {m.page_url}")
             matches_logger.info(f"     Snippet: {m.snippet[:200]}...")
     else:
@@ -202,23 +254,29 @@ def crawl_forum(session: Session, forum: Forum, keywords: List[Keyword], notifie
                 'keyword': m.keyword.keyword,
                 'url': m.page_url,
                 'snippet': m.snippet
-            } for m in matches[-stats['matches_found']:]]
+            } for m in matches]
         
         notifier.notify_forum_results(forum.name, stats, match_data)
     
     return stats
 
 
-def crawl_all_forums(session: Session, notifier: TelegramNotifier = None) -> Dict[str, Dict]:
+def crawl_all_forums(session: Session, notifier: TelegramNotifier = None, max_workers: int = 8, http_cache: Optional[HttpCache] = None) -> Dict[str, Dict]:
     """
     Crawl all enabled forums for all enabled keywords with automatic retry on rate limits.
     
-    When a forum hits rate limits (e.g., Reddit 403), it moves to the next forum
-    and retries the blocked forum after all others are processed.
+    Forums are crawled concurrently by a bounded thread pool. Requests to the same
+    host (e.g., several r/<subreddit> forums) share a token bucket and are serialized,
+    while forums on different hosts proceed independently.
+    
+    When a forum hits rate limits (e.g., Reddit 403), it is rescheduled for a
+    retry after a cool-down; other forums keep crawling in the meantime.
     
     Args:
         session: Database session
         notifier: Optional Telegram notifier
+        max_workers: Maximum number of forums crawled at the same time
+        http_cache: Optional ETag/Last-Modified store shared by all workers
         
     Returns:
         Dict mapping forum names to crawl statistics
@@ -226,8 +284,8 @@ def crawl_all_forums(session: Session, notifier: TelegramNotifier = None) -> Dic
     # Get all enabled forums
     forums = session.query(Forum).filter(Forum.enabled == True).all()
     
-    # Get all enabled keywords
-    keywords = session.query(Keyword).filter(Keyword.enabled == True).all()
+    # Get all enabled keywords as plain rows (ORM objects must not cross threads)
+    keywords = [KeywordRow.from_keyword(k) for k in session.query(Keyword).filter(Keyword.enabled == True)]
     
     if not forums:
         logger.warning("No enabled forums found in database")
@@ -239,65 +297,99 @@ def crawl_all_forums(session: Session, notifier: TelegramNotifier = None) -> Dic
     
     logger.info(f"Starting crawl: {len(forums)} forums, {len(keywords)} keywords")
     
+    # Unchanged listings are skipped only while the keywords they were checked for are the same
+    if http_cache:
+        keyword_set = '\n'.join(sorted({k.keyword.lower() for k in keywords}))
+        http_cache.set_scope(hashlib.sha256(keyword_set.encode('utf-8')).hexdigest())
+    
     results = {}
-    failed_forums = []  # Forums that hit rate limits
     max_retries = 2  # Maximum retry attempts per forum
     retry_wait_minutes = 30  # Wait time before retrying rate-limited forums
     
-    # First pass: crawl all forums
-    for forum in forums:
+    # Sessions are not thread-safe: each worker gets its own from the same engine
+    WorkerSession = sessionmaker(bind=session.get_bind(), autoflush=False)
+    limiters = HostRateLimiter()
+    
+    # Compile the keywords once; the matcher is read-only and shared by all workers
+    matcher = KeywordMatcher(keywords)
+    
+    # Playwright browsers are launched lazily and reused by each worker thread
+    headless = os.getenv('PLAYWRIGHT_HEADLESS', 'true').lower() != 'false'
+    pw_pool = PlaywrightPool(headless=headless)
+    workers = min(len(forums), max_workers)
+    
+    def crawl_forum_worker(forum: Forum) -> Dict[str, int]:
+        """Crawl one forum in a worker thread with a dedicated session."""
+        worker_session = WorkerSession()
         try:
             logger.info(f"Processing forum: {forum.name}")
-            stats = crawl_forum(session, forum, keywords, notifier)
-            results[forum.name] = stats
-            
-            # Check if forum hit rate limits (high error rate)
-            error_rate = stats.get('errors', 0) / max(stats.get('threads_found', 1), 1)
-            if error_rate > 0.5 and stats.get('errors', 0) > 10:
-                logger.warning(f"{forum.name} hit rate limits (error rate: {error_rate:.0%})")
-                failed_forums.append({'forum': forum, 'retry_count': 0})
+            return crawl_forum(worker_session, forum, keywords, notifier, limiters, matcher, http_cache, pw_pool)
         except Exception as e:
             logger.error(f"Error crawling {forum.name}: {str(e)}")
-            results[forum.name] = {'matches_found': 0, 'pages_crawled': 0, 'errors': 1}
-    
-    # Retry pass: attempt rate-limited forums after waiting
-    if failed_forums:
-        logger.info(f"\n{'='*60}")
-        logger.info(f"Detected {len(failed_forums)} forum(s) with rate limiting")
-        logger.info(f"Waiting {retry_wait_minutes} minutes before retry...")
-        logger.info(f"{'='*60}\n")
-        
-        import time
-        time.sleep(retry_wait_minutes * 60)  # Wait before retrying
-        
-        for item in failed_forums[:]:  # Copy list to allow modification
-            forum = item['forum']
-            retry_count = item['retry_count']
-            
-            if retry_count >= max_retries:
-                logger.warning(f"Skipping {forum.name} - max retries reached")
-                continue
-            
-            try:
-                logger.info(f"Retrying forum: {forum.name} (attempt {retry_count + 1}/{max_retries})")
-                stats = crawl_forum(session, forum, keywords, notifier)
+            return {'matches_found': 0, 'pages_crawled': 0, 'errors': 1}
+        finally:
+            worker_session.close()
+    
+    # Work queue ordered by ready time: (ready_at, seq, retry_count, forum).
+    # seq breaks ties so Forum objects are never compared.
+    seq = count()
+    queue = [(0.0, next(seq), 0, forum) for forum in forums]
+    heapq.heapify(queue)
+    running = {}  # Future -> (forum, retry_count)
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            while queue or running:
+                # Start everything that is ready now
+                now = time.monotonic()
+                while queue and queue[0][0] <= now:
+                    _, _, retry_count, forum = heapq.heappop(queue)
+                    if retry_count:
+                        logger.info(f"Retrying forum: {forum.name} (attempt {retry_count}/{max_retries})")
+                    running[executor.submit(crawl_forum_worker, forum)] = (forum, retry_count)
                 
-                # Merge stats with previous results
-                prev_stats = results.get(forum.name, {})
-                results[forum.name] = {
-                    'matches_found': prev_stats.get('matches_found', 0) + stats.get('matches_found', 0),
-                    'pages_crawled': prev_stats.get('pages_crawled', 0) + stats.get('pages_crawled', 0),
-                    'threads_found': prev_stats.get('threads_found', 0) + stats.get('threads_found', 0),
-                    'errors': prev_stats.get('errors', 0) + stats.get('errors', 0),
-                }
+                next_ready = max(queue[0][0] - now, 0) if queue else None
+                if not running:
+                    # Nothing else to work on: sleep until the next retry is due
+                    time.sleep(next_ready)
+                    continue
                 
-                logger.info(f"✓ Successfully retried {forum.name}")
-                failed_forums.remove(item)
-            except Exception as e:
-                logger.error(f"Retry failed for {forum.name}: {str(e)}")
-                item['retry_count'] += 1
-    
-    return results
+                # Wake on the first finished forum or when the next retry is due
+                done, _ = wait(running, timeout=next_ready, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    forum, retry_count = running.pop(future)
+                    stats = future.result()
+                    
+                    # Merge stats with previous attempts
+                    prev_stats = results.get(forum.name, {})
+                    results[forum.name] = {
+                        'matches_found': prev_stats.get('matches_found', 0) + stats.get('matches_found', 0),
+                        'pages_crawled': prev_stats.get('pages_crawled', 0) + stats.get('pages_crawled', 0),
+                        'threads_found': prev_stats.get('threads_found', 0) + stats.get('threads_found', 0),
+                        'errors': prev_stats.get('errors', 0) + stats.get('errors', 0),
+                    }
+                    
+                    # Check if forum hit rate limits (high error rate)
+                    error_rate = stats.get('errors', 0) / max(stats.get('threads_found', 1), 1)
+                    if error_rate > 0.5 and stats.get('errors', 0) > 10:
+                        if retry_count >= max_retries:
+                            logger.warning(f"Skipping {forum.name} - max retries reached")
+                            continue
+                        
+                        logger.warning(
+                            f"{forum.name} hit rate limits (error rate: {error_rate:.0%}), "
+                            f"retrying in {retry_wait_minutes} minutes"
+                        )
+                        heapq.heappush(queue, (time.monotonic() + retry_wait_minutes * 60, next(seq), retry_count + 1, forum))
+                    elif retry_count:
+                        logger.info(f"✓ Successfully retried {forum.name}")
+        finally:
+            # Each browser must be closed by the worker thread that launched it
+            pw_pool.close_all(executor, workers)
+    
+    # Report in configuration order rather than completion order
+    return {forum.name: results[forum.name] for forum in forums if forum.name in results}
 
 
 def print_summary(results: Dict[str, Dict]):
@@ -343,37 +435,35 @@ def main():
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
     parser.add_argument('--rate-limit', type=float, help='Rate limit in seconds')
     parser.add_argument('--no-telegram', action='store_true', help='Disable Telegram notifications')
+    parser.add_argument('--invalidate-cache', action='store_true', help='Forget cached ETags and re-download all category pages')
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    # Clean up Playwright state file from previous runs
-    state_file = 'playwright_state.json'
-    if os.path.exists(state_file):
-        try:
-            os.remove(state_file)
-            logger.info(f"Deleted old Playwright state file: {state_file}")
-        except Exception as e:
-            logger.warning(f"Failed to delete Playwright state file: {e}")
+    # Clean up Playwright state from previous runs (it is still shared across forums within this run)
+    PlaywrightPool.clear_state()
     
     # Initialize Telegram notifier
     notifier = None if args.no_telegram else TelegramNotifier()
     
-    # Get database session
-    SessionMaker = get_session_maker()
-    session = SessionMaker()
+    # Number of forums crawled in parallel (same-host forums are still serialized)
+    max_workers = max(1, int(os.getenv('MAX_FORUM_WORKERS', '8')))
+    
+    # Conditional GET validators for category pages (unchanged listings are skipped)
+    http_cache = HttpCache()
+    if args.invalidate_cache:
+        http_cache.clear()
     
     # Run crawler
     try:
+        # Databases created by older versions lack columns the crawl writes (e.g. matches.page_url_hash)
+        upgrade_schema(create_db_engine())
         SessionMaker = get_session_maker()
-        session = SessionMaker()
-        
-        results = crawl_all_forums(session, notifier=notifier)
-        print_summary(results)
-        
-        session.close()
+        with closing(SessionMaker()) as session, closing(http_cache):
+            results = crawl_all_forums(session, notifier=notifier, max_workers=max_workers, http_cache=http_cache)
+            print_summary(results)
         
     except KeyboardInterrupt:
         logger.info("Crawl interrupted by user")
@@ -381,6 +471,9 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {str(e)}", exc_info=True)
         sys.exit(1)
+    finally:
+        if notifier:
+            notifier.close()
 
 
 if __name__ == '__main__':
@@ -4,9 +4,8 @@ Forum management CLI tool.
 """
 
 import sys
-import json
 import argparse
-from models.base import get_session_maker
+from models.base import get_session_maker, json_loads
 from models import Forum
 
 
@@ -38,7 +37,7 @@ def add_forum(session, name, base_url, start_urls, forum_type='category', max_pa
     try:
         # Parse start_urls if it's a JSON string
         if isinstance(start_urls, str):
-            start_urls = json.loads(start_urls)
+            start_urls = json_loads(start_urls)
         
         forum = Forum(
             name=name,
@@ -67,7 +66,7 @@ def update_forum(session, forum_id, **kwargs):
     for key, value in kwargs.items():
         if value is not None:
             if key == 'start_urls' and isinstance(value, str):
-                value = json.loads(value)
+                value = json_loads(value)
             setattr(forum, key, value)
     
     session.commit()
@@ -148,7 +147,7 @@ def main():
         elif args.command == 'add':
             # Handle comma-separated or JSON
             if args.start_urls.startswith('['):
-                start_urls = json.loads(args.start_urls)
+                start_urls = json_loads(args.start_urls)
             else:
                 start_urls = [url.strip() for url in args.start_urls.split(',')]
             add_forum(session, args.name, args.base_url, start_urls, args.type, args.max_pages)
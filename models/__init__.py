@@ -1,5 +1,5 @@
 from .forum import Forum
-from .keyword import Keyword
+from .keyword import Keyword, KeywordRow
 from .match import Match
 
-__all__ = ['Forum', 'Keyword', 'Match']
+__all__ = ['Forum', 'Keyword', 'KeywordRow', 'Match']
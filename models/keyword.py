@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from sqlalchemy import Column, Integer, String, Boolean, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -18,3 +19,16 @@ class Keyword(Base):
     
     def __repr__(self):
         return f"<Keyword(id={self.id}, keyword='{self.keyword}', enabled={self.enabled})>"
+
+
+@dataclass(frozen=True, slots=True)
+class KeywordRow:
+    """Detached, immutable copy of a Keyword that is safe to share across threads."""
+    
+    id: int
+    keyword: str
+    
+    @classmethod
+    def from_keyword(cls, keyword: Keyword) -> 'KeywordRow':
+        """Copy the id and text out of an ORM Keyword."""
+        return cls(id=keyword.id, keyword=keyword.keyword)
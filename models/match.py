@@ -1,16 +1,34 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, UniqueConstraint, Index
-from sqlalchemy.orm import relationship
+import hashlib
+from typing import Dict, List
+
+from sqlalchemy import BINARY, Column, Integer, LargeBinary, Text, ForeignKey, DateTime, UniqueConstraint, Index, insert
+from sqlalchemy.orm import Session, relationship
 from sqlalchemy.sql import func
 from .base import Base
 
 
+def hash_page_url(url: str) -> bytes:
+    """MD5 digest of a page URL, used as the compact key in uq_forum_keyword_url_hash."""
+    return hashlib.md5(url.encode('utf-8')).digest()
+
+
+def _default_page_url_hash(context) -> bytes:
+    """Fill page_url_hash from page_url on every insert path (ORM, Core, bulk)."""
+    return hash_page_url(context.get_current_parameters()['page_url'])
+
+
 class Match(Base):
     __tablename__ = 'matches'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     forum_id = Column(Integer, ForeignKey('forums.id', ondelete='CASCADE'), nullable=False)
     keyword_id = Column(Integer, ForeignKey('keywords.id', ondelete='CASCADE'), nullable=False)
-    page_url = Column(String(500), nullable=False)  # Reduced to 500 for MySQL index limit
+    page_url = Column(Text, nullable=False)  # Full URL for display; uniqueness uses page_url_hash
+    page_url_hash = Column(
+        BINARY(16).with_variant(LargeBinary(), 'postgresql'),  # PostgreSQL has no BINARY: use BYTEA
+        nullable=False,
+        default=_default_page_url_hash,  # md5(page_url)
+    )
     snippet = Column(Text, nullable=False)  # Text snippet containing the keyword
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -18,13 +36,52 @@ class Match(Base):
     forum = relationship('Forum', back_populates='matches')
     keyword = relationship('Keyword', back_populates='matches')
     
-    # Prevent duplicate matches
-    # MySQL utf8mb4: 500 chars * 4 bytes = 2000 bytes (within 3072 byte limit)
+    # Prevent duplicate matches (16-byte hash keeps the unique index small)
     __table_args__ = (
-        UniqueConstraint('forum_id', 'keyword_id', 'page_url', name='uq_forum_keyword_url'),
+        UniqueConstraint('forum_id', 'keyword_id', 'page_url_hash', name='uq_forum_keyword_url_hash'),
         Index('idx_created_at', 'created_at'),
-        Index('idx_forum_keyword', 'forum_id', 'keyword_id'),
+        # Per-forum notification/recent-match queries; leftmost prefix also serves (forum_id, keyword_id) lookups
+        Index('idx_forum_keyword_created', 'forum_id', 'keyword_id', 'created_at'),
     )
     
     def __repr__(self):
         return f"<Match(id={self.id}, forum_id={self.forum_id}, keyword_id={self.keyword_id})>"
+    
+    @classmethod
+    def bulk_upsert(cls, session: Session, rows: List[Dict], batch_size: int = 500) -> int:
+        """
+        Insert match rows in batches, skipping duplicates of uq_forum_keyword_url_hash.
+        
+        Duplicates are dropped by the database (INSERT IGNORE on MySQL, INSERT OR
+        IGNORE on SQLite, ON CONFLICT DO NOTHING on PostgreSQL), so no per-row
+        existence check or IntegrityError round-trip is needed. Does not commit.
+        
+        Args:
+            session: Database session
+            rows: Dicts with forum_id, keyword_id, page_url and snippet (page_url_hash is derived)
+            batch_size: Rows sent per INSERT statement
+            
+        Returns:
+            Number of rows actually inserted
+        """
+        dialect = session.get_bind().dialect.name
+        if dialect == 'mysql':
+            # Not ON DUPLICATE KEY UPDATE: SQLAlchemy connects with CLIENT_FOUND_ROWS, so a
+            # no-op update of a duplicate still counts as an affected row and the returned
+            # count (matches_found, used to select matches for notifications) would be wrong
+            stmt = insert(cls).prefix_with('IGNORE')
+        elif dialect == 'sqlite':
+            stmt = insert(cls).prefix_with('OR IGNORE')
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+            stmt = pg_insert(cls).on_conflict_do_nothing(constraint='uq_forum_keyword_url_hash')
+        else:
+            stmt = insert(cls)
+        
+        inserted = 0
+        connection = session.connection()
+        for i in range(0, len(rows), batch_size):
+            result = connection.execute(stmt, rows[i:i + batch_size])
+            inserted += max(result.rowcount, 0)
+        
+        return inserted
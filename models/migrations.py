@@ -0,0 +1,117 @@
+"""
+Idempotent schema upgrades for databases created by older versions.
+
+create_all() only creates missing tables, so changes to existing tables are
+applied here. Every step checks the live schema first and can be re-run safely.
+"""
+
+import logging
+from sqlalchemy import MetaData, Table, bindparam, inspect, select, text, update
+from sqlalchemy.engine import Engine
+
+from .base import Base
+
+logger = logging.getLogger(__name__)
+
+# (table, index) pairs removed from the models
+OBSOLETE_INDEXES = [
+    ('matches', 'idx_forum_keyword'),  # Subsumed by idx_forum_keyword_created / uq_forum_keyword_url
+]
+
+
+def create_missing_indexes(engine: Engine):
+    """Create indexes declared on the models that existing tables lack."""
+    inspector = inspect(engine)
+    
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(engine)
+                logger.info(f"Created index {index.name} on {table.name}")
+
+
+def drop_obsolete_indexes(engine: Engine):
+    """Drop indexes that are no longer declared on the models."""
+    inspector = inspect(engine)
+    
+    for table_name, index_name in OBSOLETE_INDEXES:
+        if not inspector.has_table(table_name):
+            continue
+        
+        if index_name not in {index['name'] for index in inspector.get_indexes(table_name)}:
+            continue
+        
+        reflected = Table(table_name, MetaData(), autoload_with=engine)
+        for index in reflected.indexes:
+            if index.name == index_name:
+                index.drop(engine)
+                logger.info(f"Dropped obsolete index {index_name} on {table_name}")
+
+
+def add_page_url_hash(engine: Engine, batch_size: int = 1000):
+    """
+    Move match uniqueness from the 500-char page_url to a 16-byte page_url_hash.
+    
+    Adds and backfills page_url_hash, creates uq_forum_keyword_url_hash, then drops
+    the old uq_forum_keyword_url and widens page_url to TEXT. SQLite cannot drop
+    table constraints, so there the old constraint stays (it enforces the same rule).
+    """
+    from .match import Match, hash_page_url
+    
+    inspector = inspect(engine)
+    if not inspector.has_table('matches'):
+        return
+    
+    dialect = engine.dialect.name
+    matches = Match.__table__
+    columns = {column['name'] for column in inspector.get_columns('matches')}
+    uniques = {uc['name'] for uc in inspector.get_unique_constraints('matches')}
+    uniques |= {index['name'] for index in inspector.get_indexes('matches') if index.get('unique')}
+    
+    with engine.begin() as conn:
+        if 'page_url_hash' not in columns:
+            hash_type = matches.c.page_url_hash.type.compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE matches ADD COLUMN page_url_hash {hash_type}"))
+            logger.info("Added column page_url_hash on matches")
+        
+        # Backfill in id order so each batch is a cheap range scan
+        backfill = update(matches).where(matches.c.id == bindparam('match_id')).values(page_url_hash=bindparam('url_hash'))
+        last_id, backfilled = 0, 0
+        while True:
+            rows = conn.execute(
+                select(matches.c.id, matches.c.page_url)
+                .where(matches.c.page_url_hash.is_(None), matches.c.id > last_id)
+                .order_by(matches.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            conn.execute(backfill, [{'match_id': row.id, 'url_hash': hash_page_url(row.page_url)} for row in rows])
+            last_id = rows[-1].id
+            backfilled += len(rows)
+        if backfilled:
+            logger.info(f"Backfilled page_url_hash for {backfilled} matches")
+        
+        if 'uq_forum_keyword_url_hash' not in uniques:
+            conn.execute(text("CREATE UNIQUE INDEX uq_forum_keyword_url_hash ON matches (forum_id, keyword_id, page_url_hash)"))
+            logger.info("Created unique index uq_forum_keyword_url_hash on matches")
+        
+        if 'uq_forum_keyword_url' in uniques and dialect == 'mysql':
+            conn.execute(text("ALTER TABLE matches DROP INDEX uq_forum_keyword_url"))
+            conn.execute(text("ALTER TABLE matches MODIFY page_url TEXT NOT NULL, MODIFY page_url_hash BINARY(16) NOT NULL"))
+            logger.info("Dropped uq_forum_keyword_url and widened page_url to TEXT")
+        elif 'uq_forum_keyword_url' in uniques and dialect == 'postgresql':
+            conn.execute(text("ALTER TABLE matches DROP CONSTRAINT uq_forum_keyword_url"))
+            conn.execute(text("ALTER TABLE matches ALTER COLUMN page_url TYPE TEXT, ALTER COLUMN page_url_hash SET NOT NULL"))
+            logger.info("Dropped uq_forum_keyword_url and widened page_url to TEXT")
+
+
+def upgrade_schema(engine: Engine):
+    """Bring existing tables in line with the models."""
+    add_page_url_hash(engine)
+    create_missing_indexes(engine)
+    drop_obsolete_indexes(engine)
@@ -4,16 +4,48 @@ Telegram notification module for sending match alerts.
 """
 
 import os
+import hashlib
+import queue
+import random
+import threading
+import time
 import logging
-from typing import List, Optional
+from collections import OrderedDict
+from html import escape
+from typing import List, Optional, Tuple
 import httpx
 
+from crawler.rate_limiter import TokenBucket
+
 logger = logging.getLogger(__name__)
 
+# Delivery retries for 429 / 5xx / network errors
+MAX_SEND_ATTEMPTS = 8
+BACKOFF_BASE = 1.0  # Seconds before the first retry of a network/server error
+BACKOFF_CAP = 60.0  # Longest single backoff
+
+# Stay under Telegram's ~30 messages/second bot limit instead of reacting to 429s
+SEND_RATE = 25.0  # Messages per second
+SEND_BURST = 30.0
+
+# Forum reports arriving within this window are merged into one message
+COALESCE_WINDOW_SECONDS = float(os.getenv('TELEGRAM_COALESCE_SECONDS', '2'))
+
+# Telegram rejects messages over 4096 characters; leave headroom for entities
+MAX_MESSAGE_LENGTH = 4000
+
+# Identical messages queued within this window are sent once
+DEDUP_WINDOW_SECONDS = 300
+DEDUP_MAX_ENTRIES = 1024
+
 
 class TelegramNotifier:
     """Send notifications to Telegram."""
     
+    # Match detail entry of notify_forum_results (values must be HTML-escaped)
+    MATCH_DETAIL_TEMPLATE = "<b>Keyword:</b> {keyword}\n   <a href=\"{url}\">View Thread</a>\n"
+    MATCH_SNIPPET_TEMPLATE = "   <i>{snippet}...</i>\n"
+    
     def __init__(self):
         """Initialize with credentials from environment."""
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -21,12 +53,42 @@ class TelegramNotifier:
         self.enabled = bool(self.bot_token and self.chat_id)
         self.notify_only_on_matches = os.getenv('NOTIFY_ONLY_ON_MATCHES', 'false').lower() == 'true'
         
-        if not self.enabled:
+        # One keep-alive client for all messages: avoids a TCP/TLS handshake per send
+        self._client = None
+        self._endpoint = '/sendMessage'
+        if self.enabled:
+            self._client = httpx.Client(
+                base_url=f"https://api.telegram.org/bot{self.bot_token}",
+                timeout=10,
+                limits=httpx.Limits(max_keepalive_connections=4)
+            )
+        else:
             logger.warning("Telegram notifications disabled - missing credentials")
+        
+        # Shared by every send (and retry) so bursts never exceed SEND_RATE
+        self._bucket = TokenBucket(rate=SEND_RATE, capacity=SEND_BURST)
+        
+        # Messages are sent by a background thread so crawl workers never wait on Telegram
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+        if self.enabled:
+            self._queue = queue.Queue(maxsize=1000)
+            self._stop = threading.Event()  # Set by close(): remaining messages are dropped
+            self._worker = threading.Thread(target=self._drain, name='telegram-notifier', daemon=True)
+            self._worker.start()
+        
+        # Rendered reports waiting to be coalesced, as lists of blocks (see _queue_report)
+        self._pending: List[List[str]] = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        
+        # Digest -> monotonic time of recently queued messages, oldest first
+        self._recent_sends: 'OrderedDict[bytes, float]' = OrderedDict()
+        self._recent_lock = threading.Lock()
     
     def send_message(self, text: str, parse_mode: str = 'HTML', disable_preview: bool = True) -> bool:
         """
-        Send a message to Telegram.
+        Queue a message for Telegram and return immediately.
         
         Args:
             text: Message text (supports HTML formatting)
@@ -34,14 +96,87 @@ class TelegramNotifier:
             disable_preview: Disable link previews
             
         Returns:
-            True if sent successfully
+            True if queued or an identical message was queued recently
+            (delivery happens in the background; see flush())
         """
         if not self.enabled:
             logger.debug("Telegram not configured, skipping notification")
             return False
         
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        if not text or not text.strip():
+            logger.debug("Empty Telegram message, skipping")
+            return False
+        
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        if self._is_recent_duplicate(digest):
+            logger.debug("Identical Telegram message sent recently, skipping")
+            return True
+        
+        try:
+            self._queue.put_nowait((text, parse_mode, disable_preview))
+        except queue.Full:
+            logger.error("Telegram queue full, dropping notification")
+            return False
+        
+        # Recorded only once queued, so a dropped message can be sent again
+        self._remember_send(digest)
+        return True
+    
+    def _is_recent_duplicate(self, digest: bytes) -> bool:
+        """
+        Check a message against recently queued ones.
+        
+        Args:
+            digest: blake2b digest of the message text
+            
+        Returns:
+            True if the same text was queued within DEDUP_WINDOW_SECONDS
+        """
+        cutoff = time.monotonic() - DEDUP_WINDOW_SECONDS
+        
+        with self._recent_lock:
+            recent = self._recent_sends
+            while recent and next(iter(recent.values())) <= cutoff:
+                recent.popitem(last=False)
+            return digest in recent
+    
+    def _remember_send(self, digest: bytes):
+        """
+        Record a queued message for _is_recent_duplicate.
+        
+        Args:
+            digest: blake2b digest of the message text
+        """
+        with self._recent_lock:
+            recent = self._recent_sends
+            recent[digest] = time.monotonic()
+            recent.move_to_end(digest)  # Keep oldest first if two threads queued the same text
+            if len(recent) > DEDUP_MAX_ENTRIES:
+                recent.popitem(last=False)
+    
+    def _drain(self):
+        """Background worker: send queued messages in order until the None sentinel or close()."""
+        while True:
+            item: Optional[Tuple[str, str, bool]] = self._queue.get()
+            try:
+                if item is None or self._stop.is_set():
+                    return
+                self._send_sync(*item)
+            finally:
+                self._queue.task_done()
+    
+    def _send_sync(self, text: str, parse_mode: str = 'HTML', disable_preview: bool = True) -> bool:
+        """
+        Send a message to Telegram, blocking until the API responds.
         
+        Args:
+            text: Message text (supports HTML formatting)
+            parse_mode: 'HTML' or 'Markdown'
+            disable_preview: Disable link previews
+            
+        Returns:
+            True if sent successfully
+        """
         payload = {
             'chat_id': self.chat_id,
             'text': text,
@@ -49,46 +184,192 @@ class TelegramNotifier:
             'disable_web_page_preview': disable_preview
         }
         
-        try:
-            response = httpx.post(url, json=payload, timeout=10)
-            response.raise_for_status()
-            logger.info("Telegram notification sent successfully")
-            return True
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            retries_left = attempt < MAX_SEND_ATTEMPTS
             
-        except Exception as e:
-            logger.error(f"Failed to send Telegram notification: {str(e)}")
-            return False
+            self._bucket.acquire()
+            try:
+                response = self._client.post(self._endpoint, json=payload)
+            except httpx.TransportError as e:
+                # Network error: exponential backoff with jitter
+                if not retries_left:
+                    logger.error(f"Failed to send Telegram notification: {str(e)}")
+                    return False
+                delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)) + random.uniform(0, 0.5)
+                logger.warning(f"Telegram request failed ({str(e)}), retrying in {delay:.1f}s (attempt {attempt}/{MAX_SEND_ATTEMPTS})")
+                if self._stop.wait(delay):
+                    return False  # Closing: the backoff is cut short
+                continue
+            except Exception as e:
+                logger.error(f"Failed to send Telegram notification: {str(e)}")
+                return False
+            
+            if response.status_code == 429 and retries_left:
+                # Too Many Requests: wait exactly as long as Telegram asks
+                retry_after = self._get_retry_after(response)
+                logger.warning(f"Telegram rate limited (429), retry_after={retry_after}s (attempt {attempt}/{MAX_SEND_ATTEMPTS})")
+                if self._stop.wait(retry_after + random.uniform(0, 0.5)):
+                    return False  # Closing: the backoff is cut short
+                continue
+            
+            if response.status_code >= 500 and retries_left:
+                delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)) + random.uniform(0, 0.5)
+                logger.warning(f"Telegram server error ({response.status_code}), retrying in {delay:.1f}s (attempt {attempt}/{MAX_SEND_ATTEMPTS})")
+                if self._stop.wait(delay):
+                    return False  # Closing: the backoff is cut short
+                continue
+            
+            try:
+                response.raise_for_status()
+                logger.info("Telegram notification sent successfully")
+                return True
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Failed to send Telegram notification: {str(e)}")
+                return False
+        
+        return False
+    
+    @staticmethod
+    def _get_retry_after(response: httpx.Response) -> float:
+        """
+        Read the wait time from a 429 response.
+        
+        Args:
+            response: Telegram API response
+            
+        Returns:
+            Seconds to wait (parameters.retry_after, else Retry-After header, else 1)
+        """
+        try:
+            body = response.json()
+            # Proxies may answer with JSON that is not a Telegram object (list, string, null)
+            parameters = body.get('parameters') if isinstance(body, dict) else None
+            retry_after = parameters.get('retry_after') if isinstance(parameters, dict) else None
+            if retry_after is not None:
+                return float(retry_after)
+        except (ValueError, TypeError):
+            pass
+        
+        try:
+            return float(response.headers.get('Retry-After', '1'))
+        except ValueError:
+            return 1.0
     
     def notify_matches(self, forum_name: str, matches: List[dict]) -> bool:
         """
         Send notification about new matches found.
         
+        Queued with _queue_report, so reports arriving within COALESCE_WINDOW_SECONDS
+        of each other are sent as one message.
+        
         Args:
             forum_name: Name of the forum
             matches: List of match dicts with keys: keyword, url, snippet
             
         Returns:
-            True if sent successfully
+            True if queued
         """
         if not matches:
             return False
         
-        # Build message
-        message = f"⚠️⚠️⚠️⚠️ <b>New Matches Found</b>\n\n"
-        message += f"<b>Forum:</b> {forum_name}\n"
-        message += f"<b>Matches:</b> {len(matches)}\n\n"
+        # Each block ends with a blank line, so chunks never split an entry
+        blocks = [
+            "⚠️⚠️⚠️⚠️ <b>New Matches Found</b>\n\n",
+            f"<b>Forum:</b> {escape(forum_name)}\n<b>Matches:</b> {len(matches)}\n\n",
+        ]
         
         # Add each match
         for i, match in enumerate(matches, 1):
-            keyword = match.get('keyword', 'unknown')
-            url = match.get('url', '')
-            snippet = match.get('snippet', '')[:100]  # Truncate
+            keyword = escape(match.get('keyword', 'unknown'))
+            url = escape(match.get('url', ''), quote=True)
+            snippet = escape(match.get('snippet', '')[:100])  # Truncate before escaping
+            
+            blocks.append(
+                f"{i}. <b>{keyword}</b>\n"
+                f"   <a href=\"{url}\">View Thread</a>\n"
+                f"   <i>{snippet}...</i>\n\n"
+            )
+        
+        return self._queue_report(blocks)
+    
+    def _queue_report(self, blocks: List[str]) -> bool:
+        """
+        Buffer a rendered report and (re)arm the coalescing timer.
+        
+        Args:
+            blocks: Message fragments of the report that must not be split
+            
+        Returns:
+            True if queued
+        """
+        if not self.enabled:
+            logger.debug("Telegram not configured, skipping notification")
+            return False
+        
+        with self._pending_lock:
+            self._pending.append(blocks)
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(COALESCE_WINDOW_SECONDS, self.flush_reports)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+        
+        return True
+    
+    def flush_reports(self) -> bool:
+        """
+        Send all buffered reports as one message (split into chunks if too long).
+        
+        Returns:
+            True if every chunk was queued
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        
+        if not pending:
+            return False
+        
+        blocks = []
+        for report in pending:
+            if blocks:
+                blocks.append("\n")  # Blank line between reports
+            blocks.extend(report)
+        
+        sent = True
+        for chunk in self._chunk_blocks(blocks):
+            sent = self.send_message(chunk) and sent
+        return sent
+    
+    @staticmethod
+    def _chunk_blocks(blocks: List[str], limit: int = MAX_MESSAGE_LENGTH) -> List[str]:
+        """
+        Pack message blocks into as few messages as possible under the length limit.
+        
+        Args:
+            blocks: Message fragments that must not be split
+            limit: Maximum characters per message
             
-            message += f"{i}. <b>{keyword}</b>\n"
-            message += f"   <a href=\"{url}\">View Thread</a>\n"
-            message += f"   <i>{snippet}...</i>\n\n"
+        Returns:
+            List of message texts
+        """
+        chunks = []
+        parts = []
+        size = 0
         
-        return self.send_message(message)
+        for block in blocks:
+            if parts and size + len(block) > limit:
+                chunks.append("".join(parts))
+                parts = []
+                size = 0
+            parts.append(block[:limit])  # A single oversized block is truncated
+            size += len(parts[-1])
+        
+        if parts:
+            chunks.append("".join(parts))
+        return chunks
     
     def notify_forum_results(self, forum_name: str, stats: dict, matches: List[dict] = None) -> bool:
         """
@@ -100,7 +381,8 @@ class TelegramNotifier:
             matches: Optional list of match dicts with keys: keyword, url, snippet
             
         Returns:
-            True if sent successfully
+            True if queued (reports of forums finishing within COALESCE_WINDOW_SECONDS
+            of each other are sent as one message; see _queue_report)
         """
         pages = stats.get('pages_crawled', 0)
         matches_count = stats.get('matches_found', 0)
@@ -113,33 +395,38 @@ class TelegramNotifier:
         
         # Build header
         if matches_count > 0:
-            message = f"⚠️⚠️⚠️⚠️ <b>Crawl Complete - {matches_count} Match{'es' if matches_count > 1 else ''} Found</b>\n\n"
+            parts = [f"⚠️⚠️⚠️⚠️ <b>Crawl Complete - {matches_count} Match{'es' if matches_count > 1 else ''} Found</b>\n\n"]
         else:
-            message = f"✅ <b>Crawl Complete - No Matches</b>\n\n"
+            parts = ["✅ <b>Crawl Complete - No Matches</b>\n\n"]
         
-        message += f"<b>Forum:</b> {forum_name}\n"
-        message += f"<b>Pages Crawled:</b> {pages}\n"
+        parts.append(f"<b>Forum:</b> {escape(forum_name)}\n")
+        parts.append(f"<b>Pages Crawled:</b> {pages}\n")
         
         if errors > 0:
-            message += f"⚠️ <b>Errors:</b> {errors}\n"
+            parts.append(f"⚠️ <b>Errors:</b> {errors}\n")
         
         # Add match details if any
+        entries = []
         if matches and matches_count > 0:
-            message += f"\n<b>─────────────────</b>\n"
-            message += f"<b>📋 Match Details:</b>\n\n"
+            parts.append("\n<b>─────────────────</b>\n")
+            parts.append("<b>📋 Match Details:</b>\n\n")
+            
+            detail_template = self.MATCH_DETAIL_TEMPLATE
+            snippet_template = self.MATCH_SNIPPET_TEMPLATE
             
             for match in matches:
                 keyword = match.get('keyword', 'unknown')
                 url = match.get('url', '')
-                snippet = match.get('snippet', '')[:150]  # Truncate to 150 chars
                 
-                message += f"<b>Keyword:</b> {keyword}\n"
-                message += f"   <a href=\"{url}\">View Thread</a>\n"
+                # Escape user content: a stray '<' or '&' makes Telegram reject the whole HTML message
+                entry = detail_template.format(keyword=escape(keyword), url=escape(url, quote=True))
+                snippet = match.get('snippet', '')[:150]  # Truncate to 150 chars
                 if snippet:
-                    message += f"   <i>{snippet}...</i>\n"
-                message += f"\n"
+                    entry += snippet_template.format(snippet=escape(snippet))
+                entries.append(entry + "\n")
         
-        return self.send_message(message)
+        # The header and each match entry are blocks, so long reports are split between entries
+        return self._queue_report(["".join(parts)] + entries)
     
     def notify_crawl_summary(self, forum_name: str, stats: dict) -> bool:
         """
@@ -164,7 +451,7 @@ class TelegramNotifier:
             return False
         
         message = "✅ Test notification from Forum Crawler"
-        success = self.send_message(message)
+        success = self._send_sync(message)  # Synchronous: the result is reported below
         
         if success:
             print("✅ Telegram notification sent successfully!")
@@ -172,3 +459,62 @@ class TelegramNotifier:
             print("❌ Failed to send Telegram notification")
         
         return success
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued message has been sent (or has failed).
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            
+        Returns:
+            True if the queue was drained in time
+        """
+        if self._queue is None:
+            return True
+        
+        # Don't leave reports waiting for the coalescing timer
+        self.flush_reports()
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def close(self, timeout: float = 30):
+        """
+        Deliver pending messages, stop the background worker and close the HTTP client.
+        
+        Args:
+            timeout: Maximum seconds to wait for pending messages
+        """
+        if self._worker is not None:
+            if not self.flush(timeout):
+                logger.warning(f"Telegram queue not drained after {timeout}s, dropping pending notifications")
+            # The worker stops at its next message; put_nowait so a full queue cannot block shutdown
+            self._stop.set()
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._worker.join(timeout)
+            worker_alive = self._worker.is_alive()
+            self._worker = None
+            if worker_alive:
+                # Still inside a request: closing the client under it would fail that send
+                logger.warning(f"Telegram worker still sending after {timeout}s, leaving its HTTP client open")
+                return
+        
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from .base_parser import BaseParser
 from .casino_guru_parser import CasinoGuruParser
 from .bitcointalk_parser import BitcoinTalkParser
@@ -9,4 +11,48 @@ from .ownedcore_parser import OwnedCoreParser
 from .moneysavingexpert_parser import MoneySavingExpertParser
 from .lcb_parser import LCBParser
 
-__all__ = ['BaseParser', 'CasinoGuruParser', 'BitcoinTalkParser', 'RedditParser', 'AskGamblersParser', 'BigWinBoardParser', 'XenForoParser', 'OwnedCoreParser', 'MoneySavingExpertParser', 'LCBParser']
+# Parser name -> class
+_REGISTRY = {
+    'casino_guru': CasinoGuruParser,
+    'bitcointalk': BitcoinTalkParser,
+    'reddit': RedditParser,
+    'askgamblers': AskGamblersParser,
+    'bigwinboard': BigWinBoardParser,
+    'xenforo': XenForoParser,
+    'ownedcore': OwnedCoreParser,
+    'moneysavingexpert': MoneySavingExpertParser,
+    'lcb': LCBParser,
+}
+
+# Parsers keeping per-crawl state (RedditParser's pagination token) are never shared
+_STATEFUL = {'reddit'}
+
+
+@lru_cache(maxsize=None)
+def _shared_parser(name: str) -> BaseParser:
+    """Create the process-wide instance of a stateless parser."""
+    return _REGISTRY[name]()
+
+
+def get_parser(name: str) -> BaseParser:
+    """
+    Get a parser by name.
+    
+    Stateless parsers are created once and shared by all forums and threads;
+    stateful ones get a new instance per call.
+    
+    Args:
+        name: Parser name (e.g., 'askgamblers', 'reddit')
+        
+    Returns:
+        Parser instance
+        
+    Raises:
+        KeyError: If no parser is registered under the name
+    """
+    if name in _STATEFUL:
+        return _REGISTRY[name]()
+    return _shared_parser(name)
+
+
+__all__ = ['BaseParser', 'CasinoGuruParser', 'BitcoinTalkParser', 'RedditParser', 'AskGamblersParser', 'BigWinBoardParser', 'XenForoParser', 'OwnedCoreParser', 'MoneySavingExpertParser', 'LCBParser', 'get_parser']
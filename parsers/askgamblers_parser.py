@@ -3,16 +3,27 @@ Parser for AskGamblers forums (Invision Community/IPS).
 """
 
 import logging
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+import re
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, SoupStrainer
 from .base_parser import BaseParser
 
 logger = logging.getLogger(__name__)
 
+# Trailing /page/N/ of a topic URL (e.g., /topic/123/page/23/ -> /topic/123/)
+_PAGE_SUFFIX_RE = re.compile(r'/page/\d+/?$')
+
+# Comment permalinks (?do=findComment / &do=findComment) point into existing topics
+_FIND_COMMENT_RE = re.compile(r'[?&]do=findComment')
+
 
 class AskGamblersParser(BaseParser):
     """Parser for AskGamblers Invision Community forums."""
     
+    # extract_thread_urls only reads links, so listing pages are parsed down to <a href> tags
+    THREAD_URL_STRAINER = SoupStrainer('a', href=True)
+    
     def get_paginated_url(self, base_url: str, page_num: int) -> str:
         """
         Generate paginated URL for IPS forums.
@@ -45,38 +56,33 @@ class AskGamblersParser(BaseParser):
         thread_urls = []
         seen = set()
         
+        parsed = urlparse(base_url)
+        base_domain = f"{parsed.scheme}://{parsed.netloc}"
+        base_prefix = base_url.rstrip('/') + '/'
+        
         try:
-            from urllib.parse import urlparse
-            parsed = urlparse(base_url)
-            base_domain = f"{parsed.scheme}://{parsed.netloc}"
-            
-            # Find all links with /topic/ in href
-            for link in soup.find_all('a', href=True):
-                href = link['href']
+            # Find all links with /topic/ in href (tag-name-only find_all is BeautifulSoup's fast path)
+            for link in soup.find_all('a'):
+                href = link.get('href')
                 
-                # Skip non-topic links
-                if '/topic/' not in href:
-                    continue
-                
-                # Skip comment links (they have ?do=findComment)
-                if '?do=findComment' in href or '&do=findComment' in href:
+                # Skip non-topic links and comment links (they have ?do=findComment)
+                if not href or '/topic/' not in href or _FIND_COMMENT_RE.search(href):
                     continue
                 
                 # Convert relative URL to absolute
                 if href.startswith('/'):
                     full_url = f"{base_domain}{href}"
                 elif not href.startswith('http'):
-                    full_url = base_url.rstrip('/') + '/' + href
+                    full_url = base_prefix + href
                 else:
                     full_url = href
                 
                 # Remove query parameters and fragments for deduplication
-                clean_url = full_url.split('?')[0].split('#')[0]
+                clean_url = full_url.partition('?')[0].partition('#')[0]
                 
                 # Remove /page/N/ suffix to get base thread URL (avoid scraping random pages)
                 # Example: /topic/123/page/23/ -> /topic/123/
-                import re
-                clean_url = re.sub(r'/page/\d+/?$', '', clean_url)
+                clean_url = _PAGE_SUFFIX_RE.sub('', clean_url)
                 
                 if clean_url not in seen:
                     seen.add(clean_url)
@@ -109,16 +115,12 @@ class AskGamblersParser(BaseParser):
             else:
                 title = title_elem.get_text(strip=True)
             
-            # Extract first post content
-            first_post = soup.find('article', class_='cPost')
-            if not first_post:
+            # First post content, extracted the same way as extract_all_posts (lazily: only the first post)
+            first_post = next(self.iter_posts(soup), None)
+            if not first_post or first_post['post_number'] != 1:
                 return None
             
-            content_div = first_post.find('div', attrs={'data-role': 'commentContent'})
-            if not content_div:
-                return None
-            
-            content = content_div.get_text(separator=' ', strip=True)
+            content = first_post['content']
             
             return {
                 'title': title,
@@ -139,11 +141,23 @@ class AskGamblersParser(BaseParser):
         Returns:
             List of dicts with post info (content, author, post_number)
         """
-        posts = []
+        posts = list(self.iter_posts(soup))
+        logger.debug(f"Extracted {len(posts)} posts from thread")
+        return posts
+    
+    def iter_posts(self, soup: BeautifulSoup) -> Iterator[Dict[str, str]]:
+        """
+        Yield posts from a thread page one at a time.
         
+        Args:
+            soup: BeautifulSoup object of thread page
+            
+        Yields:
+            Dicts with post info (content, author, post_number)
+        """
         try:
             # IPS posts are in article.cPost elements
-            post_articles = soup.find_all('article', class_='cPost')
+            post_articles = self.find_all_with_class(soup, 'article', 'cPost')
             
             for idx, article in enumerate(post_articles, 1):
                 # Extract post content from data-role="commentContent"
@@ -157,15 +171,11 @@ class AskGamblersParser(BaseParser):
                 author_elem = article.find('a', class_='ipsType_break')
                 author = author_elem.get_text(strip=True) if author_elem else 'Unknown'
                 
-                posts.append({
+                yield {
                     'content': content,
                     'author': author,
                     'post_number': idx
-                })
-            
-            logger.debug(f"Extracted {len(posts)} posts from thread")
+                }
             
         except Exception as e:
             logger.error(f"Error extracting posts: {str(e)}")
-        
-        return posts
@@ -1,11 +1,47 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlparse
+
+import soupsieve as sv
+from bs4 import BeautifulSoup, Tag
+
+# lxml builds soups several times faster than the stdlib parser - fall back if not installed
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+@lru_cache(maxsize=128)
+def _compile_priority(selectors: Tuple[str, ...]) -> Tuple[sv.SoupSieve, Optional[sv.SoupSieve], Tuple[Tuple[str, sv.SoupSieve], ...]]:
+    """Compile a selector priority list once: (first, union of the rest, (selector, compiled) of the rest)."""
+    fallbacks = selectors[1:]
+    union = sv.compile(', '.join(fallbacks)) if fallbacks else None
+    return sv.compile(selectors[0]), union, tuple((s, sv.compile(s)) for s in fallbacks)
 
 
 class BaseParser(ABC):
     """Abstract base class for forum-specific parsers."""
     
+    # BeautifulSoup tree builder crawlers should use for this parser's pages
+    PREFERRED_BS_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+    
+    @classmethod
+    def make_soup(cls, html: str) -> BeautifulSoup:
+        """
+        Parse HTML with the preferred tree builder (for scripts that fetch pages themselves).
+        
+        Args:
+            html: Page HTML
+            
+        Returns:
+            BeautifulSoup object
+        """
+        return BeautifulSoup(html, cls.PREFERRED_BS_PARSER)
+    
     @abstractmethod
     def get_paginated_url(self, base_url: str, page_num: int) -> str:
         """
@@ -67,3 +103,256 @@ class BaseParser(ABC):
                 'post_number': 1
             }]
         return []
+    
+    def iter_posts(self, soup: BeautifulSoup) -> Iterator[Dict[str, str]]:
+        """
+        Yield the posts of a thread one at a time.
+        
+        Lets callers stop early (e.g., once every keyword has matched) without
+        extracting the remaining posts. Default implementation wraps extract_all_posts;
+        parsers override it to extract lazily.
+        
+        Args:
+            soup: BeautifulSoup object of the thread page
+            
+        Yields:
+            Dicts with 'content' and optional 'author', 'post_number' keys
+        """
+        yield from self.extract_all_posts(soup)
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def get_base_domain(url: str) -> str:
+        """
+        Get scheme://host of a URL (cached: every page of a board shares its base URL).
+        
+        Args:
+            url: Any absolute URL
+            
+        Returns:
+            Scheme and host, e.g. 'https://bitcointalk.org'
+        """
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+    
+    @staticmethod
+    def absolute_url(href: str, base_domain: str, base_url: str) -> str:
+        """
+        Resolve a link href against the page it was found on.
+        
+        Root-relative hrefs (the common case on listing pages) are prefixed with the
+        domain directly; only protocol- and page-relative hrefs go through urljoin.
+        
+        Args:
+            href: Link href
+            base_domain: Scheme and host of the page (see get_base_domain)
+            base_url: URL of the page
+            
+        Returns:
+            Absolute URL
+        """
+        if href.startswith('/') and not href.startswith('//'):
+            return base_domain + href
+        if href.startswith('http'):
+            return href
+        return urljoin(base_url, href)
+    
+    @staticmethod
+    def find_all_with_class(root: Tag, name: str, css_class: str) -> List[Tag]:
+        """
+        Find all tags with a given name and CSS class, in document order.
+        
+        Equivalent to root.find_all(name, class_=css_class) or root.select(f"{name}.{css_class}"),
+        but much cheaper on large pages: find_all with only a tag name takes
+        BeautifulSoup's fast path, and the class is checked on the few candidates.
+        
+        Args:
+            root: BeautifulSoup object or tag to search under
+            name: Tag name (e.g., 'article')
+            css_class: Class the tag must have (e.g., 'cPost')
+            
+        Returns:
+            List of matching tags
+        """
+        return [tag for tag in root.find_all(name) if css_class in tag.get_attribute_list('class')]
+    
+    @staticmethod
+    def select_by_priority(root: Tag, selectors: Sequence[str]) -> Tuple[List[Tag], Optional[str]]:
+        """
+        Select with the first of several CSS selectors that matches anything.
+        
+        Equivalent to calling root.select(selector) for each selector in turn until
+        one returns results, but walks the tree at most twice: once with the preferred
+        selector (which usually matches), then once with the union of the rest, whose
+        candidates are sorted out by priority.
+        
+        Args:
+            root: BeautifulSoup object or tag to search under
+            selectors: CSS selectors, most preferred first
+            
+        Returns:
+            Tuple of (matching tags in document order, selector that matched),
+            or ([], None) if no selector matches
+        """
+        if not selectors:
+            return [], None
+        
+        first, union, fallbacks = _compile_priority(tuple(selectors))
+        matched = first.select(root)
+        if matched:
+            return matched, selectors[0]
+        
+        candidates = union.select(root) if union is not None else []
+        if candidates:
+            for selector, compiled in fallbacks:
+                matched = [tag for tag in candidates if compiled.match(tag)]
+                if matched:
+                    return matched, selector
+        return [], None
+    
+    @staticmethod
+    def select_one_by_priority(root: Tag, selectors: Sequence[sv.SoupSieve]) -> Optional[Tag]:
+        """
+        Return the first element matched by the first selector that matches anything.
+        
+        Args:
+            root: BeautifulSoup object or tag to search under
+            selectors: Precompiled selectors (soupsieve.compile), most preferred first
+            
+        Returns:
+            Matching tag or None
+        """
+        for selector in selectors:
+            elem = selector.select_one(root)
+            if elem is not None:
+                return elem
+        return None
+    
+    @staticmethod
+    def select_one_by_priority_each(root: Tag, containers: Sequence[Tag], selectors: Sequence[sv.SoupSieve]) -> List[Optional[Tag]]:
+        """
+        Run select_one_by_priority(container, selectors) for every container in one walk.
+        
+        The union of the selectors is matched once over root and each match is credited
+        to the containers among its ancestors, instead of walking every container once
+        per selector (up to len(containers) * len(selectors) walks when nothing matches).
+        
+        Args:
+            root: BeautifulSoup object or tag containing all containers
+            containers: Tags to search under (e.g., post containers)
+            selectors: Precompiled selectors (soupsieve.compile), most preferred first
+            
+        Returns:
+            Matching tag or None for each container, in the same order
+        """
+        found: List[Optional[Tag]] = [None] * len(containers)
+        if not containers or not selectors:
+            return found
+        
+        # Containers are alive for the whole call, so their ids cannot be reused
+        index = {id(container): i for i, container in enumerate(containers)}
+        ranks = [len(selectors)] * len(containers)
+        union = sv.compile(', '.join(selector.pattern for selector in selectors))
+        
+        # Matches come in document order, so the first match of the best selector wins
+        for elem in union.select(root):
+            rank = next(r for r, selector in enumerate(selectors) if selector.match(elem))
+            for parent in elem.parents:
+                i = index.get(id(parent))
+                if i is not None and rank < ranks[i]:
+                    found[i] = elem
+                    ranks[i] = rank
+        return found
+    
+    @staticmethod
+    def find_all_with_class_containing(root: Tag, name: str, fragment: str) -> List[Tag]:
+        """
+        Find all tags with a given name having a CSS class that contains a substring.
+        
+        Fast-path equivalent of root.find_all(name, class_=lambda x: x and fragment in x)
+        (e.g., 'windowbg' matches both windowbg and windowbg2).
+        
+        Args:
+            root: BeautifulSoup object or tag to search under
+            name: Tag name (e.g., 'div')
+            fragment: Substring a class must contain
+            
+        Returns:
+            List of matching tags in document order
+        """
+        return [
+            tag for tag in root.find_all(name)
+            if any(fragment in css_class for css_class in tag.get_attribute_list('class', []))
+        ]
+    
+    @staticmethod
+    def find_by_priority(root: Tag, candidates: Sequence[Tuple[str, Optional[str]]]) -> Optional[Tag]:
+        """
+        Find the first tag matching the most preferred of several (name, class) pairs.
+        
+        Same result as root.find(name1, class_=class1) or root.find(name2, class_=class2) or ...,
+        but in a single walk of the tree instead of one (often full) walk per pair.
+        
+        Args:
+            root: BeautifulSoup object or tag to search under
+            candidates: (tag name, CSS class or None for any) pairs, most preferred first
+            
+        Returns:
+            Matching tag or None
+        """
+        return BaseParser.find_each_by_priority(root, (candidates,))[0]
+    
+    @staticmethod
+    def find_each_by_priority(root: Tag, groups: Sequence[Sequence[Tuple[str, Optional[str]]]]) -> List[Optional[Tag]]:
+        """
+        Run find_by_priority for several candidate lists in one shared walk of the tree.
+        
+        Used to locate e.g. the content and the author of a post together instead of
+        walking the post once per lookup. The walk stops once every list has matched
+        its most preferred pair.
+        
+        Args:
+            root: BeautifulSoup object or tag to search under
+            groups: Candidate lists as for find_by_priority
+            
+        Returns:
+            Matching tag or None for each list, in the same order
+        """
+        names = {name for candidates in groups for name, _ in candidates}
+        found: List[Optional[Tag]] = [None] * len(groups)
+        ranks = [len(candidates) for candidates in groups]
+        pending = len(groups)  # Lists whose most preferred pair has not matched yet
+        for node in root.descendants:
+            if node.name not in names:
+                continue
+            classes = node.get_attribute_list('class')
+            for i, candidates in enumerate(groups):
+                for rank in range(ranks[i]):
+                    name, css_class = candidates[rank]
+                    if node.name == name and (css_class is None or css_class in classes):
+                        found[i] = node
+                        ranks[i] = rank
+                        if rank == 0:
+                            pending -= 1
+                        break
+            if not pending:
+                break
+        return found
+    
+    @staticmethod
+    def first_paragraphs_text(root: Tag, count: int = 5) -> str:
+        """
+        Join the stripped text of the first paragraphs under a tag.
+        
+        Same result as ' '.join(p.get_text(strip=True) for p in root.find_all('p', limit=count)),
+        but streams root.descendants instead of building a ResultSet.
+        
+        Args:
+            root: BeautifulSoup object or tag to search under
+            count: Number of <p> tags to read
+            
+        Returns:
+            Paragraph texts separated by spaces
+        """
+        paragraphs = islice((node for node in root.descendants if node.name == 'p'), count)
+        return ' '.join(p.get_text(strip=True) for p in paragraphs)
@@ -1,17 +1,56 @@
-from typing import List, Dict, Optional
-from urllib.parse import urljoin, urlparse
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urljoin, urlsplit
 import logging
 
-from bs4 import BeautifulSoup
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 
 from .base_parser import BaseParser
 
 logger = logging.getLogger(__name__)
 
+# Link prefixes that never point at a topic / that need no resolving
+_SKIP_HREF_PREFIXES = ('#', 'javascript:')
+_ABSOLUTE_HREF_PREFIXES = ('http://', 'https://')
+
+# Classes of bbPress topic/reply wrappers
+_POST_CONTAINER_CLASSES = frozenset(('bbp-topic', 'bbp-reply'))
+
+# Post body wrappers, most specific first
+_POST_CONTENT_CLASSES = ('bbp-topic-content', 'bbp-reply-content', 'entry-content')
+
+# Post author lookups (tried in this order), compiled once
+_PARTICIPANT_LINK_SEL = sv.compile('a[href*="/participant/"]')
+_AUTHOR_NAME_SEL = sv.compile('.bbp-author-name')
+_AUTHOR_LINK_SEL = sv.compile('.bbp-author a')
+
+
+def _first_with_class(container: Tag, classes) -> Optional[Tag]:
+    """
+    Find the first descendant having the highest-priority class of several.
+
+    Equivalent to chaining container.select_one('.' + cls) for each class, but
+    walks the container once instead of once per class.
+    """
+    found = {}
+    for tag in container.find_all(True):
+        for css_class in tag.get_attribute_list('class'):
+            if css_class in classes and css_class not in found:
+                found[css_class] = tag
+                if css_class == classes[0]:
+                    return tag
+    for css_class in classes:
+        if css_class in found:
+            return found[css_class]
+    return None
+
 
 class BigWinBoardParser(BaseParser):
     """Parser for bigwinboard.com forum (bbPress-style)."""
 
+    # extract_thread_urls only reads links, so listing pages are parsed down to <a href> tags
+    THREAD_URL_STRAINER = SoupStrainer('a', href=True)
+
     def get_paginated_url(self, base_url: str, page_num: int) -> str:
         """Generate paginated URL.
 
@@ -28,34 +67,27 @@ class BigWinBoardParser(BaseParser):
         """Extract topic URLs from a forum category page."""
         thread_urls: List[str] = []
 
-        parsed = urlparse(base_url)
-        base_domain = f"{parsed.scheme}://{parsed.netloc}"
-
         # The category pages list topics as regular links.
         # Heuristics:
         # - must contain "/forum/" and the category slug
         # - must not be user profile links (/participant/)
         # - must not be pagination links (/paged/)
         # - must not be the category page itself
-        base_path = urlparse(base_url).path.rstrip('/')
+        base_path = urlsplit(base_url).path.rstrip('/')
+        base_prefix = base_path + '/'
 
         seen = set()
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            if href.startswith('#') or href.startswith('javascript:'):
+        for a in soup.find_all('a'):
+            href = a.get('href')
+            if not href or href.startswith(_SKIP_HREF_PREFIXES):
                 continue
 
-            if href.startswith('/'):
-                url = urljoin(base_domain, href)
-            elif href.startswith('http'):
-                url = href
-            else:
-                url = urljoin(base_url, href)
+            # Absolute links are used as-is; urljoin resolves root-relative and relative ones
+            url = href if href.startswith(_ABSOLUTE_HREF_PREFIXES) else urljoin(base_url, href)
 
-            if '#' in url:
-                url = url.split('#')[0]
+            url = url.partition('#')[0]
 
-            path = urlparse(url).path
+            path = urlsplit(url).path
 
             if '/participant/' in path:
                 continue
@@ -65,7 +97,7 @@ class BigWinBoardParser(BaseParser):
                 continue
 
             # Limit to the same category subtree
-            if not path.startswith(base_path + '/'):
+            if not path.startswith(base_prefix):
                 continue
 
             # Skip category root itself
@@ -88,12 +120,18 @@ class BigWinBoardParser(BaseParser):
         logger.debug(f"Extracted {len(thread_urls)} thread URLs from {base_url}")
         return thread_urls
 
-    def extract_thread_content(self, soup: BeautifulSoup) -> Optional[Dict[str, str]]:
-        """Extract thread title and first post content."""
-        title = ''
-        title_elem = soup.select_one('h1') or soup.select_one('title')
-        if title_elem:
-            title = title_elem.get_text(strip=True)
+    def _extract_title(self, soup: BeautifulSoup) -> str:
+        """Extract the topic title (empty string if the page has none)."""
+        title_elem = soup.find('h1') or soup.find('title')
+        return title_elem.get_text(strip=True) if title_elem else ''
+
+    def extract_thread_content(self, soup: BeautifulSoup, title: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """Extract thread title and first post content.
+
+        A title already extracted by the caller can be passed in to skip the lookup.
+        """
+        if title is None:
+            title = self._extract_title(soup)
 
         # Try common bbPress / WP selectors
         content_elem = (
@@ -116,28 +154,34 @@ class BigWinBoardParser(BaseParser):
 
     def extract_all_posts(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
         """Extract all posts from a topic page."""
-        posts: List[Dict[str, str]] = []
-
-        title = ''
-        title_elem = soup.select_one('h1') or soup.select_one('title')
-        if title_elem:
-            title = title_elem.get_text(strip=True)
-
-        # bbPress commonly uses these wrappers
-        post_containers = []
-        for selector in [
-            'li.bbp-topic',
-            'li.bbp-reply',
-            'div.bbp-topic',
-            'div.bbp-reply',
-            'article',
-        ]:
-            post_containers = soup.select(selector)
-            if post_containers:
-                break
-
-        # If we found lots of generic articles, try to reduce noise
-        if post_containers and selector == 'article':
+        posts = list(self.iter_posts(soup))
+        logger.debug(f"Extracted {len(posts)} posts from thread")
+        return posts
+
+    def iter_posts(self, soup: BeautifulSoup) -> Iterator[Dict[str, str]]:
+        """Yield posts from a topic page one at a time."""
+        found = 0
+
+        title = self._extract_title(soup)
+
+        # bbPress wraps the opening post and every reply in li/div.bbp-topic or .bbp-reply.
+        # Collect both kinds in one pass (document order) so replies are not dropped
+        # when the topic wrapper is found first; generic articles are the fallback.
+        post_containers = [
+            tag for tag in soup.find_all(('li', 'div'))
+            if not _POST_CONTAINER_CLASSES.isdisjoint(tag.get_attribute_list('class'))
+        ]
+        if post_containers:
+            # A wrapper nested in another (e.g., div.bbp-reply inside li.bbp-reply) is the same post
+            selected = set(map(id, post_containers))
+            post_containers = [
+                tag for tag in post_containers
+                if not any(id(parent) in selected for parent in tag.parents)
+            ]
+        else:
+            post_containers = soup.find_all('article')
+
+            # If we found lots of generic articles, try to reduce noise
             filtered = []
             for art in post_containers:
                 if art.select_one('.bbp-reply-content, .bbp-topic-content, .entry-content'):
@@ -147,12 +191,7 @@ class BigWinBoardParser(BaseParser):
 
         for idx, container in enumerate(post_containers, start=1):
             try:
-                content_elem = (
-                    container.select_one('.bbp-topic-content')
-                    or container.select_one('.bbp-reply-content')
-                    or container.select_one('.entry-content')
-                    or container
-                )
+                content_elem = _first_with_class(container, _POST_CONTENT_CLASSES) or container
                 content_text = content_elem.get_text(separator=' ', strip=True)
 
                 if len(content_text) < 20:
@@ -160,9 +199,9 @@ class BigWinBoardParser(BaseParser):
 
                 author = 'Unknown'
                 author_elem = (
-                    container.select_one('a[href*="/participant/"]')
-                    or container.select_one('.bbp-author-name')
-                    or container.select_one('.bbp-author a')
+                    _PARTICIPANT_LINK_SEL.select_one(container)
+                    or _AUTHOR_NAME_SEL.select_one(container)
+                    or _AUTHOR_LINK_SEL.select_one(container)
                 )
                 if author_elem:
                     author = author_elem.get_text(strip=True)
@@ -170,22 +209,23 @@ class BigWinBoardParser(BaseParser):
                 if idx == 1 and title:
                     content_text = f"{title} {content_text}"
 
-                posts.append({
+                post = {
                     'content': content_text,
                     'author': author,
                     'post_number': idx
-                })
+                }
             except Exception as e:
                 logger.warning(f"Error extracting post {idx}: {str(e)}")
+                continue
+
+            found += 1
+            yield post
 
-        if not posts:
-            thread_data = self.extract_thread_content(soup)
+        if not found:
+            thread_data = self.extract_thread_content(soup, title=title)
             if thread_data:
-                posts = [{
+                yield {
                     'content': f"{thread_data['title']} {thread_data['content']}".strip(),
                     'author': 'Unknown',
                     'post_number': 1
-                }]
-
-        logger.debug(f"Extracted {len(posts)} posts from thread")
-        return posts
+                }
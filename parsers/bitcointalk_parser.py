@@ -1,16 +1,35 @@
 from typing import List, Dict, Optional
-from urllib.parse import urljoin, urlparse, parse_qs
-from bs4 import BeautifulSoup
+from urllib.parse import parse_qs
+from bs4 import BeautifulSoup, SoupStrainer
 import logging
+import re
+import soupsieve as sv
 
 from .base_parser import BaseParser
 
 logger = logging.getLogger(__name__)
 
+# Topic hrefs that are actions (reply, quote, ...), post anchors or sorted listings
+_SKIP_HREF_RE = re.compile(r'action=|#msg|sort=')
+
+# Site-wide headings that are not a thread title
+_GENERIC_TITLE_PREFIXES = ('Bitcoin Forum',)
+
+# Selectors are compiled once at import, most preferred first
+_TITLE_SELECTORS = [sv.compile(s) for s in ('h2', 'h3', '.subject a', 'title')]
+_POST_TITLE_SEL = sv.compile('h2, h3')
+_FIRST_POST_CONTENT_SELECTORS = [sv.compile(s) for s in ('.post', '.inner')]
+_POST_CONTENT_SELECTORS = [sv.compile(s) for s in ('.post', '.inner', '.postarea')]
+_AUTHOR_SELECTORS = [sv.compile(s) for s in ('.poster h4 a', '.poster a', 'a[title*="View profile"]')]
+
 
 class BitcoinTalkParser(BaseParser):
     """Parser for bitcointalk.org forum."""
     
+    # extract_thread_urls reads subject cells and topic links only, so board pages
+    # are parsed down to <td> and <a> subtrees (navigation, headers etc. are skipped)
+    THREAD_URL_STRAINER = SoupStrainer(['td', 'a'])
+    
     def get_paginated_url(self, base_url: str, page_num: int) -> str:
         """
         Generate paginated URL for BitcoinTalk.
@@ -39,62 +58,38 @@ class BitcoinTalkParser(BaseParser):
         
         BitcoinTalk threads are in <td> with class="subject windowbg" or "subject windowbg2"
         """
-        thread_urls = []
-        
         # Parse base URL to get domain
-        parsed = urlparse(base_url)
-        base_domain = f"{parsed.scheme}://{parsed.netloc}"
+        base_domain = self.get_base_domain(base_url)
         
         # Find all thread links
         # Threads are in table rows with class containing "windowbg"
         # Look for <span> with id starting with "msg_" which contains thread titles
-        thread_links = []
+        # Thread links contain "topic=" parameter; both strategies collect only those hrefs
+        # (class/href filters are plain string checks on a tag-name scan, the fastest bs4 path)
+        thread_hrefs = []
         
         # Strategy 1: Find all links in subject columns
-        subject_cells = soup.find_all('td', class_=lambda x: x and 'subject' in x)
+        subject_cells = self.find_all_with_class_containing(soup, 'td', 'subject')
         for cell in subject_cells:
-            links = cell.find_all('a', href=True)
-            for link in links:
-                href = link['href']
-                # Thread links contain "topic=" parameter
-                if 'topic=' in href:
-                    thread_links.append(link)
+            for link in cell.find_all('a'):
+                href = link.get('href')
+                if href and 'topic=' in href:
+                    thread_hrefs.append(href)
         
         # Strategy 2: Direct search for topic links
-        if not thread_links:
-            thread_links = soup.find_all('a', href=lambda x: x and 'topic=' in x)
+        if not thread_hrefs:
+            thread_hrefs = [href for href in (link.get('href') for link in soup.find_all('a')) if href and 'topic=' in href]
+        
+        # Skip action links (reply, quote, etc.), convert to absolute URLs and
+        # remove session IDs (;PHPSESSID=...) and fragments
+        urls = [
+            self.absolute_url(href, base_domain, base_url).partition(';')[0].partition('#')[0]
+            for href in thread_hrefs
+            if _SKIP_HREF_RE.search(href) is None
+        ]
         
-        # Process found links
-        seen = set()
-        for link in thread_links:
-            href = link['href']
-            
-            # Skip if not a topic link
-            if 'topic=' not in href:
-                continue
-            
-            # Skip action links (reply, quote, etc.)
-            if any(action in href for action in ['action=', '#msg', 'sort=']):
-                continue
-            
-            # Convert to absolute URL
-            if href.startswith('/'):
-                url = urljoin(base_domain, href)
-            elif href.startswith('http'):
-                url = href
-            else:
-                url = urljoin(base_url, href)
-            
-            # Clean URL - remove session IDs and fragments
-            if ';' in url:
-                url = url.split(';')[0]
-            if '#' in url:
-                url = url.split('#')[0]
-            
-            # Deduplicate
-            if url not in seen:
-                seen.add(url)
-                thread_urls.append(url)
+        # Deduplicate, keeping first-seen order
+        thread_urls = list(dict.fromkeys(urls))
         
         logger.debug(f"Extracted {len(thread_urls)} thread URLs from {base_url}")
         return thread_urls
@@ -110,19 +105,12 @@ class BitcoinTalkParser(BaseParser):
         
         # Extract title
         # Title is usually in <h2> or <h3> in the linktree/page title area
-        title_selectors = [
-            'h2',
-            'h3',
-            '.subject a',
-            'title'
-        ]
-        
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
+        for selector in _TITLE_SELECTORS:
+            title_elem = selector.select_one(soup)
             if title_elem:
                 title_text = title_elem.get_text(strip=True)
                 # Skip generic titles
-                if title_text and not title_text.startswith('Bitcoin Forum'):
+                if title_text and not title_text.startswith(_GENERIC_TITLE_PREFIXES):
                     result['title'] = title_text
                     break
         
@@ -135,26 +123,19 @@ class BitcoinTalkParser(BaseParser):
             '.postarea'
         ]
         
-        for selector in post_selectors:
-            posts = soup.select(selector)
-            if posts:
-                # Get first post
-                first_post = posts[0]
-                
-                # Try to find the message content within the post
-                content_elem = (
-                    first_post.select_one('.post') or
-                    first_post.select_one('.inner') or
-                    first_post
-                )
-                
-                result['content'] = content_elem.get_text(separator=' ', strip=True)
-                break
+        posts, _ = self.select_by_priority(soup, post_selectors)
+        if posts:
+            # Get first post
+            first_post = posts[0]
+            
+            # Try to find the message content within the post
+            content_elem = self.select_one_by_priority(first_post, _FIRST_POST_CONTENT_SELECTORS) or first_post
+            
+            result['content'] = content_elem.get_text(separator=' ', strip=True)
         
-        # Fallback: get all paragraphs
+        # Fallback: get the first paragraphs
         if not result['content']:
-            paragraphs = soup.find_all('p', limit=5)
-            result['content'] = ' '.join(p.get_text(strip=True) for p in paragraphs)
+            result['content'] = self.first_paragraphs_text(soup)
         
         if not result['title'] and not result['content']:
             logger.warning("Could not extract thread content")
@@ -171,28 +152,23 @@ class BitcoinTalkParser(BaseParser):
         
         # Extract title first
         title = ''
-        title_elem = soup.select_one('h2, h3')
+        title_elem = _POST_TITLE_SEL.select_one(soup)
         if title_elem:
             title = title_elem.get_text(strip=True)
         
         # Find all post divs
         # BitcoinTalk posts are typically in divs with class containing "windowbg"
-        post_elements = soup.find_all('div', class_=lambda x: x and 'windowbg' in x)
+        post_elements = self.find_all_with_class_containing(soup, 'div', 'windowbg')
         
         # Alternative: look for table structure
         if not post_elements:
             # Posts might be in table rows
-            post_elements = soup.find_all('tr', class_=lambda x: x and 'windowbg' in x)
+            post_elements = self.find_all_with_class_containing(soup, 'tr', 'windowbg')
         
         for idx, post_elem in enumerate(post_elements, start=1):
             try:
                 # Find post content
-                content_elem = (
-                    post_elem.select_one('.post') or
-                    post_elem.select_one('.inner') or
-                    post_elem.select_one('.postarea') or
-                    post_elem
-                )
+                content_elem = self.select_one_by_priority(post_elem, _POST_CONTENT_SELECTORS) or post_elem
                 
                 content_text = content_elem.get_text(separator=' ', strip=True)
                 
@@ -202,11 +178,7 @@ class BitcoinTalkParser(BaseParser):
                 
                 # Extract author
                 author = 'Unknown'
-                author_elem = (
-                    post_elem.select_one('.poster h4 a') or
-                    post_elem.select_one('.poster a') or
-                    post_elem.select_one('a[title*="View profile"]')
-                )
+                author_elem = self.select_one_by_priority(post_elem, _AUTHOR_SELECTORS)
                 if author_elem:
                     author = author_elem.get_text(strip=True)
                 
@@ -1,16 +1,75 @@
 from typing import List, Dict, Optional
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 import logging
+import soupsieve as sv
 
 from .base_parser import BaseParser
 
 logger = logging.getLogger(__name__)
 
+# Selectors are compiled once at import, most preferred first
+_TITLE_SELECTORS = [sv.compile(s) for s in ('h1', '.thread-title', '.topic-title', '.discussion-title', 'title')]
+_POST_CONTENT_SELECTORS = [sv.compile(s) for s in ('.post-content', '.message-content', '.post-body', '.content')]
+# Any of these marks the author; the first one in the post wins (one walk per post)
+_AUTHOR_SEL = sv.compile('.author, .username, .post-author, [class*="author"], [class*="username"]')
+
+# Page chrome ignored by the whole-body fallback of extract_thread_content
+_BOILERPLATE_TAGS = frozenset(('script', 'style', 'nav', 'header', 'footer', 'aside'))
+
+
+def _text_longer_than(tag: Tag, limit: int) -> bool:
+    """
+    Same as len(tag.get_text(strip=True)) > limit, but stops reading strings once
+    the limit is passed instead of joining the whole subtree's text.
+    """
+    length = 0
+    for text in tag.strings:
+        length += len(text.strip())
+        if length > limit:
+            return True
+    return False
+
+
+
+def _body_text(body: Tag, limit: int) -> str:
+    """
+    First limit characters of the body's text, skipping boilerplate elements.
+    
+    Same result as decomposing the boilerplate and slicing body.get_text(separator=' ',
+    strip=True), but leaves the soup intact and stops reading once limit is reached.
+    """
+    parts = []
+    length = 0
+    for string in body.strings:
+        text = string.strip()
+        if not text or any(parent.name in _BOILERPLATE_TAGS for parent in string.parents):
+            continue
+        parts.append(text)
+        length += len(text) + 1
+        if length > limit:
+            break
+    return ' '.join(parts)[:limit]
+
+
+def _has_title_class(css_class) -> bool:
+    """
+    Strainer test for a 'title' class among others (class="title foo").
+    
+    A plain class='title' strainer compares the raw attribute string seen at parse
+    time, so it would miss links find_all_with_class(soup, 'a', 'title') accepts.
+    """
+    if not css_class:
+        return False
+    classes = css_class.split() if isinstance(css_class, str) else css_class
+    return 'title' in classes
+
 
 class CasinoGuruParser(BaseParser):
     """Parser for casino.guru forum."""
     
+    # extract_thread_urls only reads <a class="title" href>, so category pages are parsed down to those
+    THREAD_URL_STRAINER = SoupStrainer('a', attrs={'class': _has_title_class, 'href': True})
+    
     def get_paginated_url(self, base_url: str, page_num: int) -> str:
         """
         Generate paginated URL for casino.guru.
@@ -30,73 +89,52 @@ class CasinoGuruParser(BaseParser):
         
         Casino.guru uses <a class="title"> for thread links.
         """
-        thread_urls = []
-        
         # Parse base URL to get domain
-        parsed = urlparse(base_url)
-        base_domain = f"{parsed.scheme}://{parsed.netloc}"
+        base_domain = self.get_base_domain(base_url)
         
         # Casino.guru specific: thread links have class="title"
-        thread_links = soup.find_all('a', class_='title', href=True)
+        thread_links = [link for link in self.find_all_with_class(soup, 'a', 'title') if link.has_attr('href')]
         
-        # Filter and convert to absolute URLs
-        seen = set()
-        for link in thread_links:
-            href = link['href']
-            
-            # Skip pagination links and other non-thread links
-            if href.startswith('#') or href.startswith('javascript:'):
-                continue
-            
-            # Skip if it's just a page number (like /forum/casinos/2)
-            # Thread URLs contain the thread name/slug
-            if href.count('/') <= 3:  # e.g., /forum/casinos/2 has 3 slashes
-                continue
-            
-            # Convert to absolute URL
-            if href.startswith('/'):
-                url = urljoin(base_domain, href)
-            elif href.startswith('http'):
-                url = href
-            else:
-                url = urljoin(base_url, href)
-            
-            # Remove anchor/fragment (#post-123)
-            if '#' in url:
-                url = url.split('#')[0]
-            
-            # Deduplicate
-            if url not in seen:
-                seen.add(url)
-                thread_urls.append(url)
+        # Skip pagination links and other non-thread links. Page-number links
+        # (like /forum/casinos/2, 3 slashes) are skipped too: thread URLs contain
+        # the thread name/slug
+        hrefs = [
+            link['href'] for link in thread_links
+            if not link['href'].startswith(('#', 'javascript:')) and link['href'].count('/') > 3
+        ]
+        
+        # Convert to absolute URLs and remove anchor/fragment (#post-123)
+        urls = [self.absolute_url(href, base_domain, base_url).partition('#')[0] for href in hrefs]
+        
+        # Deduplicate, keeping first-seen order
+        thread_urls = list(dict.fromkeys(urls))
         
         logger.debug(f"Extracted {len(thread_urls)} thread URLs from {base_url}")
         return thread_urls
     
+    def _thread_title(self, soup: BeautifulSoup) -> str:
+        """Title of a thread page ('' if none)."""
+        title_elem = self.select_one_by_priority(soup, _TITLE_SELECTORS)
+        return title_elem.get_text(strip=True) if title_elem else ''
+    
     def extract_thread_content(self, soup: BeautifulSoup) -> Optional[Dict[str, str]]:
         """
         Extract thread title and first post content from casino.guru thread page.
         """
+        return self._thread_content(soup, self._thread_title(soup))
+    
+    def _thread_content(self, soup: BeautifulSoup, title: str) -> Optional[Dict[str, str]]:
+        """
+        extract_thread_content for a page whose title was already looked up.
+        
+        extract_all_posts falls back to this with its own title, so the title
+        selectors run once per page.
+        """
         result = {
-            'title': '',
+            'title': title,
             'content': ''
         }
         
-        # Extract title
-        title_selectors = [
-            'h1',
-            '.thread-title',
-            '.topic-title',
-            '.discussion-title',
-            'title'
-        ]
-        
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                result['title'] = title_elem.get_text(strip=True)
-                break
-        
         # Extract first post content
         # Try multiple strategies to find the first post
         content_text = ''
@@ -114,31 +152,24 @@ class CasinoGuruParser(BaseParser):
             '.forum-post'
         ]
         
-        for selector in post_selectors:
-            posts = soup.select(selector)
-            if posts:
-                # Get first post
-                content_text = posts[0].get_text(separator=' ', strip=True)
-                break
+        posts, _ = self.select_by_priority(soup, post_selectors)
+        if posts:
+            # Get first post
+            content_text = posts[0].get_text(separator=' ', strip=True)
         
         # Strategy 2: If no content found, look for main content area
         if not content_text:
             main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=['content', 'main-content'])
             if main_content:
-                # Get all paragraphs
-                paragraphs = main_content.find_all('p', limit=5)
-                content_text = ' '.join(p.get_text(strip=True) for p in paragraphs)
+                # Get the first paragraphs
+                content_text = self.first_paragraphs_text(main_content)
         
         # Strategy 3: If still no content, get text from body (excluding header/footer/nav)
         if not content_text:
-            # Remove script, style, nav, header, footer elements
-            for tag in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                tag.decompose()
-            
-            # Get remaining text
+            # Get body text outside script, style, nav, header, footer elements
             body = soup.find('body')
             if body:
-                content_text = body.get_text(separator=' ', strip=True)[:1000]
+                content_text = _body_text(body, 1000)
         
         result['content'] = content_text
         
@@ -160,13 +191,7 @@ class CasinoGuruParser(BaseParser):
         posts = []
         
         # Extract title first
-        title = ''
-        title_selectors = ['h1', '.thread-title', '.topic-title', '.discussion-title', 'title']
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-                break
+        title = self._thread_title(soup)
         
         # Try multiple strategies to find all posts
         post_elements = []
@@ -183,11 +208,9 @@ class CasinoGuruParser(BaseParser):
             'li[class*="post"]',
         ]
         
-        for selector in post_selectors:
-            post_elements = soup.select(selector)
-            if post_elements:
-                logger.debug(f"Found {len(post_elements)} posts using selector: {selector}")
-                break
+        post_elements, selector = self.select_by_priority(soup, post_selectors)
+        if post_elements:
+            logger.debug(f"Found {len(post_elements)} posts using selector: {selector}")
         
         # Strategy 2: If no posts found, look for common content containers
         if not post_elements:
@@ -198,7 +221,7 @@ class CasinoGuruParser(BaseParser):
                     # Find all divs with text content
                     post_elements = container.find_all(['div', 'article', 'li'], recursive=True, limit=100)
                     # Filter to those that look like posts (have substantial text)
-                    post_elements = [p for p in post_elements if len(p.get_text(strip=True)) > 50]
+                    post_elements = [p for p in post_elements if _text_longer_than(p, 50)]
                     if post_elements:
                         logger.debug(f"Found {len(post_elements)} potential posts in {container_selector}")
                         break
@@ -208,13 +231,7 @@ class CasinoGuruParser(BaseParser):
             try:
                 # Extract post content
                 # Try to find the main content within the post
-                content_elem = (
-                    post_elem.select_one('.post-content') or
-                    post_elem.select_one('.message-content') or
-                    post_elem.select_one('.post-body') or
-                    post_elem.select_one('.content') or
-                    post_elem
-                )
+                content_elem = self.select_one_by_priority(post_elem, _POST_CONTENT_SELECTORS) or post_elem
                 
                 content_text = content_elem.get_text(separator=' ', strip=True)
                 
@@ -224,12 +241,9 @@ class CasinoGuruParser(BaseParser):
                 
                 # Try to extract author
                 author = 'Unknown'
-                author_selectors = ['.author', '.username', '.post-author', '[class*="author"]', '[class*="username"]']
-                for auth_sel in author_selectors:
-                    author_elem = post_elem.select_one(auth_sel)
-                    if author_elem:
-                        author = author_elem.get_text(strip=True)
-                        break
+                author_elem = _AUTHOR_SEL.select_one(post_elem)
+                if author_elem:
+                    author = author_elem.get_text(strip=True)
                 
                 # First post includes title
                 if idx == 1 and title:
@@ -248,7 +262,7 @@ class CasinoGuruParser(BaseParser):
         # Fallback: if no posts found, use the old method
         if not posts:
             logger.debug("No posts found with standard selectors, using fallback")
-            thread_data = self.extract_thread_content(soup)
+            thread_data = self._thread_content(soup, title)
             if thread_data:
                 posts = [{
                     'content': f"{thread_data['title']} {thread_data['content']}",
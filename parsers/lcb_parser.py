@@ -1,17 +1,58 @@
 from typing import List, Dict, Optional
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import logging
 import os
+import soupsieve as sv
 
 from .base_parser import BaseParser
 
 logger = logging.getLogger(__name__)
 
+# Selectors are compiled once at import, most preferred first
+_ALL_TOPICS_SEL = sv.compile('#all-topics, .all-topics')
+_TOPIC_TITLE_LINK_SEL = sv.compile('.topic-author-name > a:first-of-type')
+_TOPIC_INFO_LINK_SEL = sv.compile('.topic-info a')
+_MAIN_COLUMN_SEL = sv.compile('.col-12.col-xl-9, .main-content')
+_TITLE_SELECTORS = [sv.compile(s) for s in ('h1', '.thread-title', '.topic-title', 'title')]
+# Priority lists for select_by_priority (compiled once on first use)
+_FIRST_POST_SELECTORS = (
+    '.post-content',
+    '.message-content',
+    '.topic-content',
+    '.post-body',
+    '.message-body',
+    'article.post',
+    '.forum-post',
+)
+_POST_SELECTORS = (
+    'li[id^="msg"]',  # LCB.org specific: <li id="msg387659">
+    '[id^="msg"]',    # Fallback: any element with id starting with "msg"
+    '.post-message',  # LCB.org post content container
+    '.post',
+    '.message',
+    '.comment',
+    '.forum-post',
+    'article.post',
+)
+_POST_CONTENT_SELECTORS = [sv.compile(s) for s in ('.post-content', '.message-content', '.post-body', '.content')]
+_AUTHOR_SELECTORS = [sv.compile(s) for s in ('.author', '.username', '.post-author', '[class*="author"]')]
+
+# Comprehensive mode reads every link and nothing else, so category pages can be parsed down to <a href> tags
+_LINKS_STRAINER = SoupStrainer('a', href=True)
+
 
 class LCBParser(BaseParser):
     """Parser for LCB.org forum (Latest Casino Bonuses)."""
     
+    def __init__(self):
+        """Read the thread link extraction mode once (LCB_EXTRACTION_MODE, see extract_thread_urls)."""
+        self.extraction_mode = os.getenv('LCB_EXTRACTION_MODE', 'comprehensive').lower()
+    
+    @property
+    def THREAD_URL_STRAINER(self) -> Optional[SoupStrainer]:
+        """Strainer for category pages (targeted mode needs the #all-topics containers, so it parses everything)."""
+        return None if self.extraction_mode == 'targeted' else _LINKS_STRAINER
+    
     def get_paginated_url(self, base_url: str, page_num: int) -> str:
         """
         Generate paginated URL for LCB.org.
@@ -39,52 +80,48 @@ class LCBParser(BaseParser):
         - 'comprehensive' (default): Extract all thread links including sidebar/widgets
         - 'targeted': Extract only main thread list, faster but less coverage
         """
-        thread_urls = []
-        
         # Parse base URL to get domain
-        parsed = urlparse(base_url)
-        base_domain = f"{parsed.scheme}://{parsed.netloc}"
-        
-        # Get extraction mode from environment variable
-        extraction_mode = os.getenv('LCB_EXTRACTION_MODE', 'comprehensive').lower()
+        base_domain = self.get_base_domain(base_url)
         
         # Find all links based on extraction mode
-        if extraction_mode == 'targeted':
+        if self.extraction_mode == 'targeted':
             # Targeted mode: Only extract main thread title links
             # LCB.org structure: <ul id="all-topics"><li class="full-row"><div class="topic-author-name"><a>Thread Title</a>
-            main_content = soup.select_one('#all-topics, .all-topics')
+            main_content = _ALL_TOPICS_SEL.select_one(soup)
             if main_content:
                 # Extract only the main thread title link from each row
                 # Each row has multiple links (title, last post, users), we want only the title
-                all_links = main_content.select('.topic-author-name > a:first-of-type')
+                all_links = _TOPIC_TITLE_LINK_SEL.select(main_content)
                 if all_links:
                     logger.debug(f"LCB targeted mode: found {len(all_links)} thread title links in #all-topics")
                 else:
                     # Fallback: get all links in topic-info if selector fails
-                    all_links = main_content.select('.topic-info a')
+                    all_links = _TOPIC_INFO_LINK_SEL.select(main_content)
                     logger.debug(f"LCB targeted mode: using .topic-info links ({len(all_links)} found)")
             else:
                 # Fallback: try to find main content column
-                main_content = soup.select_one('.col-12.col-xl-9, .main-content')
+                main_content = _MAIN_COLUMN_SEL.select_one(soup)
                 if main_content:
-                    all_links = main_content.find_all('a', href=True)
+                    all_links = main_content.find_all('a')
                     logger.debug(f"LCB targeted mode: using main content column with {len(all_links)} links")
                 else:
                     # Last resort: use all links
-                    all_links = soup.find_all('a', href=True)
+                    all_links = soup.find_all('a')
                     logger.debug(f"LCB targeted mode: container not found, using all {len(all_links)} links")
         else:
             # Comprehensive mode: Extract from entire page (includes sidebars, widgets, etc.)
-            all_links = soup.find_all('a', href=True)
+            all_links = soup.find_all('a')
             logger.debug(f"LCB comprehensive mode: searching all {len(all_links)} page links")
         
         # Filter thread links
-        seen = set()
+        base_path = base_url.rstrip('/')
+        urls = []
+        # (links are matched by tag name only, BeautifulSoup's fast path; hrefs are read from attrs directly)
         for link in all_links:
-            href = link['href']
+            href = link.attrs.get('href')
             
             # Skip non-thread links
-            if href.startswith('#') or href.startswith('javascript:'):
+            if not href or href.startswith(('#', 'javascript:')):
                 continue
             
             # Thread URLs contain the category path + topic name
@@ -93,31 +130,30 @@ class LCBParser(BaseParser):
                 # Skip pagination links (just numbers)
                 # Pagination: /onlinecasinobonusforum/casinos/40
                 # Thread: /onlinecasinobonusforum/casinos/topic-name-1
-                path_parts = href.rstrip('/').split('/')
-                last_part = path_parts[-1]
+                path = href.rstrip('/')
                 
                 # Skip if last part is just a number (pagination)
-                if last_part.isdigit():
+                if path[path.rfind('/') + 1:].isdigit():
                     continue
                 
                 # Skip if it's the base category URL
-                if href.rstrip('/') in base_url:
+                if path in base_url:
                     continue
                 
                 # Convert to absolute URL
                 if href.startswith('/'):
                     full_url = f"{base_domain}{href}"
                 elif not href.startswith('http'):
-                    full_url = base_url.rstrip('/') + '/' + href
+                    full_url = base_path + '/' + href
                 else:
                     full_url = href
                 
                 # Remove query parameters and fragments for deduplication
-                clean_url = full_url.split('?')[0].split('#')[0]
-                
-                if clean_url not in seen:
-                    seen.add(clean_url)
-                    thread_urls.append(clean_url)
+                # (partition returns the URL itself when neither is present, so no copy)
+                urls.append(full_url.partition('?')[0].partition('#')[0])
+        
+        # Deduplicate, keeping first-seen order
+        thread_urls = list(dict.fromkeys(urls))
         
         logger.debug(f"Extracted {len(thread_urls)} thread URLs from {base_url}")
         return thread_urls
@@ -132,38 +168,17 @@ class LCBParser(BaseParser):
         }
         
         # Extract title
-        title_selectors = [
-            'h1',
-            '.thread-title',
-            '.topic-title',
-            'title'
-        ]
-        
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                result['title'] = title_elem.get_text(strip=True)
-                break
+        title_elem = self.select_one_by_priority(soup, _TITLE_SELECTORS)
+        if title_elem:
+            result['title'] = title_elem.get_text(strip=True)
         
         # Extract first post content
         content_text = ''
         
         # Strategy 1: Look for post content
-        post_selectors = [
-            '.post-content',
-            '.message-content',
-            '.topic-content',
-            '.post-body',
-            '.message-body',
-            'article.post',
-            '.forum-post'
-        ]
-        
-        for selector in post_selectors:
-            posts = soup.select(selector)
-            if posts:
-                content_text = posts[0].get_text(separator=' ', strip=True)
-                break
+        posts, _ = self.select_by_priority(soup, _FIRST_POST_SELECTORS)
+        if posts:
+            content_text = posts[0].get_text(separator=' ', strip=True)
         
         # Strategy 2: If no content found, look for main content area
         if not content_text:
@@ -192,44 +207,28 @@ class LCBParser(BaseParser):
         
         # Extract title first
         title = ''
-        title_selectors = ['h1', '.thread-title', '.topic-title', 'title']
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-                break
+        title_elem = self.select_one_by_priority(soup, _TITLE_SELECTORS)
+        if title_elem:
+            title = title_elem.get_text(strip=True)
         
         # Find post elements
         post_elements = []
         
         # LCB.org uses <li class="full-row" id="msg123456"> for each post
-        post_selectors = [
-            'li[id^="msg"]',  # LCB.org specific: <li id="msg387659">
-            '[id^="msg"]',    # Fallback: any element with id starting with "msg"
-            '.post-message',  # LCB.org post content container
-            '.post',
-            '.message',
-            '.comment',
-            '.forum-post',
-            'article.post',
-        ]
+        post_elements, selector = self.select_by_priority(soup, _POST_SELECTORS)
+        if post_elements:
+            logger.debug(f"Found {len(post_elements)} posts using selector: {selector}")
         
-        for selector in post_selectors:
-            post_elements = soup.select(selector)
-            if post_elements:
-                logger.debug(f"Found {len(post_elements)} posts using selector: {selector}")
-                break
+        # Content and author elements of all posts are located in one walk each
+        # (LCB posts usually match none of the content selectors, which used to
+        # cost one walk of every post per selector)
+        content_elems = self.select_one_by_priority_each(soup, post_elements, _POST_CONTENT_SELECTORS)
+        author_elems = self.select_one_by_priority_each(soup, post_elements, _AUTHOR_SELECTORS)
         
         # Process found posts
         for idx, post_elem in enumerate(post_elements, start=1):
             try:
-                content_elem = (
-                    post_elem.select_one('.post-content') or
-                    post_elem.select_one('.message-content') or
-                    post_elem.select_one('.post-body') or
-                    post_elem.select_one('.content') or
-                    post_elem
-                )
+                content_elem = content_elems[idx - 1] or post_elem
                 
                 content_text = content_elem.get_text(separator=' ', strip=True)
                 
@@ -237,12 +236,9 @@ class LCBParser(BaseParser):
                     continue
                 
                 author = 'Unknown'
-                author_selectors = ['.author', '.username', '.post-author', '[class*="author"]']
-                for auth_sel in author_selectors:
-                    author_elem = post_elem.select_one(auth_sel)
-                    if author_elem:
-                        author = author_elem.get_text(strip=True)
-                        break
+                author_elem = author_elems[idx - 1]
+                if author_elem:
+                    author = author_elem.get_text(strip=True)
                 
                 if idx == 1 and title:
                     content_text = f"{title} {content_text}"
@@ -1,17 +1,26 @@
 from typing import List, Dict, Optional
-from urllib.parse import urljoin, urlparse, quote
+from urllib.parse import urljoin, quote
 import logging
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from .base_parser import BaseParser
 
 logger = logging.getLogger(__name__)
 
+# (tag name, class) candidates, most preferred first; each list is resolved in one walk
+_TITLE_CANDIDATES = (('h1', 'H'), ('h1', 'DiscussionTitle'), ('h1', None))
+_POST_CANDIDATES = (('div', 'ItemComment'), ('li', 'ItemComment'))
+_CONTENT_CANDIDATES = (('div', 'Message'), ('div', 'userContent'), ('div', 'Content'))
+_AUTHOR_CANDIDATES = (('a', 'Username'), ('span', 'Username'), ('div', 'Author'))
+
 
 class MoneySavingExpertParser(BaseParser):
     """Parser for MoneySavingExpert forum (Vanilla Forums platform)."""
 
+    # extract_thread_urls only reads links, so listing pages are parsed down to <a href> tags
+    THREAD_URL_STRAINER = SoupStrainer('a', href=True)
+
     def get_search_url(self, keyword: str, page: int = 1) -> str:
         """Generate search URL for MoneySavingExpert.
         
@@ -42,28 +51,26 @@ class MoneySavingExpertParser(BaseParser):
 
     def extract_thread_urls(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract thread URLs from Vanilla Forums search/discussion page."""
-        thread_urls: List[str] = []
+        base_domain = self.get_base_domain(base_url)
         
-        parsed = urlparse(base_url)
-        base_domain = f"{parsed.scheme}://{parsed.netloc}"
-        
-        seen = set()
+        urls: List[str] = []
         
         # Vanilla Forums threads are typically in:
         # - <div class="ItemDiscussion"> or similar
         # - <a> tags with class "Title" or in title containers
         
         # Strategy 1: Find all links with /discussion/ in href (most reliable)
-        all_links = soup.find_all('a', href=True)
+        # (tag-name-only find_all is BeautifulSoup's fast path; hrefs are read from attrs directly)
+        all_links = soup.find_all('a')
         for link in all_links:
-            href = link['href']
+            href = link.attrs.get('href')
             
             # Must contain /discussion/
-            if '/discussion/' not in href:
+            if not href or '/discussion/' not in href:
                 continue
             
-            # Skip pagination, profiles, categories
-            if any(x in href for x in ['/categories/', '/profile/', '/embed/', '?page=', '#']):
+            # Skip pagination, profiles, categories (chained substring tests, no generator per link)
+            if '#' in href or '?page=' in href or '/categories/' in href or '/profile/' in href or '/embed/' in href:
                 continue
             
             # Convert to absolute URL
@@ -75,13 +82,10 @@ class MoneySavingExpertParser(BaseParser):
                 continue
             
             # Clean URL (remove anchors)
-            if '#' in url:
-                url = url.split('#')[0]
-            
-            if url not in seen:
-                seen.add(url)
-                thread_urls.append(url)
+            urls.append(url.partition('#')[0])
         
+        # Deduplicate, keeping first-seen order
+        thread_urls = list(dict.fromkeys(urls))
         
         logger.debug(f"Extracted {len(thread_urls)} thread URLs from {base_url}")
         return thread_urls
@@ -92,27 +96,19 @@ class MoneySavingExpertParser(BaseParser):
         
         # Vanilla Forums thread title is typically in:
         # <h1 class="H"> or <h1> in the discussion header
-        title_elem = (
-            soup.find('h1', class_='H') or
-            soup.find('h1', class_='DiscussionTitle') or
-            soup.find('h1')
-        )
+        title_elem = self.find_by_priority(soup, _TITLE_CANDIDATES)
         
         if title_elem:
             title = title_elem.get_text(strip=True)
         
         # First post content
         # Vanilla Forums posts are in <div class="Message"> or <div class="userContent">
-        first_post = soup.find('div', class_='ItemComment') or soup.find('li', class_='ItemComment')
+        first_post = self.find_by_priority(soup, _POST_CANDIDATES)
         
         content = ''
         if first_post:
             # Content is typically in <div class="Message"> or <div class="userContent">
-            content_div = (
-                first_post.find('div', class_='Message') or
-                first_post.find('div', class_='userContent') or
-                first_post.find('div', class_='Content')
-            )
+            content_div = self.find_by_priority(first_post, _CONTENT_CANDIDATES)
             if content_div:
                 content = content_div.get_text(separator=' ', strip=True)
         
@@ -128,30 +124,24 @@ class MoneySavingExpertParser(BaseParser):
         
         # Extract title
         title = ''
-        title_elem = (
-            soup.find('h1', class_='H') or
-            soup.find('h1', class_='DiscussionTitle') or
-            soup.find('h1')
-        )
+        title_elem = self.find_by_priority(soup, _TITLE_CANDIDATES)
         if title_elem:
             title = title_elem.get_text(strip=True)
         
         # Find all post items
         # Vanilla Forums uses: <div class="ItemComment"> or <li class="ItemComment">
         post_items = (
-            soup.find_all('div', class_='ItemComment') or
-            soup.find_all('li', class_='ItemComment') or
-            soup.find_all('div', class_=lambda x: x and 'Comment' in str(x))
+            self.find_all_with_class(soup, 'div', 'ItemComment') or
+            self.find_all_with_class(soup, 'li', 'ItemComment') or
+            self.find_all_with_class_containing(soup, 'div', 'Comment')
         )
         
         for idx, item in enumerate(post_items, start=1):
             try:
+                # Content and author are located in one walk of the post
+                content_div, author_elem = self.find_each_by_priority(item, (_CONTENT_CANDIDATES, _AUTHOR_CANDIDATES))
+                
                 # Extract post content
-                content_div = (
-                    item.find('div', class_='Message') or
-                    item.find('div', class_='userContent') or
-                    item.find('div', class_='Content')
-                )
                 if not content_div:
                     continue
                 
@@ -162,11 +152,6 @@ class MoneySavingExpertParser(BaseParser):
                 
                 # Extract author
                 author = 'Unknown'
-                author_elem = (
-                    item.find('a', class_='Username') or
-                    item.find('span', class_='Username') or
-                    item.find('div', class_='Author')
-                )
                 if author_elem:
                     author = author_elem.get_text(strip=True)
                 
@@ -1,17 +1,34 @@
 from typing import List, Dict, Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 import logging
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from .base_parser import BaseParser
 
 logger = logging.getLogger(__name__)
 
+# (tag name, class) candidates, most preferred first; each list is resolved in one walk
+_TITLE_CANDIDATES = (('h1', None), ('span', 'threadtitle'), ('title', None))
+_CONTENT_CANDIDATES = (
+    ('div', 'content'),
+    ('div', 'postbody'),
+    ('blockquote', 'postcontent'),
+    ('div', 'postcontent'),
+    ('div', 'post_message'),
+)
+_AUTHOR_CANDIDATES = (('a', 'username'), ('span', 'username'), ('div', 'username'))
+_FALLBACK_TITLE_CANDIDATES = (('h1', None), ('title', None))
+_FALLBACK_CONTENT_CANDIDATES = (('div', 'postbody'), ('div', 'post_message'), ('blockquote', None))
+
 
 class OwnedCoreParser(BaseParser):
     """Parser for ownedcore.com forum (vBulletin 4.2.3)."""
 
+    # extract_thread_urls reads threadbit rows and links only, so forum pages are
+    # parsed down to <li> and <a> subtrees
+    THREAD_URL_STRAINER = SoupStrainer(['li', 'a'])
+
     def get_paginated_url(self, base_url: str, page_num: int) -> str:
         """
         Generate paginated URL for OwnedCore.
@@ -29,17 +46,14 @@ class OwnedCoreParser(BaseParser):
 
     def extract_thread_urls(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract thread URLs from a vBulletin forum page."""
-        thread_urls: List[str] = []
-        
-        parsed = urlparse(base_url)
-        base_domain = f"{parsed.scheme}://{parsed.netloc}"
+        base_domain = self.get_base_domain(base_url)
         
         # vBulletin thread links are typically in the threadbit class
         # Look for links with showthread.php or /threads/ pattern
-        seen = set()
+        urls: List[str] = []
         
         # Method 1: Find threadbit containers
-        threadbits = soup.find_all('li', class_=lambda x: x and 'threadbit' in x)
+        threadbits = self.find_all_with_class_containing(soup, 'li', 'threadbit')
         for threadbit in threadbits:
             link = threadbit.find('a', class_='title')
             if not link or not link.get('href'):
@@ -54,18 +68,13 @@ class OwnedCoreParser(BaseParser):
                 url = urljoin(base_url, href)
             
             # Remove anchor
-            if '#' in url:
-                url = url.split('#')[0]
-            
-            if url not in seen:
-                seen.add(url)
-                thread_urls.append(url)
+            urls.append(url.partition('#')[0])
         
         # Method 2: Fallback - find all links with showthread.php
-        if not thread_urls:
-            for a in soup.find_all('a', href=True):
-                href = a['href']
-                if 'showthread.php' not in href and '/threads/' not in href:
+        if not urls:
+            for a in soup.find_all('a'):
+                href = a.attrs.get('href')
+                if not href or ('showthread.php' not in href and '/threads/' not in href):
                     continue
                 
                 if href.startswith('/'):
@@ -75,12 +84,10 @@ class OwnedCoreParser(BaseParser):
                 else:
                     url = urljoin(base_url, href)
                 
-                if '#' in url:
-                    url = url.split('#')[0]
-                
-                if url not in seen:
-                    seen.add(url)
-                    thread_urls.append(url)
+                urls.append(url.partition('#')[0])
+        
+        # Deduplicate, keeping first-seen order
+        thread_urls = list(dict.fromkeys(urls))
         
         logger.debug(f"Extracted {len(thread_urls)} thread URLs from {base_url}")
         return thread_urls
@@ -88,19 +95,13 @@ class OwnedCoreParser(BaseParser):
     def extract_thread_content(self, soup: BeautifulSoup) -> Optional[Dict[str, str]]:
         """Extract thread title and first post content from vBulletin thread."""
         title = ''
-        title_elem = soup.find('h1') or soup.find('span', class_='threadtitle') or soup.find('title')
+        title_elem = self.find_by_priority(soup, _TITLE_CANDIDATES)
         if title_elem:
             title = title_elem.get_text(strip=True)
         
         # Extract first post content
         content = ''
-        content_elem = (
-            soup.find('div', class_='content') or
-            soup.find('div', class_='postbody') or
-            soup.find('blockquote', class_='postcontent') or
-            soup.find('div', class_='postcontent') or
-            soup.find('div', class_='post_message')
-        )
+        content_elem = self.find_by_priority(soup, _CONTENT_CANDIDATES)
         
         if content_elem:
             content = content_elem.get_text(separator=' ', strip=True)
@@ -116,22 +117,19 @@ class OwnedCoreParser(BaseParser):
         posts: List[Dict[str, str]] = []
         
         # vBulletin posts are typically in postcontainer or postbit divs
+        # (tag-name-only find_all is BeautifulSoup's fast path; classes/ids are checked on the candidates)
         post_containers = (
-            soup.find_all('li', class_=lambda x: x and 'postbit' in x) or
-            soup.find_all('div', class_=lambda x: x and 'postbit' in x) or
-            soup.find_all('div', id=lambda x: x and x.startswith('post_'))
+            self.find_all_with_class_containing(soup, 'li', 'postbit') or
+            self.find_all_with_class_containing(soup, 'div', 'postbit') or
+            [div for div in soup.find_all('div') if div.get('id', '').startswith('post_')]
         )
         
         for idx, container in enumerate(post_containers, start=1):
             try:
+                # Content and author are located in one walk of the post
+                content_elem, author_elem = self.find_each_by_priority(container, (_CONTENT_CANDIDATES, _AUTHOR_CANDIDATES))
+                
                 # Extract post content
-                content_elem = (
-                    container.find('div', class_='content') or
-                    container.find('div', class_='postbody') or
-                    container.find('blockquote', class_='postcontent') or
-                    container.find('div', class_='postcontent') or
-                    container.find('div', class_='post_message')
-                )
                 
                 if not content_elem:
                     continue
@@ -143,11 +141,6 @@ class OwnedCoreParser(BaseParser):
                 
                 # Extract author
                 author = 'Unknown'
-                author_elem = (
-                    container.find('a', class_='username') or
-                    container.find('span', class_='username') or
-                    container.find('div', class_='username')
-                )
                 if author_elem:
                     author = author_elem.get_text(strip=True)
                 
@@ -163,16 +156,12 @@ class OwnedCoreParser(BaseParser):
         # Fallback: If no posts found, try to get thread title and first post
         if not posts:
             title = ''
-            title_elem = soup.find('h1') or soup.find('title')
+            title_elem = self.find_by_priority(soup, _FALLBACK_TITLE_CANDIDATES)
             if title_elem:
                 title = title_elem.get_text(strip=True)
             
             # Try to find any content
-            content_elem = (
-                soup.find('div', class_='postbody') or
-                soup.find('div', class_='post_message') or
-                soup.find('blockquote')
-            )
+            content_elem = self.find_by_priority(soup, _FALLBACK_CONTENT_CANDIDATES)
             
             if content_elem:
                 content = content_elem.get_text(separator=' ', strip=True)
@@ -1,11 +1,34 @@
-from typing import List, Dict, Optional
-import json
+from functools import lru_cache
+from typing import Any, List, Dict, Optional
 import logging
 
 from .base_parser import BaseParser
 
+# orjson is optional - Reddit listings fall back to the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Permalinks in API responses are site-relative
+_REDDIT_URL = "https://www.reddit.com"
+
+
+def _first_post_data(response) -> Dict[str, Any]:
+    """
+    Post fields of a Reddit post API response.
+    
+    Thread responses are [post_listing, comments_listing]; a bare listing holds the
+    post itself. Raises KeyError/IndexError/TypeError if the response has no post.
+    """
+    listing = response[0] if isinstance(response, list) else response
+    return listing['data']['children'][0]['data']
+
 
 class RedditParser(BaseParser):
     """Parser for Reddit subreddits using JSON API."""
@@ -17,6 +40,9 @@ class RedditParser(BaseParser):
         self.user_agent = "python:forum-scraper:v1.0 (by /u/ForumMonitor)"
         self.after_token = None  # Track pagination token
     
+    # Decoder for raw Reddit API response bodies (bytes or str); passed to BaseCrawler.fetch_json
+    loads = staticmethod(orjson.loads if ORJSON_AVAILABLE else json.loads)
+    
     def get_reddit_headers(self):
         """Get Reddit-compliant headers."""
         return {
@@ -24,6 +50,38 @@ class RedditParser(BaseParser):
             'Accept': 'application/json',
         }
     
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def get_listing_url(base_url: str) -> str:
+        """
+        Get the JSON API listing endpoint of a subreddit (cached: every page shares it).
+        
+        Args:
+            base_url: Subreddit URL (e.g., https://www.reddit.com/r/casino) or .json endpoint
+            
+        Returns:
+            Listing URL with the page size, e.g. https://www.reddit.com/r/casino/new.json?limit=30
+        """
+        if not base_url.endswith('.json'):
+            base_url = f"{base_url.rstrip('/')}/new.json"
+        return f"{base_url}?limit=30"
+    
+    @staticmethod
+    def get_post_json_url(post_url: str) -> str:
+        """
+        Get the JSON API URL of a post.
+        
+        The post endpoint also returns the comment tree (megabytes on busy threads),
+        which is not extracted yet, so it is trimmed to a single top-level comment.
+        
+        Args:
+            post_url: Post URL as returned by extract_thread_urls
+            
+        Returns:
+            JSON API URL of the post
+        """
+        return f"{post_url}.json?limit=1&depth=1"
+    
     def get_paginated_url(self, base_url: str, page_num: int) -> str:
         """
         Generate paginated URL for Reddit.
@@ -38,21 +96,19 @@ class RedditParser(BaseParser):
             JSON API URL with appropriate after token
         """
         # Convert regular Reddit URL to JSON API endpoint
-        if not base_url.endswith('.json'):
-            base_url = base_url.rstrip('/')
-            base_url = f"{base_url}/new.json"
+        listing_url = self.get_listing_url(base_url)
         
         # ALWAYS reset token on page 1 (new subreddit)
         if page_num == 1:
             self.after_token = None
-            return f"{base_url}?limit=30"
+            return listing_url
         
         # Subsequent pages use 'after' token (if available)
         if self.after_token:
-            return f"{base_url}?limit=30&after={self.after_token}"
+            return f"{listing_url}&after={self.after_token}"
         else:
             # No more pages available
-            return f"{base_url}?limit=30"
+            return listing_url
     
     def extract_thread_urls(self, soup, base_url: str) -> List[str]:
         """
@@ -82,14 +138,11 @@ class RedditParser(BaseParser):
             # Store the 'after' token for pagination
             self.after_token = data.get('after')  # Will be None if no more pages
             
-            for child in children:
-                post_data = child.get('data', {})
-                permalink = post_data.get('permalink')
-                
-                if permalink:
-                    # Convert to full URL
-                    full_url = f"https://www.reddit.com{permalink}"
-                    post_urls.append(full_url)
+            # Convert permalinks to full URLs
+            post_urls = [
+                _REDDIT_URL + permalink for child in children
+                if (permalink := child.get('data', {}).get('permalink'))
+            ]
             
             logger.debug(f"Extracted {len(post_urls)} post URLs from Reddit (after={self.after_token})")
             
@@ -115,11 +168,7 @@ class RedditParser(BaseParser):
         try:
             # Reddit post JSON structure: [post_listing, comments_listing]
             # We want the first element (post data)
-            if isinstance(soup, list) and len(soup) > 0:
-                post_data = soup[0].get('data', {}).get('children', [])[0].get('data', {})
-            else:
-                # Single post structure
-                post_data = soup.get('data', {}).get('children', [])[0].get('data', {})
+            post_data = _first_post_data(soup)
             
             title = post_data.get('title', '')
             selftext = post_data.get('selftext', '')
@@ -151,13 +200,7 @@ class RedditParser(BaseParser):
         
         try:
             # Handle both list (post+comments) and dict (post only) responses
-            if isinstance(soup, list) and len(soup) > 0:
-                # Post is in first element
-                post_listing = soup[0]
-                post_data = post_listing.get('data', {}).get('children', [])[0].get('data', {})
-            else:
-                # Single post structure
-                post_data = soup.get('data', {}).get('children', [])[0].get('data', {})
+            post_data = _first_post_data(soup)
             
             # Extract post data
             title = post_data.get('title', '')
@@ -1,17 +1,85 @@
-from typing import List, Dict, Optional
-from urllib.parse import urljoin, urlparse
+from typing import Dict, Iterator, List, Optional, Tuple
 import logging
 
-from bs4 import BeautifulSoup
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 
 from .base_parser import BaseParser
 
 logger = logging.getLogger(__name__)
 
+# Post body and author lookups, compiled once and matched for all posts of a page in one walk
+_POST_CONTENT_SELECTORS = [sv.compile('div.bbWrapper')]
+_AUTHOR_SELECTORS = [sv.compile(s) for s in ('a.username', 'h4.message-name', 'a[data-user-id]')]
+
+
+class _ThreadListStrainer(SoupStrainer):
+    """
+    Keep structItem--thread rows and links of a forum page, discard everything else.
+    
+    A plain SoupStrainer cannot express "div with a class containing X, or any a",
+    and both are needed: thread rows for the main strategy, links for the fallback.
+    Only top-level markup is filtered, so everything inside a kept row is kept.
+    
+    Parse-time filtering goes through allow_tag_creation on bs4 4.13+ and through
+    search_tag on 4.12, so both are overridden with the same test.
+    """
+    
+    @staticmethod
+    def _keep(name: str, attrs: Optional[Dict[str, str]]) -> bool:
+        if name == 'a':
+            return True
+        # Attribute values are still raw strings at parse time
+        return name == 'div' and bool(attrs) and 'structItem--thread' in attrs.get('class', '')
+    
+    def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs: Optional[Dict[str, str]]) -> bool:
+        return self._keep(name, attrs)
+    
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # bs4 < 4.13 also calls this with a Tag when searching a built tree
+        if isinstance(markup_name, Tag):
+            return super().search_tag(markup_name, markup_attrs)
+        return self._keep(markup_name, markup_attrs)
+
+
+def _scan_thread_page(soup: BeautifulSoup) -> Tuple[Optional[Tag], List[Tag]]:
+    """
+    Find the title heading and the post articles of a thread page in one walk.
+    
+    The title is <h1 class="p-title-value">, else an h1 with a p-title* class, else
+    the first h1 (same result as the find('h1', class_=...) chain it replaces).
+    Posts are <article> tags with a message--post* class, in document order.
+    """
+    headings: List[Tag] = []
+    post_articles: List[Tag] = []
+    for tag in soup.descendants:
+        name = tag.name
+        if name == 'h1':
+            headings.append(tag)
+        elif name == 'article' and any('message--post' in css_class for css_class in tag.get_attribute_list('class', [])):
+            post_articles.append(tag)
+    return _pick_title(headings), post_articles
+
+
+def _pick_title(headings: List[Tag]) -> Optional[Tag]:
+    """Most preferred title heading among a page's h1 tags (see _scan_thread_page)."""
+    for heading in headings:
+        if 'p-title-value' in heading.get_attribute_list('class'):
+            return heading
+    for heading in headings:
+        if any('p-title' in css_class for css_class in heading.get_attribute_list('class', [])):
+            return heading
+    return headings[0] if headings else None
+
 
 class XenForoParser(BaseParser):
     """Parser for XenForo forums (e.g., CasinoMeister)."""
 
+    # extract_thread_urls reads thread rows and links only, so forum pages are parsed
+    # down to those subtrees; thread pages only need the title and post articles
+    THREAD_URL_STRAINER = _ThreadListStrainer('a')
+    THREAD_PAGE_STRAINER = SoupStrainer(['article', 'h1'])
+
     def get_paginated_url(self, base_url: str, page_num: int) -> str:
         """Generate paginated URL for XenForo.
         
@@ -29,10 +97,7 @@ class XenForoParser(BaseParser):
         """Extract thread URLs from XenForo sub-forum page."""
         thread_urls: List[str] = []
         
-        parsed = urlparse(base_url)
-        base_domain = f"{parsed.scheme}://{parsed.netloc}"
-        
-        seen = set()
+        base_domain = self.get_base_domain(base_url)
         
         # XenForo threads are typically in:
         # - <div class="structItem structItem--thread">
@@ -40,7 +105,8 @@ class XenForoParser(BaseParser):
         # - Or <a data-tp-primary="on"> for thread links
         
         # Strategy 1: Look for structItem--thread containers
-        thread_items = soup.find_all('div', class_=lambda x: x and 'structItem--thread' in x)
+        # (tag-name-only find_all is BeautifulSoup's fast path; classes are checked on the candidates)
+        thread_items = self.find_all_with_class_containing(soup, 'div', 'structItem--thread')
         
         for item in thread_items:
             # Find the main thread link
@@ -54,75 +120,58 @@ class XenForoParser(BaseParser):
             
             href = link['href']
             
-            # Convert to absolute URL
-            if href.startswith('/'):
-                url = urljoin(base_domain, href)
-            elif href.startswith('http'):
-                url = href
-            else:
-                url = urljoin(base_url, href)
-            
-            # Remove anchors
-            if '#' in url:
-                url = url.split('#')[0]
+            # Convert to absolute URL and remove anchors
+            url = self.absolute_url(href, base_domain, base_url).partition('#')[0]
             
             # XenForo thread URLs contain /threads/
             if '/threads/' not in url:
                 continue
             
-            if url not in seen:
-                seen.add(url)
-                thread_urls.append(url)
+            thread_urls.append(url)
         
         # Strategy 2: Fallback - find all links with /threads/ in href
         if not thread_urls:
-            all_links = soup.find_all('a', href=True)
+            all_links = soup.find_all('a')
             for link in all_links:
-                href = link['href']
-                
-                if '/threads/' not in href:
-                    continue
+                href = link.attrs.get('href')
                 
-                # Skip pagination, members, etc.
-                if any(x in href for x in ['/page-', '/members/', '/forums/', '#']):
+                # Thread links only; skip pagination, members, etc. (chained tests, no generator per link)
+                if (not href or '/threads/' not in href or '/page-' in href or '/members/' in href
+                        or '/forums/' in href or '#' in href):
                     continue
                 
-                # Convert to absolute URL
-                if href.startswith('/'):
-                    url = urljoin(base_domain, href)
-                elif href.startswith('http'):
-                    url = href
+                # Convert to absolute URL (page-relative links are not thread links here)
+                if href.startswith(('/', 'http')):
+                    url = self.absolute_url(href, base_domain, base_url)
                 else:
                     continue
                 
-                if url not in seen:
-                    seen.add(url)
-                    thread_urls.append(url)
+                thread_urls.append(url)
+        
+        # Order-preserving dedup
+        thread_urls = list(dict.fromkeys(thread_urls))
         
         logger.debug(f"Extracted {len(thread_urls)} thread URLs from {base_url}")
         return thread_urls
 
     def extract_thread_content(self, soup: BeautifulSoup) -> Optional[Dict[str, str]]:
         """Extract thread title and first post content from XenForo thread page."""
-        title = ''
-        
         # XenForo thread title is typically in:
         # <h1 class="p-title-value">
-        title_elem = (
-            soup.find('h1', class_='p-title-value') or
-            soup.find('h1', class_=lambda x: x and 'p-title' in x) or
-            soup.find('h1')
-        )
+        # XenForo posts are in <article class="message message--post">
+        return self._thread_content(*_scan_thread_page(soup))
+
+    def _thread_content(self, title_elem: Optional[Tag], post_articles: List[Tag]) -> Optional[Dict[str, str]]:
+        """extract_thread_content from a page scan (iter_posts' fallback passes its own)."""
+        title = ''
         
         if title_elem:
             title = title_elem.get_text(strip=True)
         
         # First post content
-        # XenForo posts are in <article class="message message--post">
-        first_post = soup.find('article', class_=lambda x: x and 'message--post' in x)
-        
         content = ''
-        if first_post:
+        if post_articles:
+            first_post = post_articles[0]
             # Content is in <div class="bbWrapper">
             content_div = first_post.find('div', class_='bbWrapper')
             if content_div:
@@ -136,26 +185,27 @@ class XenForoParser(BaseParser):
 
     def extract_all_posts(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
         """Extract all posts from a XenForo thread page."""
-        posts: List[Dict[str, str]] = []
+        posts = list(self.iter_posts(soup))
+        logger.debug(f"Extracted {len(posts)} posts from thread")
+        return posts
+
+    def iter_posts(self, soup: BeautifulSoup) -> Iterator[Dict[str, str]]:
+        """Yield posts from a XenForo thread page one at a time."""
+        found = 0
         
-        # Extract title
+        # Extract title and find all post articles in one walk
+        # XenForo uses: <article class="message message--post">
         title = ''
-        title_elem = (
-            soup.find('h1', class_='p-title-value') or
-            soup.find('h1', class_=lambda x: x and 'p-title' in x) or
-            soup.find('h1')
-        )
+        title_elem, post_articles = _scan_thread_page(soup)
         if title_elem:
             title = title_elem.get_text(strip=True)
         
-        # Find all post articles
-        # XenForo uses: <article class="message message--post">
-        post_articles = soup.find_all('article', class_=lambda x: x and 'message--post' in x)
+        content_divs = self.select_one_by_priority_each(soup, post_articles, _POST_CONTENT_SELECTORS)
+        author_elems = self.select_one_by_priority_each(soup, post_articles, _AUTHOR_SELECTORS)
         
-        for idx, article in enumerate(post_articles, start=1):
+        for idx, (content_div, author_elem) in enumerate(zip(content_divs, author_elems), start=1):
             try:
                 # Extract post content from bbWrapper
-                content_div = article.find('div', class_='bbWrapper')
                 if not content_div:
                     continue
                 
@@ -166,11 +216,6 @@ class XenForoParser(BaseParser):
                 
                 # Extract author
                 author = 'Unknown'
-                author_elem = (
-                    article.find('a', class_='username') or
-                    article.find('h4', class_='message-name') or
-                    article.find('a', attrs={'data-user-id': True})
-                )
                 if author_elem:
                     author = author_elem.get_text(strip=True)
                 
@@ -178,26 +223,26 @@ class XenForoParser(BaseParser):
                 if idx == 1 and title:
                     content_text = f"{title} {content_text}"
                 
-                posts.append({
+                post = {
                     'content': content_text,
                     'author': author,
                     'post_number': idx
-                })
+                }
                 
             except Exception as e:
                 logger.warning(f"Error extracting post {idx}: {str(e)}")
                 continue
+            
+            found += 1
+            yield post
         
         # Fallback
-        if not posts:
+        if not found:
             logger.debug("No posts found with standard selectors, using fallback")
-            thread_data = self.extract_thread_content(soup)
+            thread_data = self._thread_content(title_elem, post_articles)
             if thread_data:
-                posts = [{
+                yield {
                     'content': f"{thread_data['title']} {thread_data['content']}".strip(),
                     'author': 'Unknown',
                     'post_number': 1
-                }]
-        
-        logger.debug(f"Extracted {len(posts)} posts from thread")
-        return posts
+                }
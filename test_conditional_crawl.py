@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Offline test of conditional category page fetches (no network or database needed).
+
+A listing's ETag may only be stored once every page and thread behind it was
+fetched; otherwise the next run gets a 304 and never retries what failed.
+
+Usage:
+    python test_conditional_crawl.py   (or: python -m pytest test_conditional_crawl.py)
+"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+
+import httpx
+
+from crawler import ForumCrawler, HttpCache
+from models import KeywordRow
+from parsers import AskGamblersParser
+
+LISTING_URL = 'https://forum.askgamblers.com/forum/21-online-slot-discussions/'
+LISTING_HTML = """<html><body>
+<a href="/topic/1-first/">First</a>
+<a href="/topic/2-second/">Second</a>
+</body></html>"""
+THREAD_HTML = """<html><body><h1 class="ipsType_pageTitle">Thread</h1>
+<article class="cPost"><div data-role="commentContent">Nothing to see in this post.</div></article>
+</body></html>"""
+
+
+def crawl(failing_path=None):
+    """Crawl the stub forum once; returns its HttpCache (requests to failing_path get a 500)."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == failing_path:
+            return httpx.Response(500)
+        if str(request.url) == LISTING_URL:
+            return httpx.Response(200, headers={'ETag': '"listing-v1"'}, text=LISTING_HTML)
+        return httpx.Response(200, text=THREAD_HTML)
+
+    http_cache = HttpCache(os.path.join(tempfile.mkdtemp(), 'http_cache.sqlite'))
+    crawler = ForumCrawler(db_session=None, parser=AskGamblersParser(), rate_limit=0, http_cache=http_cache)
+    crawler.crawler.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    forum = SimpleNamespace(id=1, name='AskGamblers', base_url='', start_urls=[LISTING_URL], max_pages=1)
+    crawler.crawl_forum(forum, [KeywordRow(id=1, keyword='no such keyword')])
+    return http_cache
+
+
+def test_validators_saved_after_full_crawl():
+    http_cache = crawl()
+    assert http_cache.get(LISTING_URL) == ('"listing-v1"', None)
+
+
+def test_validators_not_saved_when_thread_fetch_fails():
+    http_cache = crawl(failing_path='/topic/2-second/')
+    assert http_cache.get(LISTING_URL) is None
+
+
+def test_validators_not_saved_when_listing_fetch_fails():
+    http_cache = crawl(failing_path='/forum/21-online-slot-discussions/')
+    assert http_cache.get(LISTING_URL) is None
+
+
+if __name__ == '__main__':
+    for test in (test_validators_saved_after_full_crawl, test_validators_not_saved_when_thread_fetch_fails, test_validators_not_saved_when_listing_fetch_fails):
+        test()
+        print(f"✓ {test.__name__}")
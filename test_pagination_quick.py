@@ -1,21 +1,34 @@
 #!/usr/bin/env python3
 """Quick test of pagination and CIBC thread detection."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from parsers import CasinoGuruParser
-from crawler import BaseCrawler
+from crawler import BaseCrawler, HttpCache, TokenBucket
 
 parser = CasinoGuruParser()
-crawler = BaseCrawler()
+# Pages are fetched in parallel; the token bucket keeps request starts 2s apart
+# (per-instance rate limiting is not thread-safe). Unchanged pages are answered
+# with 304 and read from the local copy (kept apart from the crawl's validators).
+crawler = BaseCrawler(
+    limiter=TokenBucket(rate=1 / 2.0),
+    http_cache=HttpCache(os.path.join('.cache', 'test_http_cache.sqlite')),
+)
 
 base_url = "https://casino.guru/forum/general-gambling-discussion"
 
 print("Testing /N pagination format:\n")
 
-for page_num in range(1, 4):
-    url = parser.get_paginated_url(base_url, page_num)
+urls = [parser.get_paginated_url(base_url, page_num) for page_num in range(1, 4)]
+
+# Pages are independent, so their round trips overlap; results print in page order
+with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+    soups = list(executor.map(lambda url: crawler.fetch_page(url, parse_only=parser.THREAD_URL_STRAINER, revalidate=True), urls))
+
+for page_num, (url, soup) in enumerate(zip(urls, soups), start=1):
     print(f"Page {page_num}: {url}")
     
-    soup = crawler.fetch_page(url)
     if soup:
         threads = parser.extract_thread_urls(soup, url)
         print(f"  ✓ Found {len(threads)} threads")
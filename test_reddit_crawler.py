@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """Test Reddit crawler functionality."""
 
-from crawler import BaseCrawler
+from concurrent.futures import ThreadPoolExecutor
+
+from crawler import BaseCrawler, TokenBucket
 from parsers import RedditParser
 
 # Test subreddit
@@ -13,15 +15,19 @@ print(f"TESTING REDDIT CRAWLER: r/{subreddit}")
 print("="*60)
 print()
 
-crawler = BaseCrawler()
+# Step 4 fetches posts from several threads; the token bucket keeps their
+# request starts 2s apart (per-instance rate limiting is not thread-safe)
+crawler = BaseCrawler(limiter=TokenBucket(rate=1 / 2.0))
 parser = RedditParser()
+# Reddit blocks generic browser User-Agents; fetch_json also retries 429s after x-ratelimit-reset
+reddit_headers = parser.get_reddit_headers()
 
 # Step 1: Test fetching subreddit listing
 print("Step 1: Fetching subreddit listing...")
 list_url = parser.get_paginated_url(base_url, 1)
 print(f"URL: {list_url}")
 
-json_data = crawler.fetch_json(list_url)
+json_data = crawler.fetch_json(list_url, custom_headers=reddit_headers, loads=parser.loads)
 if not json_data:
     print("✗ Failed to fetch subreddit listing")
     exit(1)
@@ -48,7 +54,7 @@ if post_urls:
     print(f"Fetching: {test_post_url}")
     
     # Fetch post JSON
-    post_json = crawler.fetch_json(test_post_url + '.json')
+    post_json = crawler.fetch_json(parser.get_post_json_url(test_post_url), custom_headers=reddit_headers, loads=parser.loads)
     if post_json:
         print("✓ Fetched post JSON")
         
@@ -72,12 +78,16 @@ test_keyword = "casino"
 
 if post_urls and json_data:
     matches = 0
-    for url in post_urls[:10]:  # Test first 10 posts
-        post_json = crawler.fetch_json(url + '.json')
+    needle = test_keyword.lower()
+    # Test first 10 posts; fetches overlap so each waits only for its rate limit slot
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        post_jsons = list(executor.map(lambda url: crawler.fetch_json(parser.get_post_json_url(url), custom_headers=reddit_headers, loads=parser.loads), post_urls[:10]))
+    
+    for post_json in post_jsons:
         if post_json:
             posts = parser.extract_all_posts(post_json)
             for post in posts:
-                if test_keyword.lower() in post['content'].lower():
+                if needle in post['content'].lower():
                     matches += 1
                     break
     
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Offline equivalence check of the listing-page strainers (no network needed).
+
+Every parser with a THREAD_URL_STRAINER must extract the same thread URLs from a
+strained soup as from the full page, for the saved pages and for markup variants
+the strainer has to cope with (e.g. extra classes on a thread link).
+
+Usage:
+    python test_strainers.py   (or: python -m pytest test_strainers.py)
+"""
+
+import os
+
+from bs4 import BeautifulSoup
+
+from parsers import AskGamblersParser, CasinoGuruParser, XenForoParser
+
+
+def saved_page(name: str) -> str:
+    """HTML of a page saved next to this script."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), encoding='utf-8') as f:
+        return f.read()
+
+
+# (parser class, listing URL, HTML)
+CASES = [
+    (CasinoGuruParser, 'https://casino.guru/forum/casinos', saved_page('debug_page.html')),
+    (CasinoGuruParser, 'https://casino.guru/forum/casinos', """<html><body>
+<a class="title foo" href="/forum/casinos/x/thread-b">Extra class after</a>
+<a class="title" href="/forum/casinos/x/thread-a">Exact class</a>
+<a class="foo  title" href="/forum/casinos/x/thread-d">Extra class before</a>
+<a class="subtitle" href="/forum/casinos/x/thread-c">Other class</a>
+<a class="title">No href</a>
+</body></html>"""),
+    (AskGamblersParser, 'https://forum.askgamblers.com/forum/1-casinos-general/', saved_page('askgamblers_sample.html')),
+    (AskGamblersParser, 'https://forum.askgamblers.com/forum/2-complaints/', saved_page('complaints_page.html')),
+    (XenForoParser, 'https://www.casinomeister.com/forums/x/', """<html><body>
+<div class="sidebar"><a href="/threads/side.9/">Sidebar</a></div>
+<div class="structItem structItem--thread js-x"><div class="structItem-title"><a href="/threads/real.1/">Real</a></div></div>
+<div class="p-body"><a href="/threads/similar.5/">Similar</a></div>
+</body></html>"""),
+]
+
+
+def tree_builders():
+    """Tree builders available here (html.parser always, lxml if installed)."""
+    builders = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        builders.append('lxml')
+    except ImportError:
+        pass
+    return builders
+
+
+def test_strained_listing_pages_give_same_thread_urls():
+    for parser_class, url, html in CASES:
+        parser = parser_class()
+        for builder in tree_builders():
+            full = parser.extract_thread_urls(BeautifulSoup(html, builder), url)
+            strained = parser.extract_thread_urls(BeautifulSoup(html, builder, parse_only=parser.THREAD_URL_STRAINER), url)
+            assert strained == full, f"{parser_class.__name__} ({builder}): {strained} != {full}"
+
+
+if __name__ == '__main__':
+    test_strained_listing_pages_give_same_thread_urls()
+    print(f"✓ {len(CASES)} pages give the same thread URLs strained and unstrained ({', '.join(tree_builders())})")
@@ -19,6 +19,7 @@ print()
 
 notifier = TelegramNotifier()
 notifier.test_connection()
+notifier.close()
 
 print()
 print("=" * 60)
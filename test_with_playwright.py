@@ -4,72 +4,56 @@ Test AskGamblers and BigWinBoard with Playwright to handle JavaScript rendering.
 """
 
 from crawler.playwright_crawler import PlaywrightCrawler
+from crawler.playwright_pool import PlaywrightPool
 from parsers import AskGamblersParser, BigWinBoardParser
 
-def test_askgamblers():
-    print("=" * 70)
-    print("Testing AskGamblers with Playwright")
-    print("=" * 70)
-    
-    url = 'https://forum.askgamblers.com/forum/21-online-slot-discussions/'
-    crawler = PlaywrightCrawler(rate_limit=1.0, headless=True)
-    
+# (name, listing URL, parser class, selector of the thread links) of each forum under test
+FORUMS = [
+    ('AskGamblers', 'https://forum.askgamblers.com/forum/21-online-slot-discussions/', AskGamblersParser, 'a[href*="/topic/"]'),
+    ('BigWinBoard', 'https://www.bigwinboard.com/forum/casino-complaints/', BigWinBoardParser, 'a[href*="/forum/casino-complaints/"]'),
+]
+
+def fetch_listing(pool: PlaywrightPool, url: str, wait_for: str):
+    """Fetch a listing page with Playwright in its host's context of the pooled browser."""
+    crawler = PlaywrightCrawler(rate_limit=1.0, pool=pool)
     try:
-        soup = crawler.fetch_page(url)
-        if not soup:
-            print("❌ Failed to fetch page")
-            return
-        
-        parser = AskGamblersParser()
-        threads = parser.extract_thread_urls(soup, url)
-        
-        print(f"\n✓ Fetched page with Playwright")
-        print(f"Threads found: {len(threads)}")
-        
-        if threads:
-            print("\nFirst 5 threads:")
-            for t in threads[:5]:
-                print(f"  - {t}")
-        else:
-            print("\n⚠️  No threads found")
-    
+        # Wait for this forum's thread links, not the default (casino.guru) selector
+        return crawler.fetch_page(url, wait_for=wait_for)
     finally:
         crawler.close()
-    
-    print()
 
-def test_bigwinboard():
+def report(name: str, url: str, parser_class, soup):
     print("=" * 70)
-    print("Testing BigWinBoard with Playwright")
+    print(f"Testing {name} with Playwright")
     print("=" * 70)
     
-    url = 'https://www.bigwinboard.com/forum/casino-complaints/'
-    crawler = PlaywrightCrawler(rate_limit=1.0, headless=True)
+    if not soup:
+        print("❌ Failed to fetch page")
+        print()
+        return
     
-    try:
-        soup = crawler.fetch_page(url)
-        if not soup:
-            print("❌ Failed to fetch page")
-            return
-        
-        parser = BigWinBoardParser()
-        threads = parser.extract_thread_urls(soup, url)
-        
-        print(f"\n✓ Fetched page with Playwright")
-        print(f"Threads found: {len(threads)}")
-        
-        if threads:
-            print("\nFirst 5 threads:")
-            for t in threads[:5]:
-                print(f"  - {t}")
-        else:
-            print("\n⚠️  No threads found")
+    parser = parser_class()
+    threads = parser.extract_thread_urls(soup, url)
     
-    finally:
-        crawler.close()
+    print(f"\n✓ Fetched page with Playwright")
+    print(f"Threads found: {len(threads)}")
+    
+    if threads:
+        print("\nFirst 5 threads:")
+        for t in threads[:5]:
+            print(f"  - {t}")
+    else:
+        print("\n⚠️  No threads found")
     
     print()
 
 if __name__ == '__main__':
-    test_askgamblers()
-    test_bigwinboard()
+    # One pooled browser for the whole run, with a separate context per forum host.
+    # Sync Playwright is bound to its thread, so loading both forums at once would
+    # need a second browser; they are fetched one after the other instead
+    pool = PlaywrightPool(headless=True)
+    try:
+        for name, url, parser_class, wait_for in FORUMS:
+            report(name, url, parser_class, fetch_listing(pool, url, wait_for))
+    finally:
+        pool.close()
@@ -3,35 +3,29 @@
 Update CasinoMeister forum to max_pages=1 to avoid Cloudflare 403 errors.
 """
 
+from sqlalchemy import update
+
 from models import Forum
 from models.base import get_session_maker
 
 
 def update_casinomeister_max_pages():
     SessionMaker = get_session_maker()
-    session = SessionMaker()
     
-    try:
-        # Find CasinoMeister forum
-        forum = session.query(Forum).filter(Forum.name == "casinomeister.com").first()
-        
-        if not forum:
-            print("❌ Forum 'casinomeister.com' not found in database")
-            return
-        
-        old_max_pages = forum.max_pages
-        
-        # Update max_pages to 1
-        forum.max_pages = 1
-        session.commit()
-        
-        print(f"✓ Updated casinomeister.com:")
-        print(f"  max_pages: {old_max_pages} → 1")
-        print(f"  This limits crawling to page 1 of each sub-forum")
-        print(f"  Expected threads per run: ~17 × 12 forums = ~200 threads")
-        
-    finally:
-        session.close()
+    # Single UPDATE statement (no ORM load of the forum); commits on exit
+    with SessionMaker.begin() as session:
+        result = session.execute(
+            update(Forum).where(Forum.name == "casinomeister.com").values(max_pages=1)
+        )
+    
+    if not result.rowcount:
+        print("❌ Forum 'casinomeister.com' not found in database")
+        return
+    
+    print(f"✓ Updated casinomeister.com:")
+    print(f"  max_pages → 1")
+    print(f"  This limits crawling to page 1 of each sub-forum")
+    print(f"  Expected threads per run: ~17 × 12 forums = ~200 threads")
 
 
 if __name__ == '__main__':
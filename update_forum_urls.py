@@ -3,53 +3,56 @@
 Update forum start URLs with specific casino.guru categories.
 """
 
+from sqlalchemy import select, update
+
 from models.base import get_session_maker
 from models import Forum
 
+# Specific casino.guru forum categories
+START_URLS = [
+    'https://casino.guru/forum/casinos',              # Casino discussions
+    'https://casino.guru/forum/bonuses-and-promotions', # Bonus discussions
+    'https://casino.guru/forum/complaints-discussion',   # Complaint discussions
+    'https://casino.guru/forum/general-gambling-discussion', # General gambling
+]
+# Optionally increase max_pages since we have specific categories
+MAX_PAGES = 10
+
 def update_casino_guru_urls():
     """Update casino.guru forum with specific category URLs."""
     
     SessionMaker = get_session_maker()
-    session = SessionMaker()
     
     try:
-        # Get casino.guru forum
-        forum = session.query(Forum).filter_by(name='casino.guru').first()
-        
-        if not forum:
-            print("❌ casino.guru forum not found in database")
-            return
-        
-        print(f"Current configuration:")
-        print(f"  Start URLs: {forum.start_urls}")
-        print(f"  Max Pages: {forum.max_pages}")
-        
-        # Update with specific casino.guru forum categories
-        forum.start_urls = [
-            'https://casino.guru/forum/casinos',              # Casino discussions
-            'https://casino.guru/forum/bonuses-and-promotions', # Bonus discussions
-            'https://casino.guru/forum/complaints-discussion',   # Complaint discussions
-            'https://casino.guru/forum/general-gambling-discussion', # General gambling
-        ]
-        
-        # Optionally increase max_pages since we have specific categories
-        forum.max_pages = 10
-        
-        session.commit()
+        # Read the current settings and update them in one transaction, with plain
+        # column SELECT/UPDATE statements instead of loading a Forum object
+        with SessionMaker.begin() as session:
+            current = session.execute(
+                select(Forum.start_urls, Forum.max_pages).where(Forum.name == 'casino.guru')
+            ).first()
+            
+            if not current:
+                print("❌ casino.guru forum not found in database")
+                return
+            
+            print(f"Current configuration:")
+            print(f"  Start URLs: {current.start_urls}")
+            print(f"  Max Pages: {current.max_pages}")
+            
+            session.execute(
+                update(Forum).where(Forum.name == 'casino.guru').values(start_urls=START_URLS, max_pages=MAX_PAGES)
+            )
         
         print("\n✅ Forum updated successfully!")
         print(f"\nNew configuration:")
         print(f"  Start URLs:")
-        for url in forum.start_urls:
+        for url in START_URLS:
             print(f"    - {url}")
-        print(f"  Max Pages: {forum.max_pages}")
-        print(f"\nThis will now crawl up to {len(forum.start_urls)} categories × {forum.max_pages} pages each")
+        print(f"  Max Pages: {MAX_PAGES}")
+        print(f"\nThis will now crawl up to {len(START_URLS)} categories × {MAX_PAGES} pages each")
         
     except Exception as e:
         print(f"❌ Error: {str(e)}")
-        session.rollback()
-    finally:
-        session.close()
 
 
 if __name__ == '__main__':